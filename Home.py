@@ -5,6 +5,7 @@ Main Home Page
 
 import streamlit as st
 import os
+import pandas as pd
 from dotenv import load_dotenv
 
 # Load environment variables
@@ -148,6 +149,15 @@ if os.path.exists(transcript_dir):
 else:
     st.warning("📁 Transcripts directory not found")
 
+# Shared database handles (see utils/shared_database.py)
+with st.expander("🔌 Database Connections"):
+    from utils.shared_database import get_connection_health
+    health = get_connection_health()
+    if health:
+        st.dataframe(pd.DataFrame(health).T, use_container_width=True)
+    else:
+        st.caption("No database handles opened yet in this process")
+
 # Footer
 st.markdown("---")
 st.markdown('<div class="company-name">Lohusalu Capital Management</div>', unsafe_allow_html=True)
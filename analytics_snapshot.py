@@ -0,0 +1,82 @@
+#!/usr/bin/env python3
+"""
+Analytics Snapshot
+Writes the score/price movement pairs to the Parquet snapshot queried by
+utils.analytics.AnalyticsEngine, and prints the model leaderboard.
+
+Usage:
+    python3 analytics_snapshot.py                       # from PostgreSQL (DB_URL)
+    python3 analytics_snapshot.py --source sqlite --sqlite-path data/earnings_analysis.db
+"""
+
+from dotenv import load_dotenv
+load_dotenv()
+
+import argparse
+import os
+import time
+
+from utils.analytics import AnalyticsEngine, DEFAULT_SNAPSHOT_PATH
+
+
+def parse_args():
+    """Parse command line arguments"""
+    parser = argparse.ArgumentParser(description="Build the DuckDB analytics snapshot")
+    parser.add_argument('--source', choices=['postgres', 'sqlite'], default='postgres', help="Database to read")
+    parser.add_argument('--sqlite-path', default='data/earnings_analysis.db', help="SQLite database file")
+    parser.add_argument('--path', default=DEFAULT_SNAPSHOT_PATH, help="Parquet snapshot to write")
+    parser.add_argument('--period-days', type=int, default=5, choices=[1, 3, 5, 10], help="Leaderboard horizon")
+    return parser.parse_args()
+
+
+def main():
+    """Build the analytics snapshot"""
+    args = parse_args()
+
+    print("=" * 70)
+    print("BUILDING ANALYTICS SNAPSHOT")
+    print("=" * 70)
+
+    try:
+        engine = AnalyticsEngine(args.path)
+        started = time.time()
+
+        if args.source == 'postgres':
+            if not os.getenv('DB_URL'):
+                print("❌ Error: DB_URL not found in environment variables")
+                return False
+            from utils.database import Database
+            rows = engine.snapshot_from_postgres(Database())
+        else:
+            from utils.db_util import DatabaseUtil
+            with DatabaseUtil(args.sqlite_path) as db:
+                rows = engine.snapshot_from_sqlite(db)
+
+        print(f"\n✅ {rows} pairs written to {args.path} in {time.time() - started:.1f}s")
+
+        if rows:
+            info = engine.get_snapshot_info()
+            print(f"📊 {info['tickers']} tickers, earnings {info['first_earnings_date']} to {info['last_earnings_date']}")
+
+            print(f"\n🏆 Model leaderboard ({args.period_days}-day direction accuracy):")
+            board = engine.leaderboard(by='model', period_days=args.period_days, min_samples=1)
+            print(board.to_string(index=False) if not board.empty else "   No scored pairs with movements yet")
+
+        engine.close()
+        print("\n" + "=" * 70)
+        return True
+
+    except (ImportError, ValueError) as e:
+        print(f"\n❌ Error: {e}")
+        return False
+    except Exception as e:
+        print(f"\n❌ Error building snapshot: {e}")
+        import traceback
+        traceback.print_exc()
+        return False
+
+
+if __name__ == "__main__":
+    import sys
+    success = main()
+    sys.exit(0 if success else 1)
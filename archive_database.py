@@ -0,0 +1,83 @@
+#!/usr/bin/env python3
+"""
+Archive Database
+Exports transcripts, analyses and price movements to zstd Parquet datasets
+partitioned by ticker and year, or loads such an archive back with COPY.
+
+Usage:
+    python3 archive_database.py export                          # to data/archive
+    python3 archive_database.py export --tables analyses --path /backups/2026-10
+    python3 archive_database.py import --path /backups/2026-10
+"""
+
+from dotenv import load_dotenv
+load_dotenv()
+
+import argparse
+import os
+import time
+
+from utils.database import Database
+from utils.parquet_archive import ARCHIVE_TABLES, DEFAULT_ARCHIVE_PATH, ParquetArchive
+
+
+def parse_args():
+    """Parse command line arguments"""
+    parser = argparse.ArgumentParser(description="Export or import the earnings schema as Parquet")
+    parser.add_argument('action', choices=['export', 'import'], help="Direction of the copy")
+    parser.add_argument('--path', default=DEFAULT_ARCHIVE_PATH, help="Archive directory")
+    parser.add_argument('--tables', nargs='+', choices=ARCHIVE_TABLES, default=list(ARCHIVE_TABLES),
+                        help="Tables to copy")
+    parser.add_argument('--chunksize', type=int, default=20000, help="Rows per chunk/COPY batch")
+    return parser.parse_args()
+
+
+def main():
+    """Export or import the archive"""
+    args = parse_args()
+
+    print("=" * 70)
+    print(f"{'EXPORTING' if args.action == 'export' else 'IMPORTING'} PARQUET ARCHIVE")
+    print("=" * 70)
+
+    if not os.getenv('DB_URL'):
+        print("❌ Error: DB_URL not found in environment variables")
+        return False
+
+    if args.action == 'import' and not os.path.isdir(args.path):
+        print(f"❌ Error: Archive not found: {args.path}")
+        return False
+
+    try:
+        archive = ParquetArchive(Database(), args.path, chunksize=args.chunksize)
+        print(f"\n📂 Archive: {os.path.abspath(args.path)}")
+
+        def show_progress(table, rows):
+            print(f"   {table}: {rows} rows")
+
+        started = time.time()
+        if args.action == 'export':
+            counts = archive.export(tables=args.tables, progress_callback=show_progress)
+            verb = "exported"
+        else:
+            counts = archive.restore(tables=args.tables, progress_callback=show_progress)
+            verb = "inserted or updated"
+
+        print("\n" + "=" * 70)
+        for table, rows in counts.items():
+            print(f"✅ {table}: {rows} rows {verb}")
+        print(f"⏱️  {time.time() - started:.1f}s")
+        print("=" * 70)
+        return True
+
+    except Exception as e:
+        print(f"\n❌ Error during {args.action}: {e}")
+        import traceback
+        traceback.print_exc()
+        return False
+
+
+if __name__ == "__main__":
+    import sys
+    success = main()
+    sys.exit(0 if success else 1)
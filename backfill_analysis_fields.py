@@ -0,0 +1,68 @@
+#!/usr/bin/env python3
+"""
+Backfill Analysis Fields
+Fills the structured analysis_json fields (score, guidance direction, EPS and
+revenue beats, key risks) of analyses saved before they were extracted on
+insert. Safe to re-run: analyses that already have every field are skipped,
+so an interrupted run resumes where it stopped.
+
+Usage:
+    python3 backfill_analysis_fields.py
+    python3 backfill_analysis_fields.py --batch-size 5000
+"""
+
+from dotenv import load_dotenv
+load_dotenv()
+
+import argparse
+import os
+import time
+
+from utils.database import Database
+
+
+def parse_args():
+    """Parse command line arguments"""
+    parser = argparse.ArgumentParser(description="Backfill structured analysis_json fields")
+    parser.add_argument('--batch-size', type=int, default=1000, help="Analyses per batch/transaction")
+    return parser.parse_args()
+
+
+def main():
+    """Run the backfill"""
+    args = parse_args()
+
+    print("=" * 70)
+    print("BACKFILLING STRUCTURED ANALYSIS FIELDS")
+    print("=" * 70)
+
+    if not os.getenv('DB_URL'):
+        print("❌ Error: DB_URL not found in environment variables")
+        return False
+
+    try:
+        db = Database()
+
+        def show_progress(updated):
+            print(f"   {updated} analyses")
+
+        started = time.time()
+        updated = db.backfill_analysis_fields(batch_size=args.batch_size, progress_callback=show_progress)
+
+        print("\n" + "=" * 70)
+        print(f"✅ {updated} analyses updated")
+        print(f"⏱️  {time.time() - started:.1f}s")
+        print("=" * 70)
+        return True
+
+    except Exception as e:
+        print(f"\n❌ Error backfilling analyses: {e}")
+        import traceback
+        traceback.print_exc()
+        return False
+
+
+if __name__ == "__main__":
+    import sys
+    success = main()
+    sys.exit(0 if success else 1)
@@ -0,0 +1,12 @@
+"""
+Pytest Collection
+Keeps the root-level test_*.py scripts out of pytest collection
+
+The root scripts (test_download.py, test_finnhub_endpoints.py,
+test_transcript_download.py, ...) are manual checks against the live APIs
+and run their requests at import time, so they need real keys and network.
+They are run directly with python3; the pytest suite lives in tests/ and
+replays recorded cassettes instead (see utils/http_cassette.py).
+"""
+
+collect_ignore_glob = ["test_*.py"]
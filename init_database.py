@@ -9,6 +9,7 @@ load_dotenv()
 
 import os
 from utils.database import Database
+from utils.migrations import POSTGRES_SCHEMA_VERSION
 
 def main():
     """Initialize database"""
@@ -39,6 +40,7 @@ def main():
         print("   - analyses")
         print("   - price_movements")
         print("   - correlations")
+        print(f"✅ Schema version: {POSTGRES_SCHEMA_VERSION}")
         
         # Get database stats
         print("\n📊 Database Statistics:")
@@ -17,6 +17,7 @@ sys.path.append(str(Path(__file__).parent.parent))
 
 from utils.api_ninjas_client import APINinjasClient
 from utils.finnhub_client import FinnhubClient
+from utils.bulk_downloader import BulkTranscriptDownloader, SOURCE_NAMES
 
 st.set_page_config(page_title="Download Transcripts", page_icon="📥", layout="wide")
 
@@ -192,60 +193,65 @@ with tab2:
         help="Enter one ticker symbol per line"
     )
     
-    col1, col2 = st.columns(2)
+    col1, col2, col3 = st.columns(3)
     with col1:
-        bulk_quarter = st.selectbox("Quarter", [1, 2, 3, 4], index=3, key="bulk_quarter")
+        bulk_quarters = st.multiselect("Quarters", [1, 2, 3, 4], default=[4], key="bulk_quarters")
     with col2:
         bulk_year = st.number_input("Year", min_value=2020, max_value=2025, value=2024, step=1, key="bulk_year")
+    with col3:
+        bulk_sources = st.multiselect(
+            "Sources (tried in order)",
+            list(SOURCE_NAMES.keys()),
+            default=[api_source],
+            key="bulk_sources",
+            help="Each transcript is requested from the first source, falling back to the next if not found"
+        )
     
     if st.button("📦 Download All", use_container_width=True):
         tickers = [t.strip().upper() for t in tickers_input.split('\n') if t.strip()]
         
         if not tickers:
             st.warning("Please enter at least one ticker")
+        elif not bulk_quarters or not bulk_sources:
+            st.warning("Please select at least one quarter and one source")
         else:
-            # Check API key
-            if api_source == "API Ninjas":
+            # Check API keys
+            if "API Ninjas" in bulk_sources:
                 api_key = os.getenv('API_NINJAS_KEY')
                 if not api_key or 'placeholder' in api_key.lower():
                     st.error("⚠️ API Ninjas API key not configured")
                     st.stop()
-                client = APINinjasClient()
-            elif api_source == "Finnhub":
-                api_key = os.getenv('FINNHUB_API_KEY')
-                if not api_key:
-                    st.error("⚠️ Finnhub API key not configured")
-                    st.stop()
-                client = FinnhubClient()
+            
+            try:
+                downloader = BulkTranscriptDownloader.from_sources(
+                    [SOURCE_NAMES[source] for source in bulk_sources]
+                )
+            except ValueError as e:
+                st.error(f"⚠️ {str(e)}")
+                st.stop()
             
             progress_bar = st.progress(0)
             status_text = st.empty()
-            results = []
             
-            for i, ticker in enumerate(tickers):
-                status_text.text(f"Processing {ticker}... ({i+1}/{len(tickers)})")
-                
-                try:
-                    filepath = client.save_transcript_to_file(ticker, bulk_year, bulk_quarter)
-                    if filepath:
-                        results.append({'ticker': ticker, 'status': '✅ Success', 'path': filepath})
-                    else:
-                        results.append({'ticker': ticker, 'status': '❌ Not Found', 'path': None})
-                except Exception as e:
-                    results.append({'ticker': ticker, 'status': f'❌ Error: {str(e)}', 'path': None})
-                
-                progress_bar.progress((i + 1) / len(tickers))
+            def show_progress(result, completed, total):
+                status_text.text(f"Downloaded {result['ticker']} Q{result['quarter']} {result['year']}... ({completed}/{total})")
+                progress_bar.progress(completed / total)
+            
+            periods = [(bulk_year, q) for q in sorted(bulk_quarters)]
+            results = downloader.download(tickers, periods, progress_callback=show_progress)
             
             status_text.text("Download complete!")
             
             # Display results
             st.subheader("Download Results")
+            status_labels = {'success': '✅ Success', 'not_found': '❌ Not Found'}
+            results.sort(key=lambda r: (tickers.index(r['ticker']), r['quarter']))
             for result in results:
                 col1, col2, col3 = st.columns([1, 2, 3])
                 with col1:
-                    st.write(result['ticker'])
+                    st.write(f"{result['ticker']} Q{result['quarter']}")
                 with col2:
-                    st.write(result['status'])
+                    st.write(status_labels.get(result['status'], f"❌ Error: {result['error']}"))
                 with col3:
                     if result['path']:
                         st.write(result['path'])
@@ -305,6 +311,8 @@ st.markdown("""
 ### 📝 Notes
 - **API Ninjas**: Free tier covers S&P 100 companies. Get your API key at [api-ninjas.com](https://api-ninjas.com/register)
 - **Finnhub**: Premium feature. Requires paid subscription for transcript access.
+- **FMP**: Available for bulk downloads when `FMP_API_KEY` is set.
+- Bulk downloads run concurrently, with a per-source limit on parallel requests
 - Transcripts are saved to the `transcripts/` directory in markdown format
 - You can also manually upload transcript files to the `transcripts/` directory
 """)
@@ -276,12 +276,14 @@ with tab1:
                             st.metric("Expected Movement", get_expected_movement_range(score))
                         with col3:
                             # Save to database
-                            from utils.db_util import DatabaseUtil
+                            from utils.shared_database import get_database_util
+                            from utils.earnings_calendar import EarningsCalendar
                             from datetime import date
-                            db = DatabaseUtil()
+                            db = get_database_util()
                             try:
-                                # Use current date as earnings date (should be updated with actual date)
-                                earnings_date = date.today()
+                                # Align to the trading session after the call; fall back to today
+                                calendar = EarningsCalendar.from_transcript_dir(transcript_dir)
+                                earnings_date = calendar.trading_date(ticker, quarter, year) or date.today()
                                 db.insert_score(
                                     ticker=ticker,
                                     quarter=quarter,
@@ -8,6 +8,13 @@ import os
 import json
 from datetime import datetime
 import pandas as pd
+from dotenv import load_dotenv
+
+# Load environment variables
+load_dotenv()
+
+# Shared PostgreSQL handle for indexed search (None when DB_URL is not set)
+from utils.shared_database import get_database
 
 # Page configuration
 st.set_page_config(
@@ -390,49 +397,67 @@ with tab3:
     if search_query:
         st.info(f"Searching for: '{search_query}'")
         
-        search_results = []
+        db = get_database()
         
-        for filename in os.listdir(results_dir):
-            file_path = os.path.join(results_dir, filename)
+        if db is not None:
+            # Indexed full-text search over stored transcripts and analyses
+            hits = db.search(search_query, ticker=filter_ticker or None, limit=50)
             
-            try:
-                with open(file_path, 'r', encoding='utf-8') as f:
-                    content = f.read()
+            if not hits.empty:
+                st.success(f"✅ Found {len(hits)} results")
                 
-                if search_query.lower() in content.lower():
-                    # Count occurrences
-                    count = content.lower().count(search_query.lower())
-                    
-                    # Get context (first occurrence)
-                    idx = content.lower().find(search_query.lower())
-                    context_start = max(0, idx - 100)
-                    context_end = min(len(content), idx + 100)
-                    context = content[context_start:context_end]
-                    
-                    search_results.append({
-                        'Filename': filename,
-                        'Occurrences': count,
-                        'Context': context
-                    })
-            except:
-                pass
-        
-        if search_results:
-            st.success(f"✅ Found {len(search_results)} results")
+                for _, hit in hits.iterrows():
+                    label = "📄 Transcript" if hit['kind'] == 'transcripts' else "📊 Analysis"
+                    with st.expander(f"{label}: {hit['ticker']} Q{hit['quarter']} {hit['year']} ({hit['detail']}) - relevance {hit['rank']:.2f}"):
+                        st.markdown(hit['snippet'])
+            else:
+                st.warning("No results found")
+        else:
+            # No database configured: scan result files on disk
+            search_results = []
             
-            for result in search_results:
-                with st.expander(f"📄 {result['Filename']} ({result['Occurrences']} occurrences)"):
-                    st.text(result['Context'])
+            for filename in os.listdir(results_dir):
+                file_path = os.path.join(results_dir, filename)
+                
+                try:
+                    with open(file_path, 'r', encoding='utf-8') as f:
+                        content = f.read()
                     
-                    if st.button(f"View Full File", key=f"view_{result['Filename']}"):
-                        file_path = os.path.join(results_dir, result['Filename'])
-                        with open(file_path, 'r', encoding='utf-8') as f:
-                            content = f.read()
+                    if search_query.lower() in content.lower():
+                        # Count occurrences
+                        count = content.lower().count(search_query.lower())
                         
-                        st.markdown("---")
-                        st.markdown(content)
-        else:
-            st.warning("No results found")
+                        # Get context (first occurrence)
+                        idx = content.lower().find(search_query.lower())
+                        context_start = max(0, idx - 100)
+                        context_end = min(len(content), idx + 100)
+                        context = content[context_start:context_end]
+                        
+                        search_results.append({
+                            'Filename': filename,
+                            'Occurrences': count,
+                            'Context': context
+                        })
+                except:
+                    pass
+            
+            if search_results:
+                st.success(f"✅ Found {len(search_results)} results")
+                
+                for result in search_results:
+                    with st.expander(f"📄 {result['Filename']} ({result['Occurrences']} occurrences)"):
+                        st.text(result['Context'])
+                        
+                        if st.button(f"View Full File", key=f"view_{result['Filename']}"):
+                            file_path = os.path.join(results_dir, result['Filename'])
+                            with open(file_path, 'r', encoding='utf-8') as f:
+                                content = f.read()
+                            
+                            st.markdown("---")
+                            st.markdown(content)
+            else:
+                st.warning("No results found")
+    
     
     # Compare functionality
     st.markdown("---")
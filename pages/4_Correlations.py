@@ -7,7 +7,7 @@ import streamlit as st
 import pandas as pd
 import plotly.express as px
 import plotly.graph_objects as go
-from utils.db_util import DatabaseUtil
+from utils.shared_database import get_analytics_engine, get_database_util
 import os
 
 st.set_page_config(page_title="Correlations", page_icon="📈", layout="wide")
@@ -15,8 +15,13 @@ st.set_page_config(page_title="Correlations", page_icon="📈", layout="wide")
 st.title("📈 Score-Price Movement Correlations")
 st.markdown("Analyze the correlation between earnings analysis scores and actual stock price movements.")
 
-# Initialize database
-db = DatabaseUtil()
+# Shared database handle (reused across reruns and sessions)
+db = get_database_util()
+
+# Grouped statistics run in DuckDB over a Parquet snapshot of the scores,
+# rewritten only when the SQLite database has changed
+engine = get_analytics_engine()
+engine.refresh_from_sqlite(db)
 
 # Sidebar filters
 st.sidebar.header("🔍 Filters")
@@ -74,7 +79,7 @@ with col1:
     st.metric("Total Analyses", len(df_clean))
 
 with col2:
-    correlation, sample_size = db.calculate_correlation(ticker_param, period_filter)
+    correlation, sample_size = engine.calculate_correlation(ticker_param, period_filter)
     st.metric("Correlation", f"{correlation:.3f}")
 
 with col3:
@@ -113,6 +118,26 @@ fig.update_layout(
 
 st.plotly_chart(fig, use_container_width=True)
 
+# Correlation per provider/model (per ticker and model when a ticker is selected)
+st.header("🤖 Correlation by Model")
+
+model_stats = engine.correlations(ticker=ticker_param, period_days=period_filter)
+model_stats = model_stats[model_stats['rollup'] == (0 if ticker_param else 4)]
+
+if model_stats.empty:
+    st.info("💡 At least two scored analyses per model are needed for model statistics.")
+else:
+    st.dataframe(
+        model_stats[['provider', 'model', 'sample_size', 'correlation_coefficient', 'r_squared',
+                     'mean_absolute_error', 'direction_accuracy']].rename(columns={
+            'provider': 'Provider', 'model': 'Model', 'sample_size': 'Analyses',
+            'correlation_coefficient': 'Correlation', 'r_squared': 'R²',
+            'mean_absolute_error': 'Fit MAE (%)', 'direction_accuracy': 'Direction Accuracy (%)'
+        }),
+        use_container_width=True,
+        hide_index=True
+    )
+
 # Correlation by score bucket
 st.header("📊 Performance by Score Range")
 
@@ -207,6 +232,12 @@ st.download_button(
     file_name=f"score_correlation_{ticker_filter}_{period_filter}d.csv",
     mime="text/csv"
 )
+st.download_button(
+    label="📥 Download Data as Parquet",
+    data=display_df.to_parquet(index=False, compression='zstd'),
+    file_name=f"score_correlation_{ticker_filter}_{period_filter}d.parquet",
+    mime="application/vnd.apache.parquet"
+)
 
 # Accuracy metrics
 st.header("🎯 Prediction Accuracy")
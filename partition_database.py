@@ -0,0 +1,91 @@
+#!/usr/bin/env python3
+"""
+Partition Database
+Converts the transcripts and analyses tables to year-partitioned tables with
+BRIN indexes, or adds partitions for upcoming years to an already
+partitioned database.
+
+Usage:
+    python3 partition_database.py                      # migrate, keep *_legacy copies
+    python3 partition_database.py --start-year 2015 --drop-legacy
+    python3 partition_database.py --ensure-years 2026 2027
+"""
+
+from dotenv import load_dotenv
+load_dotenv()
+
+import argparse
+import os
+
+from utils.database import Database
+from utils.partitioning import (
+    PARTITIONED_TABLES, ensure_year_partitions, is_partitioned, migrate_to_partitioned, year_partitions
+)
+
+
+def parse_args():
+    """Parse command line arguments"""
+    parser = argparse.ArgumentParser(description="Partition transcripts and analyses by year")
+    parser.add_argument('--start-year', type=int, help="First year partition (default: earliest year in the data)")
+    parser.add_argument('--end-year', type=int, help="Last year partition (default: latest year in the data + 2)")
+    parser.add_argument('--drop-legacy', action='store_true', help="Drop the unpartitioned *_legacy tables after copying")
+    parser.add_argument('--ensure-years', nargs='+', type=int, metavar='YEAR',
+                        help="Only create missing partitions for these years")
+    return parser.parse_args()
+
+
+def main():
+    """Partition the database"""
+    args = parse_args()
+
+    print("=" * 70)
+    print("PARTITIONING POSTGRESQL DATABASE")
+    print("=" * 70)
+
+    if not os.getenv('DB_URL'):
+        print("❌ Error: DB_URL not found in environment variables")
+        return False
+
+    try:
+        db = Database()
+
+        if args.ensure_years:
+            created = ensure_year_partitions(db.engine, args.ensure_years)
+            print(f"\n✅ Created {len(created)} partitions")
+            for name in created:
+                print(f"   - {name}")
+        else:
+            print("\n🔧 Copying tables into year partitions...")
+            copied = migrate_to_partitioned(db.engine, start_year=args.start_year, end_year=args.end_year,
+                                            keep_legacy=not args.drop_legacy)
+            for table, rows in copied.items():
+                print(f"✅ {table}: {rows} rows copied")
+            if not args.drop_legacy:
+                print("ℹ️  Unpartitioned copies kept as *_legacy tables")
+
+        print("\n📊 Year partitions:")
+        with db.engine.connect() as conn:
+            for table in PARTITIONED_TABLES:
+                if is_partitioned(conn, table):
+                    years = year_partitions(conn, table)
+                    print(f"   {table}: {years[0]}-{years[-1]}" if years else f"   {table}: default only")
+
+        print("\n" + "=" * 70)
+        print("✅ PARTITIONING COMPLETE")
+        print("=" * 70)
+        return True
+
+    except ValueError as e:
+        print(f"\n❌ Error: {e}")
+        return False
+    except Exception as e:
+        print(f"\n❌ Error partitioning database: {e}")
+        import traceback
+        traceback.print_exc()
+        return False
+
+
+if __name__ == "__main__":
+    import sys
+    success = main()
+    sys.exit(0 if success else 1)
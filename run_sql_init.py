@@ -9,6 +9,9 @@ load_dotenv()
 
 import os
 import psycopg2
+from sqlalchemy import create_engine
+
+from utils.migrations import migrate_postgres
 
 def main():
     """Run SQL initialization"""
@@ -39,6 +42,16 @@ def main():
         
         print("✅ Connected")
         
+        # Tables created by an earlier version of the script are upgraded by
+        # the numbered migrations first; the script itself never ALTERs them
+        cursor.execute("SELECT to_regclass('earnings.transcripts') IS NOT NULL")
+        if cursor.fetchone()[0]:
+            print("\n🔧 Applying schema migrations...")
+            engine = create_engine(db_url)
+            applied = migrate_postgres(engine)
+            engine.dispose()
+            print(f"✅ Migrations applied: {applied or 'none pending'}")
+        
         # Execute SQL script
         print("\n⚙️ Executing SQL script...")
         cursor.execute(sql_script)
@@ -0,0 +1,173 @@
+-- ============================================================================
+-- Database Statistics
+-- Row counts and date bounds for dashboards, cheap to read at any table size.
+--
+-- Counts are append-only delta rows: each write statement's trigger inserts
+-- one row and never updates a shared one, so concurrent writers neither
+-- serialize nor deadlock on the statistics. The earnings.database_stats view
+-- sums the deltas; earnings.compact_database_stats() folds them into one row.
+-- Date bounds and tickers with analyses are read from the (date, id) and
+-- (ticker, analysis_date, id) indexes instead of being maintained.
+--
+-- Applied by schema migration 2 (utils/migrations.py) and re-run by
+-- utils/partitioning.py. Safe to re-run; it (re)installs the view and
+-- triggers and recomputes the counters from the tables.
+-- ============================================================================
+
+DROP VIEW IF EXISTS earnings.database_stats;
+
+CREATE TABLE IF NOT EXISTS earnings.database_stats_deltas (
+    id BIGSERIAL PRIMARY KEY,
+    transcripts_count BIGINT NOT NULL DEFAULT 0,
+    analyses_count BIGINT NOT NULL DEFAULT 0,
+    price_movements_count BIGINT NOT NULL DEFAULT 0,
+    created_at TIMESTAMP WITH TIME ZONE DEFAULT CURRENT_TIMESTAMP
+);
+
+CREATE VIEW earnings.database_stats AS
+SELECT
+    COALESCE(d.transcripts_count, 0)::BIGINT AS transcripts_count,
+    COALESCE(d.analyses_count, 0)::BIGINT AS analyses_count,
+    COALESCE(d.price_movements_count, 0)::BIGINT AS price_movements_count,
+    (
+        -- Loose index scan: one index probe per distinct ticker
+        WITH RECURSIVE tickers AS (
+            (SELECT ticker FROM earnings.analyses ORDER BY ticker LIMIT 1)
+            UNION ALL
+            SELECT (SELECT a.ticker FROM earnings.analyses a
+                    WHERE a.ticker > t.ticker ORDER BY a.ticker LIMIT 1)
+            FROM tickers t
+            WHERE t.ticker IS NOT NULL
+        )
+        SELECT COUNT(ticker)::INTEGER FROM tickers
+    ) AS unique_tickers,
+    (SELECT MAX(analysis_date) FROM earnings.analyses) AS latest_analysis,
+    (SELECT MIN(transcript_date) FROM earnings.transcripts) AS earliest_transcript,
+    d.delta_rows
+FROM (
+    SELECT SUM(transcripts_count) AS transcripts_count,
+           SUM(analyses_count) AS analyses_count,
+           SUM(price_movements_count) AS price_movements_count,
+           COUNT(*) AS delta_rows
+    FROM earnings.database_stats_deltas
+) d;
+
+-- Function: Fold all delta rows into one. Rows inserted concurrently are
+-- not visible to the DELETE and stay, so the sums are unchanged.
+CREATE OR REPLACE FUNCTION earnings.compact_database_stats()
+RETURNS VOID AS $$
+BEGIN
+    WITH removed AS (
+        DELETE FROM earnings.database_stats_deltas
+        RETURNING transcripts_count, analyses_count, price_movements_count
+    )
+    INSERT INTO earnings.database_stats_deltas (transcripts_count, analyses_count, price_movements_count)
+    SELECT SUM(transcripts_count), SUM(analyses_count), SUM(price_movements_count)
+    FROM removed
+    HAVING COUNT(*) > 0;
+END;
+$$ LANGUAGE plpgsql;
+
+-- Function: Recompute the counts from the tables
+CREATE OR REPLACE FUNCTION earnings.refresh_database_stats()
+RETURNS VOID AS $$
+BEGIN
+    DELETE FROM earnings.database_stats_deltas;
+    INSERT INTO earnings.database_stats_deltas (transcripts_count, analyses_count, price_movements_count)
+    VALUES (
+        (SELECT COUNT(*) FROM earnings.transcripts),
+        (SELECT COUNT(*) FROM earnings.analyses),
+        (SELECT COUNT(*) FROM earnings.price_movements)
+    );
+END;
+$$ LANGUAGE plpgsql;
+
+-- Trigger function: one delta row per INSERT or DELETE statement
+CREATE OR REPLACE FUNCTION earnings.database_stats_delta()
+RETURNS TRIGGER AS $$
+DECLARE
+    changed BIGINT;
+BEGIN
+    IF TG_OP = 'INSERT' THEN
+        SELECT COUNT(*) INTO changed FROM new_rows;
+    ELSE
+        SELECT -COUNT(*) INTO changed FROM old_rows;
+    END IF;
+
+    IF changed <> 0 THEN
+        INSERT INTO earnings.database_stats_deltas (transcripts_count, analyses_count, price_movements_count)
+        VALUES (
+            CASE WHEN TG_TABLE_NAME = 'transcripts' THEN changed ELSE 0 END,
+            CASE WHEN TG_TABLE_NAME = 'analyses' THEN changed ELSE 0 END,
+            CASE WHEN TG_TABLE_NAME = 'price_movements' THEN changed ELSE 0 END
+        );
+    END IF;
+
+    RETURN NULL;
+END;
+$$ LANGUAGE plpgsql;
+
+-- Trigger function: TRUNCATE on any tracked table
+CREATE OR REPLACE FUNCTION earnings.database_stats_truncate()
+RETURNS TRIGGER AS $$
+BEGIN
+    PERFORM earnings.refresh_database_stats();
+    RETURN NULL;
+END;
+$$ LANGUAGE plpgsql;
+
+-- Triggers (transition tables require one trigger per event). Updates do not
+-- change the counts.
+DROP TRIGGER IF EXISTS database_stats_insert ON earnings.transcripts;
+CREATE TRIGGER database_stats_insert
+    AFTER INSERT ON earnings.transcripts
+    REFERENCING NEW TABLE AS new_rows
+    FOR EACH STATEMENT EXECUTE FUNCTION earnings.database_stats_delta();
+
+DROP TRIGGER IF EXISTS database_stats_delete ON earnings.transcripts;
+CREATE TRIGGER database_stats_delete
+    AFTER DELETE ON earnings.transcripts
+    REFERENCING OLD TABLE AS old_rows
+    FOR EACH STATEMENT EXECUTE FUNCTION earnings.database_stats_delta();
+
+DROP TRIGGER IF EXISTS database_stats_truncate ON earnings.transcripts;
+CREATE TRIGGER database_stats_truncate
+    AFTER TRUNCATE ON earnings.transcripts
+    FOR EACH STATEMENT EXECUTE FUNCTION earnings.database_stats_truncate();
+
+DROP TRIGGER IF EXISTS database_stats_insert ON earnings.analyses;
+CREATE TRIGGER database_stats_insert
+    AFTER INSERT ON earnings.analyses
+    REFERENCING NEW TABLE AS new_rows
+    FOR EACH STATEMENT EXECUTE FUNCTION earnings.database_stats_delta();
+
+DROP TRIGGER IF EXISTS database_stats_delete ON earnings.analyses;
+CREATE TRIGGER database_stats_delete
+    AFTER DELETE ON earnings.analyses
+    REFERENCING OLD TABLE AS old_rows
+    FOR EACH STATEMENT EXECUTE FUNCTION earnings.database_stats_delta();
+
+DROP TRIGGER IF EXISTS database_stats_truncate ON earnings.analyses;
+CREATE TRIGGER database_stats_truncate
+    AFTER TRUNCATE ON earnings.analyses
+    FOR EACH STATEMENT EXECUTE FUNCTION earnings.database_stats_truncate();
+
+DROP TRIGGER IF EXISTS database_stats_insert ON earnings.price_movements;
+CREATE TRIGGER database_stats_insert
+    AFTER INSERT ON earnings.price_movements
+    REFERENCING NEW TABLE AS new_rows
+    FOR EACH STATEMENT EXECUTE FUNCTION earnings.database_stats_delta();
+
+DROP TRIGGER IF EXISTS database_stats_delete ON earnings.price_movements;
+CREATE TRIGGER database_stats_delete
+    AFTER DELETE ON earnings.price_movements
+    REFERENCING OLD TABLE AS old_rows
+    FOR EACH STATEMENT EXECUTE FUNCTION earnings.database_stats_delta();
+
+DROP TRIGGER IF EXISTS database_stats_truncate ON earnings.price_movements;
+CREATE TRIGGER database_stats_truncate
+    AFTER TRUNCATE ON earnings.price_movements
+    FOR EACH STATEMENT EXECUTE FUNCTION earnings.database_stats_truncate();
+
+-- Initialize counters from the current data
+SELECT earnings.refresh_database_stats();
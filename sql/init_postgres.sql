@@ -8,6 +8,12 @@ CREATE SCHEMA IF NOT EXISTS earnings;
 -- Set search path
 SET search_path TO earnings, public;
 
+-- This script creates the current layout on an empty schema. Columns,
+-- indexes and constraints added to existing tables are numbered migrations
+-- in utils/migrations.py, applied by the next Database() (python3
+-- init_database.py), which also upgrade databases created from earlier
+-- versions of this file.
+
 -- ============================================================================
 -- Table: transcripts
 -- Stores raw earnings call transcripts
@@ -23,9 +29,10 @@ CREATE TABLE IF NOT EXISTS earnings.transcripts (
     source VARCHAR(50) NOT NULL, -- 'api_ninjas', 'finnhub', 'manual_upload', etc.
     source_metadata JSONB, -- Additional metadata from source
     word_count INTEGER,
+    search_vector TSVECTOR GENERATED ALWAYS AS (to_tsvector('english', transcript_text)) STORED,
     created_at TIMESTAMP WITH TIME ZONE DEFAULT CURRENT_TIMESTAMP,
     updated_at TIMESTAMP WITH TIME ZONE DEFAULT CURRENT_TIMESTAMP,
-    UNIQUE(ticker, quarter, year)
+    CONSTRAINT uq_transcript_ticker_quarter_year UNIQUE(ticker, quarter, year)
 );
 
 -- ============================================================================
@@ -38,7 +45,7 @@ CREATE TABLE IF NOT EXISTS earnings.analyses (
     ticker VARCHAR(10) NOT NULL,
     quarter INTEGER NOT NULL CHECK (quarter BETWEEN 1 AND 4),
     year INTEGER NOT NULL CHECK (year >= 2000 AND year <= 2100),
-    analysis_date TIMESTAMP WITH TIME ZONE DEFAULT CURRENT_TIMESTAMP,
+    analysis_date TIMESTAMP WITH TIME ZONE NOT NULL DEFAULT CURRENT_TIMESTAMP,
     score INTEGER CHECK (score >= -5 AND score <= 5),
     score_justification TEXT,
     analysis_markdown TEXT NOT NULL,
@@ -48,6 +55,10 @@ CREATE TABLE IF NOT EXISTS earnings.analyses (
     analysis_type VARCHAR(50) NOT NULL, -- 'Standard Analysis', 'Agentic Workflow', 'Quick Summary'
     financial_context_included BOOLEAN DEFAULT FALSE,
     processing_time_seconds REAL,
+    search_vector TSVECTOR GENERATED ALWAYS AS (
+        setweight(to_tsvector('english', coalesce(score_justification, '')), 'A') ||
+        setweight(to_tsvector('english', analysis_markdown), 'B')
+    ) STORED,
     created_at TIMESTAMP WITH TIME ZONE DEFAULT CURRENT_TIMESTAMP,
     updated_at TIMESTAMP WITH TIME ZONE DEFAULT CURRENT_TIMESTAMP
 );
@@ -74,7 +85,51 @@ CREATE TABLE IF NOT EXISTS earnings.price_movements (
     data_source VARCHAR(50) DEFAULT 'yfinance',
     created_at TIMESTAMP WITH TIME ZONE DEFAULT CURRENT_TIMESTAMP,
     updated_at TIMESTAMP WITH TIME ZONE DEFAULT CURRENT_TIMESTAMP,
-    UNIQUE(ticker, earnings_date)
+    CONSTRAINT uq_price_movement_ticker_date UNIQUE(ticker, earnings_date)
+);
+
+-- ============================================================================
+-- Table: earnings_events
+-- Earnings call calendar keyed by (ticker, quarter, year), aligned to the
+-- trading session in which the market first reacts to the call
+-- ============================================================================
+CREATE TABLE IF NOT EXISTS earnings.earnings_events (
+    id SERIAL PRIMARY KEY,
+    ticker VARCHAR(10) NOT NULL,
+    quarter INTEGER NOT NULL CHECK (quarter BETWEEN 1 AND 4),
+    year INTEGER NOT NULL,
+    event_time TIMESTAMP WITH TIME ZONE, -- NULL when only the call date is known
+    event_date DATE NOT NULL,
+    trading_date DATE NOT NULL, -- First trading session after the call
+    source VARCHAR(50),
+    created_at TIMESTAMP WITH TIME ZONE DEFAULT CURRENT_TIMESTAMP,
+    updated_at TIMESTAMP WITH TIME ZONE DEFAULT CURRENT_TIMESTAMP,
+    CONSTRAINT uq_earnings_event_ticker_quarter_year UNIQUE(ticker, quarter, year)
+);
+
+-- ============================================================================
+-- Table: analysis_performance_facts
+-- Materialized analysis_performance, one row per analysis, refreshed
+-- incrementally by the Python API when analyses, events or prices change
+-- ============================================================================
+CREATE TABLE IF NOT EXISTS earnings.analysis_performance_facts (
+    analysis_id INTEGER PRIMARY KEY,
+    ticker VARCHAR(10) NOT NULL,
+    quarter INTEGER NOT NULL,
+    year INTEGER NOT NULL,
+    analysis_date TIMESTAMP WITH TIME ZONE,
+    score INTEGER,
+    provider VARCHAR(50),
+    model VARCHAR(100),
+    analysis_type VARCHAR(50),
+    earnings_date DATE, -- Reaction trading date (earnings_events.trading_date)
+    movement_1d_pct NUMERIC(6, 2),
+    movement_3d_pct NUMERIC(6, 2),
+    movement_5d_pct NUMERIC(6, 2),
+    movement_10d_pct NUMERIC(6, 2),
+    direction_correct_1d BOOLEAN,
+    direction_correct_5d BOOLEAN,
+    refreshed_at TIMESTAMP WITH TIME ZONE DEFAULT CURRENT_TIMESTAMP
 );
 
 -- ============================================================================
@@ -83,7 +138,10 @@ CREATE TABLE IF NOT EXISTS earnings.price_movements (
 -- ============================================================================
 CREATE TABLE IF NOT EXISTS earnings.correlations (
     id SERIAL PRIMARY KEY,
-    ticker VARCHAR(10),
+    ticker VARCHAR(10), -- 'ALL' for all tickers
+    provider VARCHAR(50) NOT NULL DEFAULT 'ALL', -- 'ALL' for all providers
+    model VARCHAR(100) NOT NULL DEFAULT 'ALL', -- 'ALL' for all models
+    rollup SMALLINT NOT NULL DEFAULT 0, -- GROUPING(ticker, provider, model): 4/2/1 set where rolled up
     period_days INTEGER NOT NULL CHECK (period_days > 0),
     correlation_coefficient NUMERIC(5, 3),
     sample_size INTEGER,
@@ -92,7 +150,7 @@ CREATE TABLE IF NOT EXISTS earnings.correlations (
     direction_accuracy NUMERIC(5, 2), -- Percentage
     analysis_date DATE NOT NULL,
     created_at TIMESTAMP WITH TIME ZONE DEFAULT CURRENT_TIMESTAMP,
-    UNIQUE(ticker, period_days, analysis_date)
+    CONSTRAINT uq_correlation_group_period_date UNIQUE(ticker, provider, model, period_days, analysis_date, rollup)
 );
 
 -- ============================================================================
@@ -100,21 +158,49 @@ CREATE TABLE IF NOT EXISTS earnings.correlations (
 -- ============================================================================
 
 -- Transcripts indexes
-CREATE INDEX IF NOT EXISTS idx_transcripts_ticker ON earnings.transcripts(ticker);
-CREATE INDEX IF NOT EXISTS idx_transcripts_date ON earnings.transcripts(transcript_date);
-CREATE INDEX IF NOT EXISTS idx_transcripts_ticker_quarter_year ON earnings.transcripts(ticker, quarter, year);
+-- Single-column B-trees are skipped once the table is year-partitioned
+-- (utils/partitioning.py); the (date, id) keyset indexes cover date ranges.
+DO $$
+BEGIN
+    IF (SELECT relkind FROM pg_class WHERE oid = 'earnings.transcripts'::regclass) <> 'p' THEN
+        CREATE INDEX IF NOT EXISTS idx_transcripts_ticker ON earnings.transcripts(ticker);
+        CREATE INDEX IF NOT EXISTS idx_transcripts_date ON earnings.transcripts(transcript_date);
+        CREATE INDEX IF NOT EXISTS idx_transcripts_ticker_quarter_year ON earnings.transcripts(ticker, quarter, year);
+    END IF;
+END $$;
+CREATE INDEX IF NOT EXISTS idx_transcripts_date_id ON earnings.transcripts(transcript_date, id); -- Keyset pagination
+CREATE INDEX IF NOT EXISTS idx_transcripts_ticker_date_id ON earnings.transcripts(ticker, transcript_date, id);
 
 -- Analyses indexes
-CREATE INDEX IF NOT EXISTS idx_analyses_ticker ON earnings.analyses(ticker);
-CREATE INDEX IF NOT EXISTS idx_analyses_transcript_id ON earnings.analyses(transcript_id);
-CREATE INDEX IF NOT EXISTS idx_analyses_date ON earnings.analyses(analysis_date);
+DO $$
+BEGIN
+    IF (SELECT relkind FROM pg_class WHERE oid = 'earnings.analyses'::regclass) <> 'p' THEN
+        CREATE INDEX IF NOT EXISTS idx_analyses_ticker ON earnings.analyses(ticker);
+        CREATE INDEX IF NOT EXISTS idx_analyses_transcript_id ON earnings.analyses(transcript_id);
+        CREATE INDEX IF NOT EXISTS idx_analyses_date ON earnings.analyses(analysis_date);
+    END IF;
+END $$;
 CREATE INDEX IF NOT EXISTS idx_analyses_score ON earnings.analyses(score);
 CREATE INDEX IF NOT EXISTS idx_analyses_ticker_quarter_year ON earnings.analyses(ticker, quarter, year);
+CREATE INDEX IF NOT EXISTS idx_analyses_date_id ON earnings.analyses(analysis_date, id); -- Keyset pagination
+CREATE INDEX IF NOT EXISTS idx_analyses_ticker_date_id ON earnings.analyses(ticker, analysis_date, id);
+
+-- Full-text search
+CREATE INDEX IF NOT EXISTS idx_transcripts_search_vector ON earnings.transcripts USING GIN (search_vector);
+CREATE INDEX IF NOT EXISTS idx_analyses_search_vector ON earnings.analyses USING GIN (search_vector);
 
 -- Price movements indexes
 CREATE INDEX IF NOT EXISTS idx_price_movements_ticker ON earnings.price_movements(ticker);
 CREATE INDEX IF NOT EXISTS idx_price_movements_date ON earnings.price_movements(earnings_date);
 
+-- Earnings events indexes
+CREATE INDEX IF NOT EXISTS idx_earnings_events_trading_date ON earnings.earnings_events(trading_date);
+CREATE INDEX IF NOT EXISTS idx_earnings_events_ticker_trading_date ON earnings.earnings_events(ticker, trading_date);
+
+-- Analysis performance facts indexes
+CREATE INDEX IF NOT EXISTS ix_earnings_analysis_performance_facts_earnings_date ON earnings.analysis_performance_facts(earnings_date);
+CREATE INDEX IF NOT EXISTS idx_analysis_performance_facts_ticker_earnings_date ON earnings.analysis_performance_facts(ticker, earnings_date);
+
 -- Correlations indexes
 CREATE INDEX IF NOT EXISTS idx_correlations_ticker ON earnings.correlations(ticker);
 CREATE INDEX IF NOT EXISTS idx_correlations_date ON earnings.correlations(analysis_date);
@@ -124,6 +210,9 @@ CREATE INDEX IF NOT EXISTS idx_correlations_date ON earnings.correlations(analys
 -- ============================================================================
 
 -- View: Analysis with price movement correlation
+-- Analyses are matched to their earnings event on (ticker, quarter, year) and
+-- to price movements on the event's trading date, so both joins are indexed.
+-- Live version of analysis_performance_facts, which the Python API reads.
 CREATE OR REPLACE VIEW earnings.analysis_performance AS
 SELECT 
     a.id AS analysis_id,
@@ -155,8 +244,11 @@ SELECT
         ELSE false
     END AS direction_correct_5d
 FROM earnings.analyses a
-LEFT JOIN earnings.price_movements pm ON a.ticker = pm.ticker 
-    AND DATE(a.analysis_date) = pm.earnings_date;
+LEFT JOIN earnings.earnings_events e ON e.ticker = a.ticker
+    AND e.quarter = a.quarter
+    AND e.year = a.year
+LEFT JOIN earnings.price_movements pm ON pm.ticker = e.ticker
+    AND pm.earnings_date = e.trading_date;
 
 -- View: Latest analysis per ticker
 CREATE OR REPLACE VIEW earnings.latest_analyses AS
@@ -225,6 +317,15 @@ CREATE TRIGGER update_price_movements_updated_at
     FOR EACH ROW
     EXECUTE FUNCTION earnings.update_updated_at_column();
 
+DROP TRIGGER IF EXISTS update_earnings_events_updated_at ON earnings.earnings_events;
+CREATE TRIGGER update_earnings_events_updated_at
+    BEFORE UPDATE ON earnings.earnings_events
+    FOR EACH ROW
+    EXECUTE FUNCTION earnings.update_updated_at_column();
+
+-- Dashboard counters (earnings.database_stats) and their triggers live in
+-- sql/database_stats.sql, applied by schema migration 2 in utils/migrations.py.
+
 -- ============================================================================
 -- Grants (adjust as needed for your user)
 -- ============================================================================
@@ -241,6 +342,9 @@ GRANT EXECUTE ON ALL FUNCTIONS IN SCHEMA earnings TO indurent_db_user;
 -- Get all transcripts with analysis count
 -- SELECT * FROM earnings.transcript_summary ORDER BY transcript_date DESC;
 
+-- Look up the reaction trading date for an earnings call
+-- SELECT trading_date FROM earnings.earnings_events WHERE ticker = 'AAPL' AND quarter = 3 AND year = 2024;
+
 -- Get analysis performance
 -- SELECT * FROM earnings.analysis_performance WHERE ticker = 'AAPL' ORDER BY analysis_date DESC;
 
@@ -0,0 +1,81 @@
+#!/usr/bin/env python3
+"""
+Sync SQLite
+Copies scores and price movements from the local SQLite database into
+PostgreSQL. Safe to re-run: rows are upserted, and each run resumes from the
+stored watermarks and only copies new or changed rows.
+
+Usage:
+    python3 sync_sqlite.py                                  # incremental
+    python3 sync_sqlite.py --sqlite-path data/earnings_analysis.db --full
+    python3 sync_sqlite.py --tables price_movements --batch-size 20000
+"""
+
+from dotenv import load_dotenv
+load_dotenv()
+
+import argparse
+import os
+import time
+
+from utils.database import Database
+from utils.sqlite_sync import SQLiteSync, SYNC_TABLES
+
+
+def parse_args():
+    """Parse command line arguments"""
+    parser = argparse.ArgumentParser(description="Sync the SQLite scores database into PostgreSQL")
+    parser.add_argument('--sqlite-path', default='data/earnings_analysis.db', help="SQLite database file")
+    parser.add_argument('--tables', nargs='+', choices=SYNC_TABLES, default=list(SYNC_TABLES),
+                        help="Tables to sync")
+    parser.add_argument('--batch-size', type=int, default=5000, help="Rows per batch/transaction")
+    parser.add_argument('--full', action='store_true', help="Ignore watermarks and copy every row")
+    return parser.parse_args()
+
+
+def main():
+    """Run the SQLite sync"""
+    args = parse_args()
+
+    print("=" * 70)
+    print("SYNCING SQLITE INTO POSTGRESQL")
+    print("=" * 70)
+
+    if not os.getenv('DB_URL'):
+        print("❌ Error: DB_URL not found in environment variables")
+        return False
+
+    try:
+        sync = SQLiteSync(Database(), args.sqlite_path, batch_size=args.batch_size)
+
+        print(f"\n📂 Source: {sync.source}")
+        for table, watermark in sync.get_watermarks().items():
+            print(f"   {table}: {watermark['rows_synced']} rows synced, last at {watermark['synced_at']}")
+
+        def show_progress(table, copied):
+            print(f"   {table}: {copied} rows")
+
+        started = time.time()
+        copied = sync.sync(tables=args.tables, full=args.full, progress_callback=show_progress)
+
+        print("\n" + "=" * 70)
+        for table, rows in copied.items():
+            print(f"✅ {table}: {rows} rows copied")
+        print(f"⏱️  {time.time() - started:.1f}s")
+        print("=" * 70)
+        return True
+
+    except ValueError as e:
+        print(f"\n❌ Error: {e}")
+        return False
+    except Exception as e:
+        print(f"\n❌ Error syncing database: {e}")
+        import traceback
+        traceback.print_exc()
+        return False
+
+
+if __name__ == "__main__":
+    import sys
+    success = main()
+    sys.exit(0 if success else 1)
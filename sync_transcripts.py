@@ -0,0 +1,95 @@
+#!/usr/bin/env python3
+"""
+Sync Transcripts
+Fetches transcripts missing for a ticker universe and date range.
+Safe to re-run: already held transcripts are skipped and an interrupted run
+resumes from its checkpoint.
+
+Usage:
+    python3 sync_transcripts.py --tickers AAPL MSFT --start 2024-01-01 --end 2024-12-31
+    python3 sync_transcripts.py --universe-file universe.txt --start 2023-01-01 --sources finnhub fmp
+"""
+
+from dotenv import load_dotenv
+load_dotenv()
+
+import argparse
+import os
+from datetime import date
+
+from utils.bulk_downloader import BulkTranscriptDownloader
+from utils.transcript_sync import TranscriptSync
+
+
+def parse_args():
+    """Parse command line arguments"""
+    parser = argparse.ArgumentParser(description="Incrementally sync earnings call transcripts")
+    parser.add_argument('--tickers', nargs='*', default=[], help="Ticker symbols")
+    parser.add_argument('--universe-file', help="File with one ticker per line")
+    parser.add_argument('--start', required=True, type=date.fromisoformat, help="Start date (YYYY-MM-DD)")
+    parser.add_argument('--end', type=date.fromisoformat, default=date.today(), help="End date (YYYY-MM-DD, default today)")
+    parser.add_argument('--sources', nargs='+', default=['api_ninjas'],
+                        choices=['api_ninjas', 'finnhub', 'fmp'], help="Sources, tried in order")
+    parser.add_argument('--transcript-dir', default='transcripts', help="Transcript directory")
+    parser.add_argument('--checkpoint', default='data/transcript_sync_checkpoint.json', help="Checkpoint file")
+    parser.add_argument('--no-db', action='store_true', help="Do not read from or write to PostgreSQL")
+    parser.add_argument('--retry-not-found', action='store_true', help="Retry transcripts previously not found")
+    return parser.parse_args()
+
+
+def main():
+    """Run the transcript sync"""
+    args = parse_args()
+
+    print("=" * 70)
+    print("SYNCING TRANSCRIPTS")
+    print("=" * 70)
+
+    tickers = list(args.tickers)
+    if args.universe_file:
+        with open(args.universe_file, 'r') as f:
+            tickers += [line.strip() for line in f if line.strip() and not line.startswith('#')]
+
+    if not tickers:
+        print("❌ Error: no tickers given (use --tickers or --universe-file)")
+        return False
+
+    db = None
+    if not args.no_db and os.getenv('DB_URL'):
+        from utils.database import Database
+        db = Database()
+        print("✅ Using PostgreSQL transcripts as existing inventory")
+
+    try:
+        downloader = BulkTranscriptDownloader.from_sources(args.sources, output_dir=args.transcript_dir)
+    except ValueError as e:
+        print(f"❌ Error: {e}")
+        return False
+
+    sync = TranscriptSync(downloader, db=db, transcript_dir=args.transcript_dir,
+                          checkpoint_path=args.checkpoint)
+
+    missing = sync.plan(tickers, args.start, args.end, retry_not_found=args.retry_not_found)
+    print(f"\n📊 Universe: {len(set(t.upper() for t in tickers))} tickers, {args.start} to {args.end}")
+    print(f"📥 Missing transcripts: {len(missing)}")
+
+    def show_progress(result, completed, total):
+        icon = "✅" if result['status'] == 'success' else "⚠️" if result['status'] == 'not_found' else "❌"
+        print(f"   [{completed}/{total}] {icon} {result['ticker']} Q{result['quarter']} {result['year']}: {result['status']}")
+
+    summary = sync.run(tickers, args.start, args.end, retry_not_found=args.retry_not_found,
+                       progress_callback=show_progress)
+
+    print("\n" + "=" * 70)
+    print(f"✅ Downloaded: {summary['downloaded']}")
+    print(f"⚠️ Not found: {summary['not_found']}")
+    print(f"❌ Failed: {summary['failed']}")
+    print("=" * 70)
+
+    return summary['failed'] == 0
+
+
+if __name__ == "__main__":
+    import sys
+    success = main()
+    sys.exit(0 if success else 1)
@@ -174,6 +174,9 @@ Solid beat with positive momentum. Stock should move higher.
         # Test 7: Calculate correlation
         print("\n8️⃣ Testing correlation calculation...")
         
+        rows_written = db.refresh_correlations()
+        print(f"✅ Correlation statistics refreshed: {rows_written} rows")
+        
         correlation, sample_size = db.calculate_correlation("AAPL", period_days=5)
         
         print(f"✅ Correlation calculated:")
@@ -218,6 +221,19 @@ Solid beat with positive momentum. Stock should move higher.
             print(f"   Score: {latest['score']}/5")
             print(f"   Date: {latest['analysis_date']}")
         
+        # Test 12: Read/write routing
+        print("\n1️⃣3️⃣ Testing read/write engine routing...")
+        
+        from sqlalchemy import text
+        settings = "SELECT current_database(), current_setting('transaction_read_only')"
+        with db.get_session() as session:
+            write_db, write_read_only = session.execute(text(settings)).one()
+        with db.get_session(read_only=True) as session:
+            read_db, read_read_only = session.execute(text(settings)).one()
+        
+        assert write_read_only == 'off' and read_read_only == 'on'
+        print(f"✅ Writes: {write_db} (primary), reads: {read_db} (read-only)")
+        
         print("\n" + "=" * 70)
         print("✅ ALL DATABASE TESTS PASSED")
         print("=" * 70)
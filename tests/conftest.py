@@ -0,0 +1,41 @@
+"""
+Shared Test Fixtures
+PostgreSQL fixtures for the tests that need a live database (skipped without DB_URL)
+"""
+
+import os
+import sys
+
+import pytest
+from sqlalchemy import text
+
+# Add parent directory to path
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+# Tickers reserved for tests; their rows are deleted before and after each test
+TEST_TICKERS = ['ZZTA', 'ZZTB', 'ZZTC']
+
+TICKER_TABLES = ('analysis_performance_facts', 'analyses', 'transcripts', 'price_movements',
+                 'earnings_events', 'correlations')
+
+
+def delete_test_rows(engine, tickers=TEST_TICKERS) -> None:
+    """Remove every row of the test tickers"""
+    with engine.begin() as conn:
+        for table in TICKER_TABLES:
+            conn.execute(text(f"DELETE FROM earnings.{table} WHERE ticker = ANY(:tickers)"),
+                         {'tickers': list(tickers)})
+
+
+@pytest.fixture
+def pg_db():
+    """Database on DB_URL with the test tickers cleared"""
+    if not os.getenv('DB_URL'):
+        pytest.skip("DB_URL not set")
+
+    from utils.database import Database
+    db = Database()
+    delete_test_rows(db.engine)
+    yield db
+    delete_test_rows(db.engine)
+    db.close()
@@ -0,0 +1,132 @@
+"""
+Test Analytics Engine
+Checks DuckDB statistics over a Parquet snapshot against pandas/numpy
+"""
+
+import os
+import sys
+from datetime import date
+
+import numpy as np
+import pandas as pd
+import pytest
+
+pytest.importorskip('duckdb')
+
+# Add parent directory to path
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from utils.analytics import AnalyticsEngine
+from utils.db_util import DatabaseUtil
+
+
+def _pairs(count=400, seed=0):
+    rng = np.random.default_rng(seed)
+    score = rng.integers(-5, 6, count)
+    return pd.DataFrame({
+        'ticker': rng.choice(['AAPL', 'MSFT', 'NVDA'], count),
+        'quarter': rng.integers(1, 5, count),
+        'year': 2024,
+        'earnings_date': date(2024, 5, 1),
+        'analysis_date': pd.Timestamp('2024-05-01', tz='UTC'),
+        'score': score,
+        'provider': rng.choice(['openai', 'xai'], count),
+        'model': rng.choice(['gpt-4.1-mini', None], count),
+        'analysis_type': 'Standard Analysis',
+        'movement_1d_pct': score * 0.8 + rng.normal(0, 2, count),
+        'movement_3d_pct': None,
+        'movement_5d_pct': np.where(rng.random(count) < 0.2, np.nan, rng.normal(0, 3, count)),
+        'movement_10d_pct': rng.normal(0, 4, count),
+    })
+
+
+@pytest.fixture
+def engine(tmp_path):
+    engine = AnalyticsEngine(str(tmp_path / "performance.parquet"))
+    pairs = _pairs()
+    assert engine.write_snapshot([pairs.iloc[:150], pairs.iloc[150:]]) == len(pairs)
+    yield engine, pairs
+    engine.close()
+
+
+def test_correlations_match_pandas(engine):
+    engine, pairs = engine
+    stats = engine.correlations(period_days=1)
+
+    row = stats[(stats['ticker'] == 'AAPL') & (stats['provider'] == 'ALL')].iloc[0]
+    group = pairs[pairs['ticker'] == 'AAPL']
+    x, y = group['score'].astype(float), group['movement_1d_pct']
+    slope, intercept = np.polyfit(x, y, 1)
+
+    assert row['sample_size'] == len(group)
+    assert row['correlation_coefficient'] == pytest.approx(x.corr(y), abs=1e-3)
+    assert row['r_squared'] == pytest.approx(x.corr(y) ** 2, abs=1e-3)
+    assert row['mean_absolute_error'] == pytest.approx((y - (slope * x + intercept)).abs().mean(), abs=1e-2)
+
+    correct = ((x > 0) & (y > 0)) | ((x < 0) & (y < 0)) | ((x == 0) & y.between(-1, 1))
+    assert row['direction_accuracy'] == pytest.approx(100 * correct.mean(), abs=1e-2)
+
+    # Roll-ups: all pairs, and models with None reported as 'unknown'
+    overall = stats[(stats['ticker'] == 'ALL') & (stats['provider'] == 'ALL')].iloc[0]
+    assert overall['sample_size'] == len(pairs)
+    assert 'unknown' in set(stats['model'])
+
+
+def test_rollups_do_not_collide_with_ticker_all(tmp_path):
+    pairs = _pairs(60)
+    pairs.loc[:29, 'ticker'] = 'ALL'
+    engine = AnalyticsEngine(str(tmp_path / "performance.parquet"))
+    engine.write_snapshot([pairs])
+    stats = engine.correlations(period_days=1).set_index(['ticker', 'provider', 'model', 'rollup'])
+    engine.close()
+
+    assert stats.index.is_unique
+    assert stats.loc[('ALL', 'ALL', 'ALL', 7), 'sample_size'] == 60
+    assert stats.loc[('ALL', 'ALL', 'ALL', 3), 'sample_size'] == 30
+
+    # Each level's fit error only uses that level's pairs
+    group = pairs[pairs['ticker'] == 'ALL']
+    x, y = group['score'].astype(float), group['movement_1d_pct']
+    slope, intercept = np.polyfit(x, y, 1)
+    assert stats.loc[('ALL', 'ALL', 'ALL', 3), 'mean_absolute_error'] == pytest.approx(
+        (y - (slope * x + intercept)).abs().mean(), abs=1e-2)
+
+
+def test_calculate_correlation_skips_missing_movements(engine):
+    engine, pairs = engine
+    correlation, sample_size = engine.calculate_correlation('MSFT', period_days=5)
+
+    group = pairs[(pairs['ticker'] == 'MSFT') & pairs['movement_5d_pct'].notna()]
+    assert sample_size == len(group)
+    assert correlation == pytest.approx(group['score'].corr(group['movement_5d_pct']), abs=1e-9)
+    assert engine.calculate_correlation(period_days=3) == (0.0, 0)
+
+
+def test_leaderboard_and_direction_accuracy(engine):
+    engine, pairs = engine
+    board = engine.leaderboard(by='ticker', period_days=1, min_samples=1)
+    assert list(board['rank']) == sorted(board['rank'])
+    assert set(board['ticker']) == {'AAPL', 'MSFT', 'NVDA'}
+
+    cells = engine.direction_accuracy(period_days=1)
+    assert cells['count'].sum() == len(pairs)
+
+
+def test_snapshot_from_sqlite(tmp_path):
+    with DatabaseUtil(str(tmp_path / "earnings.db")) as db:
+        db.insert_score('AAPL', 1, 2024, date(2024, 5, 1), 3, 'ok', 'openai', None, 'Standard Analysis')
+        db.insert_score('MSFT', 1, 2024, date(2024, 4, 25), -2, 'meh', 'openai', None, 'Standard Analysis')
+        db.insert_price_movement('AAPL', date(2024, 5, 1), 100.0, price_after_1d=104.0)
+        db.insert_price_movement('MSFT', date(2024, 4, 25), 200.0, price_after_1d=190.0)
+
+        engine = AnalyticsEngine(str(tmp_path / "analytics" / "performance.parquet"))
+        assert engine.snapshot_from_sqlite(db) == 2
+        assert engine.refresh_from_sqlite(db) is False
+
+        snapshot_mtime = os.path.getmtime(engine.snapshot_path)
+        os.utime(db.db_path, (snapshot_mtime + 1, snapshot_mtime + 1))
+        assert engine.refresh_from_sqlite(db) is True
+
+    assert engine.calculate_correlation(period_days=1) == (pytest.approx(1.0), 2)
+    assert engine.get_snapshot_info()['tickers'] == 2
+    engine.close()
@@ -0,0 +1,80 @@
+"""
+Test Bulk Transcript Downloader
+Exercises concurrency caps, de-duplication and source fallback with stub clients
+"""
+
+import os
+import sys
+import threading
+import time
+
+# Add parent directory to path
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from utils.bulk_downloader import BulkTranscriptDownloader, build_jobs
+
+
+class StubClient:
+    """Transcript client that sleeps instead of calling an API"""
+
+    def __init__(self, available, delay=0.05):
+        self.available = available
+        self.delay = delay
+        self.calls = []
+        self.in_flight = 0
+        self.max_in_flight = 0
+        self.lock = threading.Lock()
+
+    def save_transcript_to_file(self, ticker, year, quarter, output_dir="transcripts"):
+        with self.lock:
+            self.calls.append((ticker, year, quarter))
+            self.in_flight += 1
+            self.max_in_flight = max(self.max_in_flight, self.in_flight)
+        time.sleep(self.delay)
+        with self.lock:
+            self.in_flight -= 1
+        if (ticker, year, quarter) in self.available:
+            return os.path.join(output_dir, f"{ticker}_Q{quarter}_{year}.md")
+        return None
+
+
+def test_build_jobs_deduplicates():
+    """Repeated tickers and periods produce one job each"""
+    jobs = build_jobs(["aapl", "AAPL ", "", "msft"], [(2024, 3), (2024, 3), (2024, 4)])
+    assert jobs == [("AAPL", 2024, 3), ("AAPL", 2024, 4), ("MSFT", 2024, 3), ("MSFT", 2024, 4)]
+
+
+def test_concurrency_cap_and_speed():
+    """Jobs run in parallel but never above the source's cap"""
+    tickers = [f"T{i}" for i in range(20)]
+    client = StubClient({(t, 2024, 3) for t in tickers})
+    downloader = BulkTranscriptDownloader({'finnhub': client}, concurrency={'finnhub': 5})
+
+    start = time.time()
+    results = downloader.download(tickers, [(2024, 3)])
+    elapsed = time.time() - start
+
+    assert len(results) == 20
+    assert all(r['status'] == 'success' for r in results)
+    assert client.max_in_flight <= 5
+    assert elapsed < 20 * client.delay / 2
+
+
+def test_fallback_and_progress():
+    """Missing transcripts fall through to the next source; progress streams per job"""
+    primary = StubClient({("AAPL", 2024, 3)}, delay=0)
+    fallback = StubClient({("MSFT", 2024, 3)}, delay=0)
+    downloader = BulkTranscriptDownloader({'api_ninjas': primary, 'finnhub': fallback})
+
+    progress = []
+    results = downloader.download(
+        ["AAPL", "MSFT", "GOOGL"], [(2024, 3)],
+        progress_callback=lambda result, done, total: progress.append((done, total))
+    )
+
+    by_ticker = {r['ticker']: r for r in results}
+    assert by_ticker["AAPL"]['source'] == 'api_ninjas'
+    assert by_ticker["MSFT"]['source'] == 'finnhub'
+    assert by_ticker["GOOGL"]['status'] == 'not_found'
+    assert ("AAPL", 2024, 3) not in fallback.calls
+    assert progress == [(1, 3), (2, 3), (3, 3)]
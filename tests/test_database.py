@@ -0,0 +1,224 @@
+"""
+Test PostgreSQL Database
+Checks the bulk write and query paths of utils.database.Database (skipped without DB_URL)
+"""
+
+from datetime import date
+
+import pandas as pd
+import pytest
+from sqlalchemy import text
+from sqlalchemy.exc import IntegrityError
+
+from conftest import TEST_TICKERS, delete_test_rows
+
+
+def transcript(ticker, quarter, text_value, year=2024):
+    return {
+        'ticker': ticker, 'quarter': quarter, 'year': year, 'transcript_date': date(year, quarter * 3, 15),
+        'transcript_text': text_value, 'source': 'manual_upload'
+    }
+
+
+def test_insert_transcripts_bulk_upserts(pg_db):
+    ticker_a, ticker_b = TEST_TICKERS[:2]
+    rows = [
+        transcript(ticker_a, 1, "first call"),
+        transcript(ticker_b, 1, "other call"),
+        transcript(ticker_a, 1, "first call revised text")  # Same key: last one wins
+    ]
+    ids = pg_db.insert_transcripts_bulk(rows, batch_size=2)
+
+    assert ids[0] == ids[2] != ids[1]
+    stored = pg_db.get_transcript(ticker_a, 1, 2024)
+    assert stored['transcript_text'] == "first call revised text"
+    assert stored['word_count'] == 4
+
+    # A re-run updates in place and keeps the IDs
+    assert pg_db.insert_transcripts_bulk([transcript(ticker_b, 1, "other call again")]) == [ids[1]]
+    assert pg_db.get_transcript(ticker_b, 1, 2024)['transcript_text'] == "other call again"
+    assert pg_db.get_earnings_event(ticker_a, 1, 2024)['event_date'] == date(2024, 3, 15)
+
+
+def test_insert_analyses_bulk_resolves_transcripts(pg_db):
+    ticker = TEST_TICKERS[0]
+    transcript_ids = pg_db.insert_transcripts_bulk([transcript(ticker, q, f"call {q}") for q in (1, 2)])
+
+    analyses = [{
+        'ticker': ticker.lower(), 'quarter': q, 'year': 2024, 'score': 3 - q, 'provider': 'openai',
+        'model': 'gpt-test', 'analysis_type': 'Standard Analysis',
+        'analysis_markdown': f"Q{q} analysis"
+    } for q in (1, 2, 2)]
+    ids = pg_db.insert_analyses_bulk(analyses, batch_size=2)
+
+    assert len(set(ids)) == 3
+    for analysis_id, quarter in zip(ids, (1, 2, 2)):
+        stored = pg_db.get_analysis(analysis_id)
+        assert stored['ticker'] == ticker
+        assert stored['transcript_id'] == transcript_ids[quarter - 1]
+        assert stored['score'] == 3 - quarter
+
+
+def test_analyses_pages_cover_every_row(pg_db):
+    ticker = TEST_TICKERS[0]
+    pg_db.insert_transcripts_bulk([transcript(ticker, q, f"call {q}") for q in (1, 2, 3)])
+    ids = pg_db.insert_analyses_bulk([{
+        'ticker': ticker, 'quarter': q, 'year': 2024, 'score': 1, 'provider': 'openai',
+        'analysis_type': 'Standard Analysis', 'analysis_markdown': f"Q{q} analysis"
+    } for q in (1, 2, 3, 3)])
+
+    # The keyset cursor compares (analysis_date, id); a NULL date would be skipped
+    with pytest.raises(IntegrityError):
+        with pg_db.engine.begin() as conn:
+            conn.execute(text("UPDATE earnings.analyses SET analysis_date = NULL WHERE id = :id"), {'id': ids[0]})
+
+    seen, cursor = [], None
+    while True:
+        page, cursor = pg_db.get_analyses_page(ticker=ticker, after=cursor, page_size=3)
+        seen += page['id'].tolist()
+        if cursor is None:
+            break
+    assert sorted(seen) == sorted(ids)
+
+
+def test_price_movements_without_a_usable_price_before(pg_db):
+    ticker_a, ticker_b, ticker_c = TEST_TICKERS
+    movements = pd.DataFrame({
+        'ticker': [ticker_a, ticker_b, ticker_c],
+        'earnings_date': ['2024-05-01', '2024-05-01', '2024-05-01'],
+        'price_before': [0.0, 0.5, 100.0],
+        'price_after_1d': [12.0, 80.0, 104.0],  # +15900% does not fit NUMERIC(6, 2)
+    })
+    assert len(pg_db.insert_price_movements_bulk(movements)) == 3
+
+    stored = pd.read_sql(
+        text("SELECT ticker, movement_1d_pct FROM earnings.price_movements WHERE ticker = ANY(:tickers)"),
+        pg_db.engine, params={'tickers': TEST_TICKERS}
+    ).set_index('ticker')
+    assert pd.isna(stored.loc[ticker_a, 'movement_1d_pct'])
+    assert pd.isna(stored.loc[ticker_b, 'movement_1d_pct'])
+    assert stored.loc[ticker_c, 'movement_1d_pct'] == 4.0
+
+
+def test_price_movement_refreshes_only_matching_facts(pg_db):
+    ticker = TEST_TICKERS[0]
+    pg_db.insert_transcripts_bulk([transcript(ticker, q, f"call {q}") for q in (1, 2)])
+    ids = pg_db.insert_analyses_bulk([{
+        'ticker': ticker, 'quarter': q, 'year': 2024, 'score': 2, 'provider': 'openai',
+        'analysis_type': 'Standard Analysis', 'analysis_markdown': f"Q{q} analysis"
+    } for q in (1, 2)])
+
+    def refreshed():
+        rows = pg_db.execute_raw_sql(
+            f"SELECT analysis_id, refreshed_at, movement_1d_pct FROM earnings.analysis_performance_facts "
+            f"WHERE ticker = '{ticker}'"
+        )
+        return rows.set_index('analysis_id')
+
+    before = refreshed()
+    q1_trading_date = pg_db.get_earnings_event(ticker, 1, 2024)['trading_date']
+    pg_db.insert_price_movements_bulk(pd.DataFrame({
+        'ticker': [ticker], 'earnings_date': [q1_trading_date], 'price_before': [100.0], 'price_after_1d': [103.0]
+    }))
+    after = refreshed()
+
+    assert after.loc[ids[0], 'movement_1d_pct'] == 3.0
+    assert after.loc[ids[0], 'refreshed_at'] > before.loc[ids[0], 'refreshed_at']
+    # Q2 trades on another date: its fact is not rewritten
+    assert after.loc[ids[1], 'refreshed_at'] == before.loc[ids[1], 'refreshed_at']
+
+
+def scored_quarters(db, ticker, quarters):
+    """Transcripts, analyses and 1-day movements for (quarter, score, movement_pct) tuples"""
+    db.insert_transcripts_bulk([transcript(ticker, q, f"call {q}") for q, _, _ in quarters])
+    db.insert_analyses_bulk([{
+        'ticker': ticker, 'quarter': q, 'year': 2024, 'score': score, 'provider': 'openai',
+        'model': 'gpt-test', 'analysis_type': 'Standard Analysis', 'analysis_markdown': f"Q{q} analysis"
+    } for q, score, _ in quarters])
+    db.insert_price_movements_bulk(pd.DataFrame({
+        'ticker': [ticker] * len(quarters),
+        'earnings_date': [db.get_earnings_event(ticker, q, 2024)['trading_date'] for q, _, _ in quarters],
+        'price_before': [100.0] * len(quarters),
+        'price_after_1d': [100.0 + pct for _, _, pct in quarters],
+    }))
+
+
+def test_correlation_rollups_do_not_collide_with_ticker_all(pg_db):
+    # Allstate trades as ALL, the label of the all-ticker roll-ups
+    if len(pg_db.execute_raw_sql("SELECT 1 FROM earnings.analyses WHERE ticker = 'ALL' LIMIT 1")):
+        pytest.skip("database holds real ALL rows")
+    as_of = date(2099, 1, 1)
+    try:
+        scored_quarters(pg_db, 'ALL', [(1, 1, 2.0), (2, 3, 5.0)])
+        scored_quarters(pg_db, TEST_TICKERS[0], [(1, -2, -4.0), (2, 2, 1.0)])
+        assert pg_db.refresh_correlations(as_of=as_of) > 0
+
+        labelled_all = pg_db.get_correlations(ticker='ALL', period_days=1, as_of=as_of)
+        assert sorted(labelled_all['rollup']) == [0, 3, 4, 7]
+        assert pg_db.calculate_correlation('ALL', period_days=1)[1] == 2
+        everything = pg_db.execute_raw_sql(
+            "SELECT count(*) AS n FROM earnings.analysis_performance_facts "
+            "WHERE score IS NOT NULL AND movement_1d_pct IS NOT NULL"
+        )
+        assert pg_db.calculate_correlation(period_days=1)[1] == everything['n'][0]
+
+        # Facts written after the refresh are not hidden by the stored rows
+        scored_quarters(pg_db, TEST_TICKERS[0], [(3, 1, 0.5)])
+        assert pg_db.calculate_correlation(TEST_TICKERS[0], period_days=1)[1] == 3
+    finally:
+        delete_test_rows(pg_db.engine, ['ALL'])
+        with pg_db.engine.begin() as conn:
+            conn.execute(text("DELETE FROM earnings.correlations WHERE analysis_date = :as_of"), {'as_of': as_of})
+
+
+def test_database_stats_writers_do_not_block_each_other(pg_db):
+    before = pg_db.get_database_stats()
+    insert = text("""
+        INSERT INTO earnings.analyses (ticker, quarter, year, analysis_markdown, provider, analysis_type)
+        VALUES (:ticker, 1, 2024, 'concurrent', 'openai', 'Standard Analysis')
+    """)
+
+    with pg_db.engine.connect() as first, pg_db.engine.connect() as second:
+        first.execute(insert, {'ticker': TEST_TICKERS[0]})
+        first.execute(insert, {'ticker': TEST_TICKERS[1]})
+        # Opposite ticker order in an overlapping transaction: no shared
+        # counter row to wait for, so this does not hit the lock timeout
+        second.execute(text("SET LOCAL lock_timeout = '2s'"))
+        second.execute(insert, {'ticker': TEST_TICKERS[1]})
+        second.execute(insert, {'ticker': TEST_TICKERS[0]})
+        second.commit()
+        first.commit()
+
+    after = pg_db.get_database_stats()
+    assert after['analyses_count'] == before['analyses_count'] + 4
+    assert after['unique_tickers'] == before['unique_tickers'] + 2
+
+    pg_db.compact_database_stats()
+    assert pg_db.get_database_stats() == after
+    assert len(pg_db.execute_raw_sql("SELECT id FROM earnings.database_stats_deltas")) == 1
+
+
+def test_backfill_analysis_fields_skips_filled_rows(pg_db):
+    ticker = TEST_TICKERS[0]
+    pg_db.insert_transcripts_bulk([transcript(ticker, q, f"call {q}") for q in (1, 2, 3)])
+    ids = pg_db.insert_analyses_bulk([{
+        'ticker': ticker, 'quarter': q, 'year': 2024, 'score': 2, 'provider': 'openai',
+        'analysis_type': 'Standard Analysis', 'analysis_markdown': "EPS of $1.57 beat estimates by 3 cents."
+    } for q in (1, 2, 3)])
+
+    # Rows saved before fields were extracted: empty, partial and missing
+    with pg_db.engine.begin() as conn:
+        conn.execute(text("UPDATE earnings.analyses SET analysis_json = NULL WHERE id = :id"), {'id': ids[0]})
+        conn.execute(text("""UPDATE earnings.analyses SET analysis_json = '{"score": 5, "note": "kept"}'
+                             WHERE id = :id"""), {'id': ids[1]})
+
+    assert pg_db.backfill_analysis_fields(batch_size=1) >= 2
+    assert pg_db.backfill_analysis_fields() == 0
+
+    with pg_db.engine.connect() as conn:
+        fields = dict(conn.execute(text("SELECT id, analysis_json FROM earnings.analyses WHERE id = ANY(:ids)"),
+                                   {'ids': ids}).all())
+    assert fields[ids[0]]['eps_beat'] is True
+    assert fields[ids[0]]['score'] == 2
+    assert fields[ids[1]]['score'] == 5 and fields[ids[1]]['note'] == 'kept'
+    assert fields[ids[1]]['eps_beat'] is True
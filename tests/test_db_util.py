@@ -0,0 +1,98 @@
+"""
+Test SQLite Database Utility
+Checks the persistent WAL connection and the bulk score/price movement writes
+"""
+
+import os
+import sys
+import threading
+from datetime import date, datetime
+
+import pandas as pd
+
+# Add parent directory to path
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from utils.db_util import DatabaseUtil
+
+
+def test_connection_is_persistent_and_tuned(tmp_path):
+    with DatabaseUtil(str(tmp_path / "earnings.db")) as db:
+        conn = db.get_connection()
+        assert db.get_connection() is conn
+        assert conn.execute("PRAGMA journal_mode").fetchone()[0] == 'wal'
+        assert conn.execute("PRAGMA synchronous").fetchone()[0] == 1  # NORMAL
+
+        # Each thread gets its own connection
+        other = []
+        thread = threading.Thread(target=lambda: other.append(db.get_connection()))
+        thread.start()
+        thread.join()
+        assert other[0] is not conn
+
+
+def test_insert_score_upserts(tmp_path):
+    with DatabaseUtil(str(tmp_path / "earnings.db")) as db:
+        stamp = datetime(2024, 5, 1, 12, 0)
+        first = db.insert_score('AAPL', 1, 2024, date(2024, 5, 1), 2, 'ok', 'openai', 'gpt', 'sentiment', stamp)
+        second = db.insert_score('AAPL', 1, 2024, date(2024, 5, 1), 4, 'better', 'openai', 'gpt', 'sentiment', stamp)
+
+        assert first == second
+        latest = db.get_latest_score('AAPL')
+        assert latest['score'] == 4
+        assert latest['score_justification'] == 'better'
+
+
+def test_insert_scores_bulk(tmp_path):
+    with DatabaseUtil(str(tmp_path / "earnings.db")) as db:
+        stamp = datetime(2024, 5, 1, 12, 0)
+        scores = [
+            {'ticker': ticker, 'quarter': quarter, 'year': 2024, 'earnings_date': date(2024, quarter * 3, 1),
+             'analysis_timestamp': stamp, 'score': quarter, 'provider': 'openai', 'analysis_type': 'sentiment'}
+            for ticker in ('AAPL', 'MSFT') for quarter in (1, 2, 3, 4)
+        ]
+        assert db.insert_scores_bulk(scores) == 8
+
+        # Re-running updates in place
+        scores[0]['score'] = -3
+        db.insert_scores_bulk(scores)
+
+        df = db.get_scores_by_ticker('AAPL')
+        assert len(df) == 4
+        assert df.loc[df['quarter'] == 1, 'score'].item() == -3
+        assert db.get_all_tickers() == ['AAPL', 'MSFT']
+
+
+def test_insert_price_movements_bulk_matches_single_insert(tmp_path):
+    with DatabaseUtil(str(tmp_path / "earnings.db")) as db:
+        db.insert_price_movement('AAPL', date(2024, 5, 1), 100.0, price_after_1d=105.0, volume_before=1000)
+
+        movements = pd.DataFrame({
+            'ticker': ['MSFT', 'AAPL', 'NVDA'],
+            'earnings_date': ['2024-04-25', '2024-05-01', '2024-05-22'],
+            'price_before': [200.0, 100.0, 0.0],
+            'price_after_1d': [190.0, 110.0, 120.0],
+            'price_after_3d': [None, 0.0, 121.0],
+        })
+        assert db.insert_price_movements_bulk(movements) == 3
+
+        rows = db.get_connection().execute(
+            "SELECT ticker, movement_1d_pct, movement_3d_pct, volume_before FROM price_movements ORDER BY ticker"
+        ).fetchall()
+        assert [tuple(row) for row in rows] == [
+            ('AAPL', 10.0, None, None), ('MSFT', -5.0, None, None), ('NVDA', None, None, None)
+        ]
+
+
+def test_connections_of_finished_threads_are_closed(tmp_path):
+    with DatabaseUtil(str(tmp_path / "earnings.db")) as db:
+        for _ in range(3):
+            thread = threading.Thread(target=db.get_connection)
+            thread.start()
+            thread.join()
+
+        # The main thread's connection plus the last finished thread's, which
+        # is reaped when the next thread connects
+        status = db.get_connection_status()
+        assert status['open_connections'] == 2
+        assert status['active_threads'] == 1
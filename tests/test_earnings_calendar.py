@@ -0,0 +1,66 @@
+"""
+Test Earnings Calendar
+Checks date parsing and trading-session alignment for earnings events
+"""
+
+import os
+import sys
+from datetime import date, datetime
+
+# Add parent directory to path
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from utils.earnings_calendar import (
+    EarningsCalendar, extract_event_time, is_trading_day, parse_event_datetime, reaction_session
+)
+
+
+def test_trading_days():
+    """Weekends and NYSE holidays are not trading days"""
+    assert is_trading_day(date(2024, 8, 1))
+    assert not is_trading_day(date(2024, 8, 3))   # Saturday
+    assert not is_trading_day(date(2024, 3, 29))  # Good Friday
+    assert not is_trading_day(date(2024, 7, 4))   # Independence Day
+    assert not is_trading_day(date(2023, 6, 19))  # Juneteenth
+
+
+def test_parse_source_formats():
+    """Each source's date format parses to market time"""
+    assert parse_event_datetime("2024-08-01") == date(2024, 8, 1)
+    assert parse_event_datetime("2024-08-01 17:00:00") == datetime(2024, 8, 1, 17, 0)
+    assert parse_event_datetime("2024-08-01T21:00:00Z") == datetime(2024, 8, 1, 17, 0)
+    assert parse_event_datetime("not a date") is None
+    assert parse_event_datetime(None) is None
+
+
+def test_reaction_session():
+    """Calls are aligned to the first session that can react to them"""
+    # Pre-market call reacts the same day
+    assert reaction_session(datetime(2024, 7, 30, 7, 0)) == date(2024, 7, 30)
+    # After-close Thursday call reacts on Friday
+    assert reaction_session(datetime(2024, 8, 1, 17, 0)) == date(2024, 8, 2)
+    # Date-only Thursday before Good Friday rolls to Monday
+    assert reaction_session(date(2024, 3, 28)) == date(2024, 4, 1)
+    assert reaction_session(date(2024, 8, 1), assume_after_close=False) == date(2024, 8, 1)
+
+
+def test_extract_event_time():
+    """Source metadata wins over the stored transcript date"""
+    metadata = {"time": "2024-08-01 17:00:00", "quarter": 3, "year": 2024}
+    assert extract_event_time("finnhub", metadata, fallback=date(2024, 8, 5)) == datetime(2024, 8, 1, 17, 0)
+    assert extract_event_time("api_ninjas", {}, fallback="2024-08-05") == date(2024, 8, 5)
+
+
+def test_calendar_lookup(tmp_path):
+    """Calendar built from transcript files is keyed by ticker/quarter/year"""
+    (tmp_path / "AAPL_Q3_2024.md").write_text(
+        "# AAPL Q3 2024 Earnings Call Transcript\n\n**Date:** 2024-08-01\n**Company:** AAPL\n"
+    )
+    (tmp_path / "notes.md").write_text("not a transcript")
+
+    calendar = EarningsCalendar.from_transcript_dir(str(tmp_path))
+
+    assert len(calendar) == 1
+    assert ("aapl", 3, 2024) in calendar
+    assert calendar.trading_date("AAPL", 3, 2024) == date(2024, 8, 2)
+    assert calendar.lookup("MSFT", 3, 2024) is None
@@ -0,0 +1,70 @@
+"""
+Test Engine Routing
+Checks that writes use the primary and reads the read engine, each with its
+own settings (skipped without DB_URL and DB_READ_URL)
+"""
+
+import os
+from datetime import date
+
+import pytest
+from sqlalchemy import make_url, text
+from sqlalchemy.exc import DBAPIError
+
+from conftest import delete_test_rows
+
+pytestmark = pytest.mark.skipif(not (os.getenv('DB_URL') and os.getenv('DB_READ_URL')),
+                                reason="DB_URL and DB_READ_URL not set")
+
+SETTINGS_SQL = text("""
+    SELECT current_database() AS database,
+           current_setting('application_name') AS application_name,
+           current_setting('transaction_read_only') AS read_only,
+           current_setting('statement_timeout') AS statement_timeout
+""")
+
+
+@pytest.fixture
+def routed_db():
+    from utils.database import Database
+    # One read connection, so every read below reuses it
+    db = Database(engine_options={'read': {'pool_size': 1, 'max_overflow': 0}})
+    yield db
+    db.close()
+
+
+def test_reads_and_writes_use_their_own_engines(routed_db):
+    with routed_db.get_session() as session:
+        write = session.execute(SETTINGS_SQL).mappings().one()
+    with routed_db.get_session(read_only=True) as session:
+        read = session.execute(SETTINGS_SQL).mappings().one()
+
+    assert write == {'database': make_url(os.environ['DB_URL']).database,
+                     'application_name': 'earnings-calls-write', 'read_only': 'off', 'statement_timeout': '0'}
+    assert read == {'database': make_url(os.environ['DB_READ_URL']).database,
+                    'application_name': 'earnings-calls-read', 'read_only': 'on', 'statement_timeout': '30s'}
+
+    with pytest.raises(DBAPIError, match="read-only transaction"):
+        with routed_db.get_session(read_only=True) as session:
+            session.execute(text("CREATE TABLE routing_check (id INTEGER)"))
+
+
+def test_streaming_reads_run_without_the_read_timeout(routed_db):
+    chunks = list(routed_db._iter_chunks(SETTINGS_SQL, chunksize=10))
+    assert chunks[0].loc[0, 'application_name'] == 'earnings-calls-read'
+    assert chunks[0].loc[0, 'statement_timeout'] == '0'
+
+    # SET LOCAL ends with the transaction; the pooled connection keeps 30s
+    with routed_db.get_session(read_only=True) as session:
+        assert session.execute(SETTINGS_SQL).mappings().one()['statement_timeout'] == '30s'
+
+
+def test_key_lookups_use_the_read_engine(routed_db):
+    # Inserted on the primary only, so a lookup on the read database misses it
+    delete_test_rows(routed_db.engine)
+    try:
+        routed_db.insert_transcript('ZZTA', 1, 2024, date(2024, 1, 30), "text", 'test')
+        assert routed_db.get_transcript_id('ZZTA', 1, 2024) is None
+        assert routed_db.get_transcript_keys(['ZZTA']) == set()
+    finally:
+        delete_test_rows(routed_db.engine)
@@ -0,0 +1,63 @@
+"""
+Test Typed DataFrames
+Checks the dtypes applied to database query results
+"""
+
+import os
+import sys
+from datetime import date
+from decimal import Decimal
+
+import pandas as pd
+import pytest
+
+# Add parent directory to path
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from utils.db_util import DatabaseUtil
+from utils.frames import typed_frame
+
+
+def raw_frame():
+    """Query result as read from PostgreSQL: NUMERIC as Decimal, strings as objects"""
+    return pd.DataFrame({
+        'ticker': pd.Series(['AAPL', 'MSFT', 'AAPL'], dtype=object),
+        'score': pd.Series([3, None, -2], dtype=object),
+        'movement_1d_pct': pd.Series([Decimal('1.25'), None, Decimal('-0.50')], dtype=object),
+        'notes': pd.Series(['a', 'b', 'c'], dtype=object),
+    })
+
+
+def test_typed_frame_numpy():
+    df = typed_frame(raw_frame())
+
+    assert df['movement_1d_pct'].dtype == 'float64'
+    assert df['movement_1d_pct'].tolist()[::2] == [1.25, -0.5]
+    assert df['score'].dtype == 'Int8'
+    assert df['score'].isna().tolist() == [False, True, False]
+    assert isinstance(df['ticker'].dtype, pd.CategoricalDtype)
+    assert df['notes'].dtype == object  # unknown columns are left alone
+
+
+def test_typed_frame_pyarrow():
+    df = typed_frame(raw_frame(), dtype_backend='pyarrow')
+
+    assert str(df['movement_1d_pct'].dtype) == 'double[pyarrow]'
+    assert str(df['score'].dtype) == 'int8[pyarrow]'
+    assert df['movement_1d_pct'].sum() == pytest.approx(0.75)
+
+    with pytest.raises(ValueError):
+        typed_frame(raw_frame(), dtype_backend='polars')
+
+
+def test_sqlite_correlation_frame_is_typed(tmp_path):
+    with DatabaseUtil(str(tmp_path / "earnings.db")) as db:
+        db.insert_score('AAPL', 1, 2024, date(2024, 5, 1), 3, 'ok', 'openai', 'gpt', 'sentiment')
+        db.insert_price_movement('AAPL', date(2024, 5, 1), 100.0, 101.5, price_after_5d=103.0)
+
+        df = db.get_score_price_correlation()
+
+    assert len(df) == 1
+    assert df['score'].dtype == 'Int8'
+    assert df['price_before'].dtype == 'float64'
+    assert isinstance(df['ticker'].dtype, pd.CategoricalDtype)
@@ -0,0 +1,151 @@
+"""
+Test HTTP Cassettes
+Records responses from a local HTTP server and replays them offline
+"""
+
+import gzip
+import json
+import os
+import sys
+import threading
+from http.server import BaseHTTPRequestHandler, HTTPServer
+
+import pandas as pd
+import pytest
+import requests
+
+# Add parent directory to path
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from utils.finnhub_client import FinnhubClient
+from utils.http_cassette import Cassette, CassetteMiss, InjectedError, call_key, request_key, use_cassette
+
+
+LISTING = [{'id': 'AAPL_2024_3', 'year': 2024, 'quarter': 3, 'time': '2024-08-01 17:00:00'}]
+
+
+class TranscriptHandler(BaseHTTPRequestHandler):
+    """Serves a fixed Finnhub-style transcript listing (the list FinnhubClient parses)"""
+
+    def do_GET(self):
+        body = json.dumps(LISTING).encode('utf-8')
+        self.send_response(200)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+
+@pytest.fixture
+def server():
+    httpd = HTTPServer(('127.0.0.1', 0), TranscriptHandler)
+    thread = threading.Thread(target=httpd.serve_forever, daemon=True)
+    thread.start()
+    yield httpd
+    httpd.shutdown()
+    httpd.server_close()
+
+
+def test_request_key_strips_secrets():
+    key = request_key('get', 'https://finnhub.io/api/v1/stock/transcripts?token=abc', {'symbol': 'AAPL'})
+    assert key == "GET https://finnhub.io/api/v1/stock/transcripts?symbol=AAPL"
+
+
+def test_record_then_replay_offline(server, tmp_path):
+    path = str(tmp_path / "finnhub.json.gz")
+    base_url = f"http://127.0.0.1:{server.server_address[1]}"
+
+    client = FinnhubClient(api_key="secret-token", listing_ttl=0)
+    client.base_url = base_url
+    with use_cassette(path, mode='record'):
+        recorded = client.get_transcripts_list("AAPL")
+    assert recorded == LISTING
+
+    with gzip.open(path, 'rt', encoding='utf-8') as f:
+        assert "secret-token" not in f.read()
+
+    # Server gone: replay must not touch the network
+    server.shutdown()
+    server.server_close()
+
+    client = FinnhubClient(api_key="other-token", listing_ttl=0)
+    client.base_url = base_url
+    with use_cassette(path) as cassette:
+        assert cassette.mode == 'replay'
+        assert client.get_transcripts_list("AAPL") == LISTING
+        assert cassette.play_counts == {request_key('GET', f"{base_url}/stock/transcripts", {'symbol': 'AAPL'}): 1}
+        with pytest.raises(CassetteMiss):
+            requests.get(f"{base_url}/stock/transcripts", params={'symbol': 'MSFT'})
+
+
+def test_replay_injects_latency_and_errors(server, tmp_path):
+    path = str(tmp_path / "finnhub.json.gz")
+    url = f"http://127.0.0.1:{server.server_address[1]}/stock/transcripts"
+
+    with Cassette(path, mode='record'):
+        requests.get(url, params={'symbol': 'AAPL'})
+
+    with Cassette(path, error_rate=1.0):
+        with pytest.raises(InjectedError):
+            requests.get(url, params={'symbol': 'AAPL'})
+
+    with Cassette(path, latency=(0.0, 0.01), error_rate=0.5, seed=7):
+        outcomes = []
+        for _ in range(20):
+            try:
+                outcomes.append(requests.get(url, params={'symbol': 'AAPL'}).status_code)
+            except InjectedError:
+                outcomes.append('error')
+    assert 200 in outcomes and 'error' in outcomes
+
+
+def test_wrap_replays_method_results(tmp_path):
+    path = str(tmp_path / "calls.json.gz")
+
+    class Quotes:
+        def __init__(self):
+            self.calls = 0
+
+        def get_price(self, ticker):
+            self.calls += 1
+            return {'ticker': ticker, 'price': 100 + self.calls}
+
+    with Cassette(path, mode='record') as cassette:
+        assert cassette.wrap(Quotes()).get_price("AAPL") == {'ticker': 'AAPL', 'price': 101}
+
+    quotes = Quotes()
+    with Cassette(path) as cassette:
+        assert cassette.wrap(quotes).get_price("AAPL") == {'ticker': 'AAPL', 'price': 101}
+    assert quotes.calls == 0
+
+
+def test_wrap_records_frames_as_json(tmp_path):
+    path = str(tmp_path / "frames.json.gz")
+    days = pd.date_range('2024-08-01', periods=3, tz='America/New_York', name='Date')
+    prices = pd.DataFrame({'Close': [218.5, 219.1, 217.8], 'Volume': [41_000_000, 39_500_000, 44_200_000]}, index=days)
+
+    class Prices:
+        def get_price_data(self, ticker, period="1y"):
+            return prices
+
+        def get_history(self, ticker):
+            return {'Close': prices['Close'].to_dict(), 'as_of': days[-1]}
+
+    with Cassette(path, mode='record') as cassette:
+        client = cassette.wrap(Prices())
+        client.get_price_data("AAPL", period="1mo")
+        client.get_history("AAPL")
+
+    # Plain JSON, no pickles
+    with gzip.open(path, 'rt', encoding='utf-8') as f:
+        assert 'pickle' not in json.load(f)['interactions'][call_key('Prices.get_price_data', ("AAPL",), {'period': "1mo"})][0]
+
+    with Cassette(path) as cassette:
+        client = cassette.wrap(Prices())
+        pd.testing.assert_frame_equal(client.get_price_data("AAPL", period="1mo"), prices, check_index_type=False, check_freq=False)
+        history = client.get_history("AAPL")
+    assert history['as_of'] == days[-1]
+    assert history['Close'][days[0]] == 218.5
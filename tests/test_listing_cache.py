@@ -0,0 +1,90 @@
+"""
+Test Listing Cache
+Checks that multi-quarter lookups fetch each symbol's transcript listing once
+"""
+
+import os
+import sys
+
+# Add parent directory to path
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from utils.finnhub_client import FinnhubClient
+from utils.api_ninjas_client import APINinjasClient
+from utils.listing_cache import ListingCache, index_by_period
+
+
+class FakeResponse:
+    def __init__(self, data):
+        self.data = data
+
+    def raise_for_status(self):
+        pass
+
+    def json(self):
+        return self.data
+
+
+def test_index_by_period():
+    """String and int periods index the same way; first entry wins"""
+    index = index_by_period([
+        {'year': '2024', 'quarter': '3', 'id': 'a'},
+        {'year': 2024, 'quarter': 3, 'id': 'b'},
+        {'year': None, 'quarter': 1, 'id': 'c'},
+    ])
+    assert index == {(2024, 3): {'year': '2024', 'quarter': '3', 'id': 'a'}}
+
+
+def test_cache_ttl():
+    """Listings are reloaded after the TTL and empty listings are not cached"""
+    calls = []
+    cache = ListingCache(ttl=0)
+    cache.get('AAPL', lambda s: calls.append(s) or [{'year': 2024, 'quarter': 1}])
+    cache.get('AAPL', lambda s: calls.append(s) or [{'year': 2024, 'quarter': 1}])
+    assert calls == ['AAPL', 'AAPL']
+
+    cache = ListingCache(ttl=60)
+    cache.get('MSFT', lambda s: calls.append(s) or [])
+    cache.get('MSFT', lambda s: calls.append(s) or [])
+    assert calls.count('MSFT') == 2
+
+
+def test_finnhub_find_transcripts(monkeypatch):
+    """Four quarters for one symbol need one listing request"""
+    listing = [{'id': f'AAPL_{y}_{q}', 'year': y, 'quarter': q} for y in (2023, 2024) for q in (1, 2, 3, 4)]
+    requests_made = []
+
+    def fake_get(url, params=None, **kwargs):
+        requests_made.append(dict(params))
+        if 'symbol' in params:
+            return FakeResponse(listing)
+        return FakeResponse({'id': params['id'], 'transcript': []})
+
+    monkeypatch.setattr('utils.finnhub_client.requests.get', fake_get)
+    client = FinnhubClient(api_key='test')
+
+    periods = [(2024, q) for q in (1, 2, 3, 4)] + [(2025, 1)]
+    results = client.find_transcripts('aapl', periods)
+    assert client.find_transcript('AAPL', 2023, 4)['id'] == 'AAPL_2023_4'
+
+    listing_requests = [p for p in requests_made if 'symbol' in p]
+    assert len(listing_requests) == 1
+    assert results[(2024, 2)]['id'] == 'AAPL_2024_2'
+    assert results[(2025, 1)] is None
+
+
+def test_api_ninjas_search_cached(monkeypatch):
+    """API Ninjas search results are cached per ticker"""
+    requests_made = []
+
+    def fake_get(url, headers=None, params=None, **kwargs):
+        requests_made.append(url)
+        return FakeResponse([{'year': '2024', 'quarter': '3'}, {'year': '2024', 'quarter': '2'}])
+
+    monkeypatch.setattr('utils.api_ninjas_client.requests.get', fake_get)
+    client = APINinjasClient(api_key='test')
+
+    assert client._search_transcript('MSFT', 2024, 3) == {'year': '2024', 'quarter': '3'}
+    assert client._search_transcript('MSFT', 2024, 1) is None
+    assert client.find_transcripts('MSFT', [(2024, 2)])[(2024, 2)]['quarter'] == '2'
+    assert len(requests_made) == 1
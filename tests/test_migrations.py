@@ -0,0 +1,150 @@
+"""
+Test Schema Migrations
+Checks that the SQLite and PostgreSQL schemas are created once and tracked by version
+"""
+
+import os
+import sqlite3
+import sys
+from datetime import date
+
+import pytest
+from sqlalchemy import text
+
+# Add parent directory to path
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from utils import migrations
+from utils.db_util import DatabaseUtil
+
+
+def test_sqlite_schema_is_versioned(tmp_path):
+    db_path = str(tmp_path / "data" / "earnings.db")
+    DatabaseUtil(db_path)
+
+    conn = sqlite3.connect(db_path)
+    assert conn.execute("PRAGMA user_version").fetchone()[0] == migrations.SQLITE_SCHEMA_VERSION
+    tables = {row[0] for row in conn.execute("SELECT name FROM sqlite_master WHERE type = 'table'")}
+    assert {'scores', 'price_movements', 'correlations'} <= tables
+
+    # Up to date: nothing is applied again
+    assert migrations.migrate_sqlite(conn) == []
+    conn.close()
+
+
+def test_sqlite_pending_migration_applied_once(tmp_path, monkeypatch):
+    db_path = str(tmp_path / "earnings.db")
+    DatabaseUtil(db_path)
+
+    calls = []
+    next_version = migrations.SQLITE_SCHEMA_VERSION + 1
+
+    def add_notes(conn):
+        calls.append(1)
+        conn.execute("ALTER TABLE scores ADD COLUMN notes TEXT")
+
+    monkeypatch.setattr(migrations, 'SQLITE_MIGRATIONS',
+                        migrations.SQLITE_MIGRATIONS + [(next_version, 'score notes', add_notes)])
+
+    DatabaseUtil(db_path)
+    DatabaseUtil(db_path)
+    assert calls == [1]
+
+    conn = sqlite3.connect(db_path)
+    assert conn.execute("PRAGMA user_version").fetchone()[0] == next_version
+    columns = [row[1] for row in conn.execute("PRAGMA table_info(scores)")]
+    assert 'notes' in columns
+    conn.close()
+
+
+def test_split_sql_keeps_dollar_quoted_bodies():
+    script = """
+    -- Counter; recomputed below
+    CREATE TABLE t (n INTEGER);
+    CREATE FUNCTION f() RETURNS VOID AS $$
+    BEGIN
+        UPDATE t SET n = n + 1; -- inside the body
+    END;
+    $$ LANGUAGE plpgsql;
+    SELECT f()
+    """
+    statements = migrations.split_sql(script)
+    assert len(statements) == 3
+    assert statements[0] == "CREATE TABLE t (n INTEGER)"
+    assert "UPDATE t SET n = n + 1;" in statements[1] and statements[1].endswith("LANGUAGE plpgsql")
+    assert statements[2] == "SELECT f()"
+
+
+def test_postgres_migrations_are_numbered_in_order():
+    versions = [version for version, _, _ in migrations.POSTGRES_MIGRATIONS]
+    assert versions == list(range(1, len(versions) + 1))
+    assert migrations.POSTGRES_SCHEMA_VERSION == versions[-1]
+
+
+def test_postgres_later_migrations_are_idempotent(pg_db):
+    # Migrations after the baseline must be no-ops where the column, index or
+    # constraint already exists (fresh create_all or sql/init_postgres.sql)
+    columns = text("""
+        SELECT table_name, column_name FROM information_schema.columns
+        WHERE table_schema = 'earnings' ORDER BY 1, 2
+    """)
+    indexes = text("SELECT indexname FROM pg_indexes WHERE schemaname = 'earnings' ORDER BY 1")
+
+    with pg_db.engine.connect() as conn:
+        before = (conn.execute(columns).all(), conn.execute(indexes).all())
+        for version, _, migration in migrations.POSTGRES_MIGRATIONS:
+            if version >= 5:
+                migration(conn)
+        after = (conn.execute(columns).all(), conn.execute(indexes).all())
+        conn.rollback()
+
+    assert after == before
+
+
+def test_startup_migrations_keep_id_keys(pg_db):
+    from utils.partitioning import is_partitioned
+
+    definitions = text("""
+        SELECT conname, pg_get_constraintdef(oid) FROM pg_constraint
+        WHERE conrelid = CAST(:table AS regclass) AND contype IN ('p', 'f')
+    """)
+    with pg_db.engine.connect() as conn:
+        if is_partitioned(conn, 'analyses'):
+            pytest.skip("tables are year-partitioned")
+        transcripts = dict(conn.execute(definitions, {'table': 'earnings.transcripts'}).all())
+        analyses = dict(conn.execute(definitions, {'table': 'earnings.analyses'}).all())
+
+    # (id, year) keys only come with partition_database.py
+    assert transcripts['transcripts_pkey'] == "PRIMARY KEY (id)"
+    assert analyses['analyses_pkey'] == "PRIMARY KEY (id)"
+    assert any(definition.startswith("FOREIGN KEY (transcript_id) REFERENCES earnings.transcripts(id)")
+               for definition in analyses.values())
+
+
+def test_partitioning_refuses_analyses_of_another_year(pg_db):
+    from utils.partitioning import is_partitioned, migrate_to_partitioned
+
+    with pg_db.engine.connect() as conn:
+        if is_partitioned(conn, 'analyses'):
+            pytest.skip("tables are year-partitioned")
+
+    ticker = 'ZZTA'
+    transcript_id = pg_db.insert_transcripts_bulk([{
+        'ticker': ticker, 'quarter': 1, 'year': 2024, 'transcript_date': date(2024, 3, 15),
+        'transcript_text': "call", 'source': 'manual_upload'
+    }])[0]
+    pg_db.insert_analyses_bulk([{
+        'ticker': ticker, 'quarter': 1, 'year': 2023, 'transcript_id': transcript_id, 'score': 1,
+        'provider': 'openai', 'analysis_type': 'Standard Analysis', 'analysis_markdown': "analysis"
+    }])
+    with pg_db.engine.begin() as conn:
+        conn.execute(text("UPDATE earnings.analyses SET transcript_id = :id WHERE ticker = :ticker"),
+                     {'id': transcript_id, 'ticker': ticker})
+
+    # Refused before any table is touched, and the link is kept
+    with pytest.raises(ValueError, match="another year"):
+        migrate_to_partitioned(pg_db.engine)
+    with pg_db.engine.connect() as conn:
+        assert not is_partitioned(conn, 'analyses')
+        assert conn.execute(text("SELECT transcript_id FROM earnings.analyses WHERE ticker = :ticker"),
+                            {'ticker': ticker}).scalar() == transcript_id
@@ -0,0 +1,59 @@
+"""
+Test Parquet Archive
+Checks the Arrow conversion and partitioned layout of archive datasets
+"""
+
+import os
+import sys
+from datetime import datetime, timezone
+
+import pandas as pd
+import pyarrow.dataset as ds
+
+# Add parent directory to path
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from utils.frames import typed_frame
+from utils.parquet_archive import ARCHIVE_SCHEMAS, PARTITIONING, read_batches, restored_columns, to_record_batch
+
+
+def _analyses(count):
+    """Analyses chunk as returned by Database._iter_chunks"""
+    return typed_frame(pd.DataFrame([
+        {'id': i, 'transcript_id': None, 'ticker': 'AAPL' if i % 2 else 'MSFT', 'year': 2023 + i % 3,
+         'quarter': 1 + i % 4, 'analysis_date': datetime(2024, 1, 1, 9, 0, i, tzinfo=timezone.utc),
+         'score': i % 5, 'score_justification': '' if i == 0 else 'ok', 'analysis_markdown': '# Report',
+         'analysis_json': {'score': i % 5} if i else None, 'provider': 'openai', 'model': 'gpt-4.1-mini',
+         'analysis_type': 'Standard Analysis', 'financial_context_included': bool(i % 2),
+         'processing_time_seconds': 1.5, 'created_at': None, 'updated_at': None}
+        for i in range(count)
+    ]))
+
+
+def test_to_record_batch_matches_schema():
+    batch = to_record_batch(_analyses(4), ARCHIVE_SCHEMAS['analyses'])
+
+    assert batch.schema == ARCHIVE_SCHEMAS['analyses']
+    assert batch.column('analysis_json').to_pylist() == [None, '{"score": 1}', '{"score": 2}', '{"score": 3}']
+    assert batch.column('score_justification').to_pylist()[0] == ''
+
+
+def test_partitioned_dataset_round_trip(tmp_path):
+    schema = ARCHIVE_SCHEMAS['analyses']
+    batches = [to_record_batch(_analyses(12), schema)]
+    ds.write_dataset(batches, str(tmp_path), schema=schema, format='parquet', partitioning=PARTITIONING)
+
+    assert os.path.isdir(tmp_path / "ticker=AAPL" / "year=2024")
+
+    columns = restored_columns('analyses')
+    tables = list(read_batches(str(tmp_path), columns, batch_size=5))
+    assert sum(t.num_rows for t in tables) == 12
+    assert tables[0].column_names == columns
+    assert 'id' not in columns and 'transcript_id' not in columns
+
+
+def test_price_movement_year_is_not_restored():
+    columns = restored_columns('price_movements')
+    assert 'year' not in columns
+    assert columns[:2] == ['ticker', 'earnings_date']
+    assert ARCHIVE_SCHEMAS['price_movements'].field('year').type.bit_width == 16
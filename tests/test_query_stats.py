@@ -0,0 +1,95 @@
+"""
+Test Query Statistics
+Checks statement fingerprints, per-block tracking and the slow-query log
+"""
+
+import json
+import os
+import sys
+
+from sqlalchemy import create_engine, text
+
+# Add parent directory to path
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from utils import query_stats
+from utils.query_stats import QueryStats, fingerprint, instrument, track
+
+
+def test_fingerprint_ignores_parameters_and_list_lengths():
+    assert fingerprint("SELECT * FROM t WHERE id IN (%(id_1)s, %(id_2)s) AND x = 'a'") == \
+        fingerprint("SELECT * FROM t WHERE id IN (%(id_1)s)  AND x = 'bb'")
+    assert fingerprint("INSERT INTO t (a) VALUES (%(a__0)s), (%(a__1)s), (%(a__2)s)") == \
+        "INSERT INTO t (a) VALUES (...)"
+    assert fingerprint("SELECT NULL::text AS snippet") == "SELECT NULL::text AS snippet"
+
+
+def test_fingerprint_does_not_cache_long_statements():
+    rows = ", ".join(f"(%(a__{i})s, 'value {i}')" for i in range(500))
+    statement = f"INSERT INTO t (a, b) VALUES {rows}"
+    assert len(statement) > query_stats.MAX_CACHED_STATEMENT
+
+    query_stats._normalize_cached.cache_clear()
+    assert fingerprint(statement) == "INSERT INTO t (a, b) VALUES (...)"
+    assert query_stats._normalize_cached.cache_info().currsize == 0
+
+
+class FailingCursor:
+    """DBAPI cursor whose EXPLAIN, rollback and close all fail"""
+
+    def __init__(self):
+        self.executed = []
+
+    def execute(self, sql, parameters=None):
+        self.executed.append(sql)
+        if not sql.startswith("SAVEPOINT"):
+            raise RuntimeError("connection lost")
+
+    def close(self):
+        raise RuntimeError("connection lost")
+
+
+class FailingConnection:
+    def __init__(self, cursor):
+        self.connection = self
+        self._cursor = cursor
+
+    def cursor(self):
+        return self._cursor
+
+
+def test_failed_explain_rollback_does_not_raise():
+    cursor = FailingCursor()
+    plan = query_stats._explain(FailingConnection(cursor), "SELECT 1", {})
+
+    assert plan == ["EXPLAIN failed: connection lost"]
+    assert cursor.executed[-1] == "ROLLBACK TO SAVEPOINT query_stats_explain"
+
+
+def test_instrumented_engine_tracks_blocks_and_slow_queries(tmp_path):
+    engine = create_engine("sqlite://")
+    stats = instrument(engine, QueryStats(slow_query_ms=10_000, log_path=''))
+
+    with engine.connect() as conn:
+        conn.execute(text("CREATE TABLE t (id INTEGER)"))
+        for i in range(3):
+            conn.execute(text("INSERT INTO t (id) VALUES (:id)"), {'id': i})
+
+        log_path = str(tmp_path / "slow.jsonl")
+        with track(slow_query_ms=0) as block:
+            block.log_path = log_path
+            conn.execute(text("SELECT id FROM t WHERE id = :id"), {'id': 1}).all()
+            conn.execute(text("SELECT id FROM t WHERE id = :id"), {'id': 2}).all()
+
+    summary = block.summary()
+    assert len(summary) == 1
+    assert summary.loc[0, 'count'] == 2
+    assert summary.loc[0, 'p95_ms'] <= summary.loc[0, 'max_ms']
+
+    # Block-level threshold of 0 logs every query; the engine-wide one logs none
+    assert len(block.slow_queries) == 2
+    assert not stats.slow_queries
+    with open(log_path) as f:
+        assert json.loads(f.readline())['fingerprint'] == "SELECT id FROM t WHERE id = ?"
+
+    assert stats.totals()['queries'] == 6
@@ -0,0 +1,75 @@
+"""
+Test Score Extractor
+Checks the structured fields extracted from analysis markdown
+"""
+
+import os
+import sys
+
+# Add parent directory to path
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from utils.score_extractor import ANALYSIS_FIELDS, extract_analysis_fields, extract_beat, extract_guidance_direction
+
+
+ANALYSIS = """
+# $AAPL Q3 2024 earnings: Services record
+
+Revenue missed consensus by 1%, while EPS of $1.57 beat estimates by 3 cents.
+
+## 🐻 𝗧𝗵𝗲 𝗕𝗲𝗮𝗿 𝗖𝗮𝘀𝗲
+
+- Tariff concerns
+- China weakness
+
+---
+
+## 📊 𝗣𝗿𝗶𝗰𝗲 𝗠𝗼𝘃𝗲𝗺𝗲𝗻𝘁 𝗦𝗰𝗼𝗿𝗲
+
+**Score: +2/5**
+
+---
+
+## 𝗧𝗵𝗲𝗺𝗲𝘀, 𝗗𝗿𝗶𝘃𝗲𝗿𝘀, 𝗮𝗻𝗱 𝗖𝗼𝗻𝗰𝗲𝗿𝗻𝘀
+
+🟢 **Services Momentum**: Record quarter.
+
+🔴 **Margin Pressure**: Tariffs cost $800M.
+
+---
+
+## 𝗚𝘂𝗶𝗱𝗮𝗻𝗰𝗲 (𝗙𝘂𝗹𝗹 𝗬𝗲𝗮𝗿 2024)
+
+🟢 **Services Growth**: Raised to 13% from 11%.
+
+⚪ **Tax Rate**: Expected around 17%.
+"""
+
+
+def test_extract_analysis_fields():
+    fields = extract_analysis_fields(ANALYSIS)
+
+    assert tuple(fields) == ANALYSIS_FIELDS
+    assert fields['score'] == 2
+    assert fields['guidance_direction'] == 'raised'
+    assert fields['eps_beat'] is True
+    assert fields['revenue_beat'] is False
+    assert fields['key_risks'] == ['Tariff concerns', 'China weakness', 'Margin Pressure']
+
+
+def test_guidance_direction_from_wording_and_markers():
+    guidance = "## Guidance\n\n{}\n\n{}\n"
+
+    assert extract_guidance_direction(guidance.format("🔴 **Revenue**: Cut to $10B", "⚪ **Tax**: 17%")) == 'lowered'
+    assert extract_guidance_direction(guidance.format("🟢 **EPS**: Raised", "🔴 **Revenue**: Lowered")) == 'mixed'
+    assert extract_guidance_direction(guidance.format("⚪ **EPS**: Reaffirmed", "")) == 'maintained'
+    assert extract_guidance_direction("No guidance section here.") is None
+
+
+def test_missing_fields_are_none():
+    fields = extract_analysis_fields("Revenue grew 10% year-over-year.", score=1)
+
+    assert fields['score'] == 1
+    assert fields['eps_beat'] is None
+    assert extract_beat("Revenue grew 10% year-over-year.", 'revenue_beat') is None
+    assert fields['key_risks'] == []
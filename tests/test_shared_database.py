@@ -0,0 +1,49 @@
+"""
+Test Shared Database Handles
+Checks that the Streamlit pages share one database handle per process
+"""
+
+import os
+import sys
+import threading
+
+# Add parent directory to path
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from utils import shared_database
+from utils.shared_database import close_all, get_connection_health, get_database, get_database_util
+
+
+def test_handle_is_shared_across_threads_and_released(tmp_path):
+    path = str(tmp_path / "earnings.db")
+    try:
+        db = get_database_util(path)
+        others = []
+        threads = [threading.Thread(target=lambda: others.append(get_database_util(path))) for _ in range(4)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        assert all(other is db for other in others)
+        assert get_connection_health()[f"sqlite:{path}"]['open_connections'] >= 1
+
+        # Clearing the cache closes the handle; the next call opens a new one
+        get_database_util.clear()
+        assert db.get_connection_status()['open_connections'] == 0
+        assert get_database_util(path) is not db
+    finally:
+        get_database_util.clear()
+
+
+def test_close_all_and_missing_db_url(tmp_path, monkeypatch):
+    monkeypatch.delenv('DB_URL', raising=False)
+    assert get_database() is None
+    get_database.clear()
+
+    db = get_database_util(str(tmp_path / "earnings.db"))
+    db.get_connection()
+    close_all()
+    assert db.get_connection_status()['open_connections'] == 0
+    assert not shared_database._open_handles
+    get_database_util.clear()
@@ -0,0 +1,136 @@
+"""
+Test SQLite Sync
+Checks watermark-based streaming and row mapping of the SQLite scores database
+"""
+
+import os
+import sys
+from datetime import date, datetime
+
+import pandas as pd
+from sqlalchemy import select
+
+# Add parent directory to path
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from utils.db_util import DatabaseUtil
+from utils.models import Analysis
+from utils.sqlite_sync import SQLiteSync, analysis_row, price_movement_frame, read_batches
+
+
+def _scores(count, ticker='AAPL'):
+    return [
+        {'ticker': ticker, 'quarter': 1, 'year': 2024, 'earnings_date': date(2024, 5, 1),
+         'analysis_timestamp': datetime(2024, 5, 1, 12, 0, i), 'score': 1, 'score_justification': 'ok',
+         'provider': 'openai', 'analysis_type': 'Standard Analysis'}
+        for i in range(count)
+    ]
+
+
+def test_read_batches_resumes_after_watermark(tmp_path):
+    with DatabaseUtil(str(tmp_path / "earnings.db")) as db:
+        db.insert_scores_bulk(_scores(25))
+        conn = db.get_connection()
+        conn.execute("UPDATE scores SET updated_at = datetime('2024-01-01', '+' || id || ' seconds')")
+        conn.commit()
+
+        batches = list(read_batches(conn, 'scores', {}, batch_size=10))
+        assert [len(b) for b in batches] == [10, 10, 5]
+
+        # Rows sharing the watermark's second are read again
+        resumed = list(read_batches(conn, 'scores', {'last_updated_at': batches[0][-1]['updated_at']}, batch_size=10))
+        assert sum(len(b) for b in resumed) == 16
+        assert len(list(read_batches(conn, 'scores', {'last_updated_at': '2024-01-02 00:00:00'}))) == 0
+
+
+def test_rescored_rows_move_past_the_watermark(tmp_path):
+    with DatabaseUtil(str(tmp_path / "earnings.db")) as db:
+        db.insert_scores_bulk(_scores(2))
+        conn = db.get_connection()
+        conn.execute("UPDATE scores SET updated_at = '2024-01-01 00:00:00'")
+        conn.commit()
+
+        watermark = {'last_updated_at': '2024-01-01 00:00:01'}
+        assert list(read_batches(conn, 'scores', watermark)) == []
+        db.insert_score('AAPL', 1, 2024, date(2024, 5, 1), -3, 'revised', 'openai', None,
+                        'Standard Analysis', analysis_timestamp=datetime(2024, 5, 1, 12, 0, 1))
+        rows = [row for batch in read_batches(conn, 'scores', watermark) for row in batch]
+        assert [(row['score'], row['score_justification']) for row in rows] == [(-3, 'revised')]
+
+
+def test_read_batches_includes_updated_price_movements(tmp_path):
+    with DatabaseUtil(str(tmp_path / "earnings.db")) as db:
+        db.insert_price_movement('AAPL', date(2024, 5, 1), 100.0, price_after_1d=101.0)
+        db.insert_price_movement('MSFT', date(2024, 5, 1), 200.0, price_after_1d=202.0)
+        conn = db.get_connection()
+        conn.execute("UPDATE price_movements SET updated_at = '2024-01-01 00:00:00'")
+        conn.commit()
+
+        # Updating a row moves it past the watermark
+        watermark = {'last_updated_at': '2024-01-01 00:00:01'}
+        assert list(read_batches(conn, 'price_movements', watermark)) == []
+        db.insert_price_movement('AAPL', date(2024, 5, 1), 100.0, price_after_1d=90.0)
+        rows = [row for batch in read_batches(conn, 'price_movements', watermark) for row in batch]
+        assert [row['ticker'] for row in rows] == ['AAPL']
+
+        df = price_movement_frame(rows)
+        assert df.loc[0, 'price_after_1d'] == 90.0
+        assert 'id' not in df.columns
+
+
+def test_analysis_row_uses_metadata_markdown(tmp_path):
+    markdown_path = tmp_path / "AAPL_Q1_2024.md"
+    markdown_path.write_text("# Full analysis", encoding='utf-8')
+
+    with DatabaseUtil(str(tmp_path / "earnings.db")) as db:
+        db.insert_scores_bulk(_scores(1))
+        db.insert_analysis_metadata('AAPL', 1, 2024, 'Apple', str(markdown_path), None, True, False, 15)
+        db.insert_scores_bulk([{**_scores(1)[0], 'ticker': 'MSFT'}])
+        rows = [row for batch in read_batches(db.get_connection(), 'scores', {}) for row in batch]
+
+    with_file, without_file = (analysis_row(row) for row in rows)
+    assert with_file['ticker'] == 'AAPL'
+    assert with_file['analysis_markdown'] == "# Full analysis"
+    assert with_file['financial_context_included'] is True
+    assert with_file['analysis_date'].tzinfo is not None
+    assert without_file['analysis_markdown'] == 'ok'
+    assert without_file['financial_context_included'] is False
+
+
+def test_sync_scores_matches_updates_and_inserts(pg_db, tmp_path):
+    sqlite_path = str(tmp_path / "earnings.db")
+    with DatabaseUtil(sqlite_path) as sqlite_db:
+        sqlite_db.insert_scores_bulk(_scores(2, ticker='ZZTA'))
+
+    sync = SQLiteSync(pg_db, sqlite_path)
+
+    def analyses():
+        with pg_db.get_session() as session:
+            return {row.analysis_date.second: row for row in session.execute(
+                select(Analysis.id, Analysis.analysis_date, Analysis.score, Analysis.updated_at)
+                .where(Analysis.ticker == 'ZZTA')
+            ).all()}
+
+    try:
+        assert sync.sync(tables=['scores']) == {'scores': 2}
+        first = analyses()
+        assert sorted(first) == [0, 1]
+
+        # Unchanged rows re-read from the watermark's second are matched, not rewritten
+        sync.sync(tables=['scores'])
+        assert analyses() == first
+
+        with DatabaseUtil(sqlite_path) as sqlite_db:
+            sqlite_db.insert_score('ZZTA', 1, 2024, date(2024, 5, 1), -4, 'revised', 'openai', None,
+                                   'Standard Analysis', analysis_timestamp=datetime(2024, 5, 1, 12, 0, 1))
+            sqlite_db.insert_scores_bulk(_scores(3, ticker='ZZTA')[2:])
+        sync.sync(tables=['scores'])
+
+        after = analyses()
+        assert sorted(after) == [0, 1, 2]
+        assert after[0] == first[0]
+        assert after[1].id == first[1].id and after[1].score == -4
+        assert after[1].updated_at > first[1].updated_at
+        assert sync.get_watermarks()['scores']['last_updated_at'] is not None
+    finally:
+        sync.reset()
@@ -0,0 +1,113 @@
+"""
+Test Transcript Sync
+Checks diffing against held transcripts and resuming from a checkpoint
+"""
+
+import os
+import sys
+from datetime import date
+
+# Add parent directory to path
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from utils.bulk_downloader import BulkTranscriptDownloader
+from utils.transcript_sync import TranscriptSync, quarters_in_range
+
+
+class StubClient:
+    """Saves a transcript file for available periods, raises for broken ones"""
+
+    def __init__(self, available, broken=()):
+        self.available = set(available)
+        self.broken = set(broken)
+        self.calls = []
+
+    def save_transcript_to_file(self, ticker, year, quarter, output_dir="transcripts"):
+        self.calls.append((ticker, year, quarter))
+        if (ticker, year, quarter) in self.broken:
+            raise RuntimeError("connection reset")
+        if (ticker, year, quarter) not in self.available:
+            return None
+        path = os.path.join(output_dir, f"{ticker}_Q{quarter}_{year}.md")
+        with open(path, 'w', encoding='utf-8') as f:
+            f.write(f"# {ticker} Q{quarter} {year}\n\n**Date:** {year}-0{quarter * 3}-28\n")
+        return path
+
+
+def test_quarters_in_range():
+    assert quarters_in_range(date(2023, 11, 5), date(2024, 4, 1)) == [(2023, 4), (2024, 1), (2024, 2)]
+
+
+def test_sync_fetches_only_missing_and_resumes(tmp_path):
+    transcript_dir = tmp_path / "transcripts"
+    transcript_dir.mkdir()
+    (transcript_dir / "AAPL_Q1_2024.md").write_text("# held")
+    checkpoint = str(tmp_path / "checkpoint.json")
+
+    client = StubClient(
+        available={("AAPL", 2024, 2), ("MSFT", 2024, 1), ("MSFT", 2024, 2)},
+        broken={("MSFT", 2024, 2)}
+    )
+    downloader = BulkTranscriptDownloader({'finnhub': client}, output_dir=str(transcript_dir))
+    sync = TranscriptSync(downloader, transcript_dir=str(transcript_dir), checkpoint_path=checkpoint)
+
+    summary = sync.run(["AAPL", "MSFT"], date(2024, 1, 1), date(2024, 6, 30))
+    assert summary == {'planned': 3, 'downloaded': 2, 'not_found': 0, 'failed': 1}
+    assert ("AAPL", 2024, 1) not in client.calls
+
+    # A fresh run (e.g. after a crash) only retries the failed transcript
+    client.broken.clear()
+    client.calls.clear()
+    sync = TranscriptSync(downloader, transcript_dir=str(transcript_dir), checkpoint_path=checkpoint)
+    summary = sync.run(["AAPL", "MSFT"], date(2024, 1, 1), date(2024, 6, 30))
+    assert summary['downloaded'] == 1
+    assert client.calls == [("MSFT", 2024, 2)]
+
+    # Nothing left to do
+    assert sync.plan(["AAPL", "MSFT"], date(2024, 1, 1), date(2024, 6, 30)) == []
+
+
+class StubDatabase:
+    """Holds inserted transcript keys in memory; the first `failures` inserts raise"""
+
+    def __init__(self, failures=0):
+        self.keys = set()
+        self.failures = failures
+
+    def get_transcript_keys(self, tickers=None):
+        return {k for k in self.keys if tickers is None or k[0] in tickers}
+
+    def insert_transcript(self, ticker, quarter, year, **kwargs):
+        if self.failures:
+            self.failures -= 1
+            raise RuntimeError("connection refused")
+        self.keys.add((ticker, quarter, year))
+
+
+def test_sync_stores_checkpointed_transcripts_missing_from_the_database(tmp_path):
+    transcript_dir = tmp_path / "transcripts"
+    transcript_dir.mkdir()
+    checkpoint = str(tmp_path / "checkpoint.json")
+    periods = (["AAPL"], date(2024, 1, 1), date(2024, 6, 30))
+
+    client = StubClient(available={("AAPL", 2024, 1), ("AAPL", 2024, 2)})
+    downloader = BulkTranscriptDownloader({'finnhub': client}, output_dir=str(transcript_dir))
+
+    # Fetched without a database: checkpointed and saved to disk only
+    TranscriptSync(downloader, transcript_dir=str(transcript_dir), checkpoint_path=checkpoint).run(*periods)
+    assert TranscriptSync(downloader, transcript_dir=str(transcript_dir), checkpoint_path=checkpoint).plan(*periods) == []
+
+    # With a database they are fetched again; the insert of Q2 fails once
+    db = StubDatabase(failures=1)
+    sync = TranscriptSync(downloader, db=db, transcript_dir=str(transcript_dir), checkpoint_path=checkpoint)
+    assert sync.plan(*periods) == [("AAPL", 1, 2024), ("AAPL", 2, 2024)]
+    summary = sync.run(*periods)
+    assert summary['downloaded'] + summary['failed'] == 2 and summary['failed'] == 1
+
+    # The next run only retries the transcript that is not in the database
+    sync = TranscriptSync(downloader, db=db, transcript_dir=str(transcript_dir), checkpoint_path=checkpoint)
+    missing = sync.plan(*periods)
+    assert len(missing) == 1 and missing[0] not in db.keys
+    assert sync.run(*periods)['downloaded'] == 1
+    assert db.keys == {("AAPL", 1, 2024), ("AAPL", 2, 2024)}
+    assert sync.plan(*periods) == []
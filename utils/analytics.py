@@ -0,0 +1,476 @@
+"""
+Analytics Engine
+Embedded DuckDB queries over a Parquet snapshot of score/price movement pairs
+
+The dashboards' grouped statistics (correlations, direction accuracy,
+leaderboards) scan every analysis with its price movements. Instead of
+pulling those rows out of SQLite or PostgreSQL into pandas on each page run,
+they are snapshotted once into a zstd-compressed Parquet file and queried
+with DuckDB's vectorized, multi-threaded engine, which keeps scans over
+millions of pairs sub-second and puts no load on the OLTP database.
+
+Usage:
+    engine = AnalyticsEngine()
+    engine.snapshot_from_postgres(Database())     # or snapshot_from_sqlite(DatabaseUtil())
+    engine.correlations(period_days=5)
+    engine.leaderboard(by='model', period_days=5)
+"""
+
+import os
+import threading
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+import pandas as pd
+import pyarrow as pa
+import pyarrow.parquet as pq
+
+
+DEFAULT_SNAPSHOT_PATH = "data/analytics/performance.parquet"
+
+# Snapshot of the SQLite scores database kept by the Correlations page
+SQLITE_SNAPSHOT_PATH = "data/analytics/sqlite_performance.parquet"
+
+PERIODS = (1, 3, 5, 10)
+
+# One row per analysis with the movements of its earnings reaction
+PAIRS_SCHEMA = pa.schema([
+    ('ticker', pa.string()),
+    ('quarter', pa.int8()),
+    ('year', pa.int16()),
+    ('earnings_date', pa.date32()),
+    ('analysis_date', pa.timestamp('us', tz='UTC')),
+    ('score', pa.int8()),
+    ('provider', pa.string()),
+    ('model', pa.string()),
+    ('analysis_type', pa.string()),
+    ('movement_1d_pct', pa.float64()),
+    ('movement_3d_pct', pa.float64()),
+    ('movement_5d_pct', pa.float64()),
+    ('movement_10d_pct', pa.float64()),
+])
+
+# Long format: one row per (analysis, horizon) with a known score and
+# movement. Only the requested horizons' columns are scanned.
+def _base_sql(period_days: Optional[int] = None) -> str:
+    """SELECT producing ticker, provider, model, score, period_days, movement"""
+    periods = [int(period_days)] if period_days else PERIODS
+    return " UNION ALL ".join(f"""
+        SELECT ticker, provider, COALESCE(model, 'unknown') AS model, score,
+               {days} AS period_days, movement_{days}d_pct AS movement
+        FROM pairs
+        WHERE score IS NOT NULL AND movement_{days}d_pct IS NOT NULL
+    """ for days in periods)
+
+
+# Same definition as Database.CORRELATION_STATS_SQL and analysis_performance_facts
+DIRECTION_CORRECT_SQL = """
+    CASE
+        WHEN score > 0 AND movement > 0 THEN 1
+        WHEN score < 0 AND movement < 0 THEN 1
+        WHEN score = 0 AND movement BETWEEN -1 AND 1 THEN 1
+        ELSE 0
+    END
+"""
+
+
+def _to_arrow(df: pd.DataFrame) -> pa.Table:
+    """Normalize a pairs DataFrame (Decimal, categorical, string dates, missing columns) to PAIRS_SCHEMA"""
+    df = df.copy()
+    for field in PAIRS_SCHEMA:
+        if field.name not in df.columns:
+            df[field.name] = None
+
+    for field in PAIRS_SCHEMA:
+        if pa.types.is_string(field.type):
+            # Typed frames hold labels as categoricals
+            df[field.name] = df[field.name].astype(object)
+    for col in ('quarter', 'year', 'score'):
+        df[col] = pd.to_numeric(df[col], errors='coerce').astype('Int64')
+    for days in PERIODS:
+        col = f'movement_{days}d_pct'
+        df[col] = pd.to_numeric(df[col], errors='coerce').astype('float64')
+    df['earnings_date'] = pd.to_datetime(df['earnings_date']).dt.date
+    df['analysis_date'] = pd.to_datetime(df['analysis_date'], utc=True)
+    df['ticker'] = df['ticker'].str.upper()
+
+    return pa.Table.from_pandas(df[PAIRS_SCHEMA.names], schema=PAIRS_SCHEMA, preserve_index=False)
+
+
+class AnalyticsEngine:
+    """DuckDB analytics over a Parquet snapshot of analyses and price movements"""
+
+    def __init__(self, snapshot_path: str = DEFAULT_SNAPSHOT_PATH, in_memory: bool = True,
+                 threads: Optional[int] = None):
+        """
+        Initialize an in-process DuckDB database
+
+        Args:
+            snapshot_path: Parquet snapshot to query (written by the snapshot_* methods)
+            in_memory: Load the snapshot into a DuckDB table (reloaded when the
+                file changes) instead of scanning the Parquet file per query
+            threads: DuckDB worker threads (default: all cores)
+        """
+        try:
+            import duckdb
+        except ImportError:
+            raise ImportError("AnalyticsEngine requires duckdb (pip install duckdb)")
+
+        self.snapshot_path = snapshot_path
+        self.in_memory = in_memory
+        self._conn = duckdb.connect(':memory:')
+        if threads:
+            self._conn.execute(f"SET threads = {int(threads)}")
+        self._lock = threading.Lock()
+        self._snapshot_lock = threading.Lock()  # One writer of the snapshot file per engine
+        self._loaded_mtime: Optional[float] = None
+
+    # ============================================================================
+    # Snapshots
+    # ============================================================================
+
+    def write_snapshot(self, chunks: Iterable[pd.DataFrame]) -> int:
+        """
+        Write pair chunks to the snapshot file, replacing it atomically
+
+        Args:
+            chunks: DataFrames with PAIRS_SCHEMA columns
+
+        Returns:
+            Number of rows written
+        """
+        directory = os.path.dirname(self.snapshot_path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+
+        tmp_path = f"{self.snapshot_path}.tmp"
+        rows = 0
+        with pq.ParquetWriter(tmp_path, PAIRS_SCHEMA, compression='zstd') as writer:
+            for chunk in chunks:
+                if chunk.empty:
+                    continue
+                writer.write_table(_to_arrow(chunk))
+                rows += len(chunk)
+        os.replace(tmp_path, self.snapshot_path)
+        return rows
+
+    def snapshot_from_postgres(self, db, chunksize: int = 100000) -> int:
+        """
+        Snapshot earnings.analysis_performance_facts (streamed in chunks)
+
+        Args:
+            db: utils.database.Database
+            chunksize: Rows per chunk
+
+        Returns:
+            Number of rows written
+        """
+        from sqlalchemy import select
+        from utils.models import AnalysisPerformanceFact
+
+        query = select(*(getattr(AnalysisPerformanceFact, name) for name in PAIRS_SCHEMA.names))
+        return self.write_snapshot(db._iter_chunks(query, chunksize))
+
+    def snapshot_from_sqlite(self, db_util, chunksize: int = 100000) -> int:
+        """
+        Snapshot the SQLite score_price_correlation view (streamed in chunks)
+
+        Args:
+            db_util: utils.db_util.DatabaseUtil
+            chunksize: Rows per chunk
+
+        Returns:
+            Number of rows written
+        """
+        query = """
+            SELECT ticker, quarter, year, earnings_date, created_at AS analysis_date, score,
+                   provider, model, movement_1d_pct, movement_3d_pct, movement_5d_pct, movement_10d_pct
+            FROM score_price_correlation
+        """
+        return self.write_snapshot(pd.read_sql_query(query, db_util.get_connection(), chunksize=chunksize))
+
+    def refresh_from_sqlite(self, db_util) -> bool:
+        """
+        Re-snapshot a SQLite database when it was written after the snapshot
+
+        Compares modification times (including the WAL file), so page runs
+        only read the pairs out of SQLite after scores or prices change.
+
+        Args:
+            db_util: utils.db_util.DatabaseUtil
+
+        Returns:
+            True when the snapshot was rewritten
+        """
+        with self._snapshot_lock:
+            source_mtime = max(
+                (os.path.getmtime(path) for path in (db_util.db_path, f"{db_util.db_path}-wal")
+                 if os.path.exists(path)),
+                default=0.0
+            )
+            if os.path.exists(self.snapshot_path) and os.path.getmtime(self.snapshot_path) >= source_mtime:
+                return False
+            self.snapshot_from_sqlite(db_util)
+            return True
+
+    # ============================================================================
+    # Queries
+    # ============================================================================
+
+    def query(self, sql: str, params: Optional[List[Any]] = None) -> pd.DataFrame:
+        """
+        Run SQL against the snapshot (exposed as `pairs`)
+
+        Args:
+            sql: DuckDB SQL
+            params: Positional ? parameters
+
+        Returns:
+            Result DataFrame
+        """
+        with self._lock:
+            if not os.path.exists(self.snapshot_path):
+                raise ValueError(f"Analytics snapshot not found: {self.snapshot_path}")
+            mtime = os.path.getmtime(self.snapshot_path)
+            if mtime != self._loaded_mtime:
+                path = self.snapshot_path.replace("'", "''")
+                kind = "TABLE" if self.in_memory else "VIEW"
+                self._conn.execute("DROP VIEW IF EXISTS pairs; DROP TABLE IF EXISTS pairs")
+                self._conn.execute(f"CREATE {kind} pairs AS SELECT * FROM read_parquet('{path}')")
+                self._loaded_mtime = mtime
+            # Cursors are independent connections to the same database, so
+            # concurrent page runs do not share one
+            cursor = self._conn.cursor()
+
+        try:
+            return cursor.execute(sql, params or []).df()
+        finally:
+            cursor.close()
+
+    @staticmethod
+    def _base(ticker: Optional[str] = None, provider: Optional[str] = None,
+              model: Optional[str] = None, period_days: Optional[int] = None) -> Tuple[str, List[Any]]:
+        """Filtered long-format pairs as a subquery, and its parameters"""
+        conditions, params = [], []
+        if ticker:
+            conditions.append("ticker = ?")
+            params.append(ticker.upper())
+        if provider:
+            conditions.append("provider = ?")
+            params.append(provider)
+        if model:
+            conditions.append("model = ?")
+            params.append(model)
+        where = f"WHERE {' AND '.join(conditions)}" if conditions else ""
+        return f"(SELECT * FROM ({_base_sql(period_days)}) {where})", params
+
+    def correlations(
+        self,
+        ticker: Optional[str] = None,
+        provider: Optional[str] = None,
+        model: Optional[str] = None,
+        period_days: Optional[int] = None,
+        min_samples: int = 2
+    ) -> pd.DataFrame:
+        """
+        Correlation statistics per ticker x provider/model x horizon, with
+        'ALL' rows for the rolled-up groups (the earnings.correlations layout)
+
+        Args:
+            ticker, provider, model, period_days: Restrict the pairs used
+            min_samples: Minimum data points for a group
+
+        Returns:
+            DataFrame with ticker, provider, model, period_days, rollup
+            (GROUPING() bits as Correlation.ROLLUP_*: 0 per ticker and model,
+            3 per ticker, 4 per model, 7 overall), correlation_coefficient,
+            sample_size, mean_absolute_error, r_squared and direction_accuracy
+        """
+        base, params = self._base(ticker, provider, model, period_days)
+        residual = "avg(abs(b.movement - COALESCE(s.slope * b.score + s.intercept, s.mean_movement)))"
+        return self.query(f"""
+            WITH base AS (
+                SELECT * FROM {base}
+            ),
+            -- Sufficient statistics per finest group; the roll-ups sum them
+            -- instead of rescanning the pairs
+            fine AS (
+                SELECT ticker, provider, model, period_days,
+                       count(*) AS n, sum(score) AS sx, sum(movement) AS sy,
+                       sum(score * score) AS sxx, sum(movement * movement) AS syy,
+                       sum(score * movement) AS sxy, sum({DIRECTION_CORRECT_SQL}) AS correct
+                FROM base
+                GROUP BY ALL
+            ),
+            sums AS (
+                SELECT
+                    COALESCE(ticker, 'ALL') AS ticker,
+                    COALESCE(provider, 'ALL') AS provider,
+                    COALESCE(model, 'ALL') AS model,
+                    period_days,
+                    GROUPING(ticker, provider, model) AS rollup,
+                    sum(n) AS n, sum(sx) AS sx, sum(sy) AS sy, sum(sxx) AS sxx,
+                    sum(syy) AS syy, sum(sxy) AS sxy, sum(correct) AS correct
+                FROM fine
+                GROUP BY GROUPING SETS (
+                    (period_days),
+                    (ticker, period_days),
+                    (provider, model, period_days),
+                    (ticker, provider, model, period_days)
+                )
+                HAVING sum(n) >= ?
+            ),
+            moments AS (
+                SELECT *,
+                       n * sxy - sx * sy AS cov_n,
+                       nullif(n * sxx - sx * sx, 0) AS var_x_n,
+                       n * syy - sy * sy AS var_y_n
+                FROM sums
+            ),
+            stats AS (
+                SELECT ticker, provider, model, period_days, rollup, CAST(n AS BIGINT) AS sample_size,
+                       cov_n / nullif(sqrt(greatest(var_x_n * var_y_n, 0)), 0) AS correlation_coefficient,
+                       -- regr_r2 semantics: NULL without score variance, 1 without movement variance
+                       CASE WHEN var_x_n IS NULL THEN NULL
+                            WHEN var_y_n <= 0 THEN 1
+                            ELSE cov_n * cov_n / (var_x_n * var_y_n) END AS r_squared,
+                       cov_n / var_x_n AS slope,
+                       (sy - (cov_n / var_x_n) * sx) / n AS intercept,
+                       sy / n AS mean_movement,
+                       100.0 * correct / n AS direction_accuracy
+                FROM moments
+            ),
+            -- Mean absolute residual of each group's fit, one equi-join per
+            -- roll-up level (matched on the GROUPING() marker, not on 'ALL',
+            -- which is also a possible ticker)
+            errors AS (
+                SELECT s.ticker, s.provider, s.model, s.period_days, s.rollup, {residual} AS mae
+                FROM base b JOIN stats s ON s.period_days = b.period_days AND s.rollup = 7
+                GROUP BY ALL
+                UNION ALL
+                SELECT s.ticker, s.provider, s.model, s.period_days, s.rollup, {residual}
+                FROM base b JOIN stats s ON s.period_days = b.period_days AND s.rollup = 3
+                    AND s.ticker = b.ticker
+                GROUP BY ALL
+                UNION ALL
+                SELECT s.ticker, s.provider, s.model, s.period_days, s.rollup, {residual}
+                FROM base b JOIN stats s ON s.period_days = b.period_days AND s.rollup = 4
+                    AND s.provider = b.provider AND s.model = b.model
+                GROUP BY ALL
+                UNION ALL
+                SELECT s.ticker, s.provider, s.model, s.period_days, s.rollup, {residual}
+                FROM base b JOIN stats s ON s.period_days = b.period_days AND s.rollup = 0
+                    AND s.ticker = b.ticker AND s.provider = b.provider AND s.model = b.model
+                GROUP BY ALL
+            )
+            SELECT
+                s.ticker, s.provider, s.model, s.period_days, s.rollup,
+                round(s.correlation_coefficient, 3) AS correlation_coefficient,
+                s.sample_size,
+                round(e.mae, 2) AS mean_absolute_error,
+                round(s.r_squared, 3) AS r_squared,
+                round(s.direction_accuracy, 2) AS direction_accuracy
+            FROM stats s
+            JOIN errors e USING (ticker, provider, model, period_days, rollup)
+            ORDER BY s.ticker, s.provider, s.model, s.period_days, s.rollup
+        """, params + [min_samples])
+
+    def calculate_correlation(self, ticker: Optional[str] = None, period_days: int = 5) -> Tuple[float, int]:
+        """
+        Correlation between scores and price movements (same contract as
+        Database.calculate_correlation)
+
+        Returns:
+            (correlation_coefficient, sample_size)
+        """
+        if period_days not in PERIODS:
+            return 0.0, 0
+
+        base, params = self._base(ticker, period_days=period_days)
+        correlation, sample_size = self.query(
+            f"SELECT corr(movement, score) AS c, count(*) AS n FROM {base}", params
+        ).iloc[0]
+
+        if sample_size < 2 or pd.isna(correlation):
+            return 0.0, int(sample_size)
+        return float(correlation), int(sample_size)
+
+    def direction_accuracy(self, ticker: Optional[str] = None, period_days: int = 5) -> pd.DataFrame:
+        """
+        Predicted vs actual direction counts
+
+        Returns:
+            DataFrame with predicted (Up/Down/Neutral), actual (Up/Down/Flat
+            within +/-1%), count and correct (pairs counted as correct by
+            direction_accuracy)
+        """
+        base, params = self._base(ticker, period_days=period_days)
+        return self.query(f"""
+            SELECT
+                CASE WHEN score > 0 THEN 'Up' WHEN score < 0 THEN 'Down' ELSE 'Neutral' END AS predicted,
+                CASE WHEN movement > 1 THEN 'Up' WHEN movement < -1 THEN 'Down' ELSE 'Flat' END AS actual,
+                count(*) AS count,
+                CAST(sum({DIRECTION_CORRECT_SQL}) AS BIGINT) AS correct
+            FROM {base}
+            GROUP BY ALL
+            ORDER BY predicted, actual
+        """, params)
+
+    def leaderboard(
+        self,
+        by: str = 'model',
+        period_days: int = 5,
+        min_samples: int = 10,
+        limit: int = 20,
+        order_by: str = 'direction_accuracy'
+    ) -> pd.DataFrame:
+        """
+        Rank tickers, providers or models by predictive quality
+
+        Args:
+            by: 'ticker', 'provider' or 'model' (provider and model)
+            period_days: Horizon (1, 3, 5, 10)
+            min_samples: Minimum data points to be ranked
+            limit: Rows returned
+            order_by: 'direction_accuracy' or 'correlation_coefficient'
+
+        Returns:
+            DataFrame ranked best first
+        """
+        groups = {'ticker': 'ticker', 'provider': 'provider', 'model': 'provider, model'}
+        if by not in groups:
+            raise ValueError(f"Unknown leaderboard grouping: {by}")
+        if order_by not in ('direction_accuracy', 'correlation_coefficient'):
+            raise ValueError(f"Unknown leaderboard ordering: {order_by}")
+
+        base, params = self._base(period_days=period_days)
+        return self.query(f"""
+            SELECT
+                rank() OVER (ORDER BY {order_by} DESC NULLS LAST) AS rank,
+                *
+            FROM (
+                SELECT
+                    {groups[by]},
+                    count(*) AS sample_size,
+                    round(100.0 * avg({DIRECTION_CORRECT_SQL}), 2) AS direction_accuracy,
+                    round(corr(movement, score), 3) AS correlation_coefficient,
+                    round(avg(movement), 2) AS mean_movement
+                FROM {base}
+                GROUP BY {groups[by]}
+                HAVING count(*) >= ?
+            )
+            ORDER BY rank
+            LIMIT ?
+        """, params + [min_samples, limit])
+
+    def get_snapshot_info(self) -> Dict[str, Any]:
+        """Rows, tickers and date range of the current snapshot"""
+        row = self.query("""
+            SELECT count(*) AS rows, count(DISTINCT ticker) AS tickers,
+                   min(earnings_date) AS first_earnings_date, max(earnings_date) AS last_earnings_date
+            FROM pairs
+        """).iloc[0]
+        return {**row.to_dict(), 'path': self.snapshot_path}
+
+    def close(self) -> None:
+        """Close the DuckDB database"""
+        self._conn.close()
@@ -5,18 +5,21 @@ Provides access to earnings call transcripts for S&P 100 companies (free tier)
 
 import os
 import requests
-from typing import Dict, List, Optional
+from typing import Dict, List, Optional, Iterable, Tuple
 from datetime import datetime
 
+from utils.listing_cache import ListingCache
+
 class APINinjasClient:
     """Client for API Ninjas Earnings Call Transcript API"""
     
-    def __init__(self, api_key: Optional[str] = None):
+    def __init__(self, api_key: Optional[str] = None, listing_ttl: float = 3600):
         """
         Initialize the API Ninjas client
         
         Args:
             api_key: API key for API Ninjas. If None, will try to get from environment
+            listing_ttl: Seconds to cache each ticker's transcript search results
         """
         self.api_key = api_key or os.getenv('API_NINJAS_KEY')
         if not self.api_key:
@@ -26,6 +29,7 @@ class APINinjasClient:
         self.headers = {
             'X-Api-Key': self.api_key
         }
+        self.listing_cache = ListingCache(ttl=listing_ttl)
     
     def get_transcript(self, ticker: str, year: int, quarter: int) -> Optional[Dict]:
         """
@@ -74,29 +78,24 @@ class APINinjasClient:
         Returns:
             Dictionary containing transcript data or None if not found
         """
-        try:
-            url = f"{self.base_url}/earningstranscriptsearch"
-            params = {
-                'ticker': ticker.upper()
-            }
-            
-            response = requests.get(url, headers=self.headers, params=params)
-            response.raise_for_status()
-            
-            results = response.json()
-            
-            # Search through results for matching year/quarter
-            if isinstance(results, list):
-                for result in results:
-                    if (result.get('year') == str(year) and 
-                        result.get('quarter') == str(quarter)):
-                        return result
-            
-            return None
-            
-        except requests.exceptions.RequestException as e:
-            print(f"Error searching transcript: {e}")
-            return None
+        return self.find_transcripts(ticker, [(year, quarter)])[(year, quarter)]
+    
+    def find_transcripts(self, ticker: str, periods: Iterable[Tuple[int, int]]) -> Dict[Tuple[int, int], Optional[Dict]]:
+        """
+        Look up search results for several periods of one ticker
+        
+        The ticker's search results are fetched at most once per cache TTL
+        and looked up by (year, quarter).
+        
+        Args:
+            ticker: Stock ticker symbol
+            periods: (year, quarter) pairs
+        
+        Returns:
+            Dictionary mapping each (year, quarter) to the search result or None
+        """
+        index = self.listing_cache.get(ticker, self.search_transcripts)
+        return {(year, quarter): index.get((int(year), int(quarter))) for year, quarter in periods}
     
     def list_available_companies(self) -> List[Dict]:
         """
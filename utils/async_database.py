@@ -0,0 +1,255 @@
+"""
+Async PostgreSQL Database Utility
+asyncio counterpart of utils.database.Database for concurrent pipelines
+
+AsyncDatabase runs on asyncpg engines and exposes the same methods as
+Database as coroutines, so async download and analysis jobs can await their
+writes instead of blocking the event loop or holding a thread per
+connection. Like Database it has a write engine and a read engine (the
+replica at DB_READ_URL if set), each with the pool size and
+statement_timeout of its ENGINE_ROLES entry. Each call runs the Database
+implementation against the sync facades of those engines inside a
+greenlet, so queries, upserts, batching, read/write routing and
+materialized-table refreshes behave exactly as in the synchronous class.
+
+Usage:
+    async with AsyncDatabase() as db:
+        ids = await db.insert_transcripts_bulk(transcripts)
+        async for chunk in db.iter_analyses(ticker="AAPL"):
+            ...
+"""
+
+import functools
+from typing import Any, AsyncIterator, Dict, Iterable, Optional
+
+import pandas as pd
+from sqlalchemy import text
+from sqlalchemy.engine import make_url
+from sqlalchemy.ext.asyncio import AsyncEngine, create_async_engine
+from sqlalchemy.util import greenlet_spawn
+
+from utils.database import Database
+from utils.frames import typed_frame
+from utils.migrations import ensure_postgres_schema
+
+
+def async_url(db_url: str) -> str:
+    """
+    Convert a PostgreSQL URL to use the asyncpg driver
+
+    libpq's sslmode query parameter is passed on as asyncpg's ssl.
+    """
+    url = make_url(db_url)
+    if url.get_backend_name() != 'postgresql':
+        raise ValueError(f"AsyncDatabase requires a PostgreSQL URL, got '{url.get_backend_name()}'")
+
+    query = dict(url.query)
+    if 'sslmode' in query:
+        query['ssl'] = query.pop('sslmode')
+    return url.set(drivername='postgresql+asyncpg', query=query).render_as_string(hide_password=False)
+
+
+def _create_role_engine(url: str, role: str, options: Dict[str, int]) -> AsyncEngine:
+    """
+    Create the asyncpg engine for one role ('write' or 'read') of ENGINE_ROLES
+
+    The session settings are the ones Database sends in the startup packet,
+    passed as asyncpg server_settings.
+    """
+    return create_async_engine(
+        async_url(url),
+        pool_size=options['pool_size'],
+        max_overflow=options['max_overflow'],
+        pool_pre_ping=True,
+        connect_args={'server_settings': Database._session_settings(role, options)},
+        echo=False
+    )
+
+
+class _AsyncEngineDatabase(Database):
+    """Database on the sync facades of AsyncDatabase's asyncpg engines"""
+
+    def __init__(self, db_url: Optional[str], dtype_backend: str, read_url: Optional[str],
+                 engine_options: Optional[Dict[str, Dict[str, int]]]):
+        self._configure(db_url, dtype_backend, read_url, engine_options)
+        self.async_engine = _create_role_engine(self.db_url, 'write', self.engine_options['write'])
+        self.async_read_engine = _create_role_engine(self.read_url, 'read', self.engine_options['read'])
+        self._bind_engines(self.async_engine.sync_engine, self.async_read_engine.sync_engine)
+
+
+def _delegate(method):
+    """Expose a Database method as a coroutine on AsyncDatabase"""
+    @functools.wraps(method)
+    async def wrapper(self, *args, **kwargs):
+        return await self._run(method, *args, **kwargs)
+    return wrapper
+
+
+class AsyncDatabase:
+    """
+    Async PostgreSQL database manager using SQLAlchemy's asyncio extension
+    """
+
+    def __init__(self, db_url: Optional[str] = None, dtype_backend: str = 'numpy',
+                 read_url: Optional[str] = None,
+                 engine_options: Optional[Dict[str, Dict[str, int]]] = None):
+        """
+        Initialize the async engines (no connection is made until the first call)
+
+        Args:
+            db_url: PostgreSQL connection URL. If None, reads from environment variable DB_URL
+            dtype_backend: DataFrame dtypes for read results, 'numpy' or 'pyarrow'
+            read_url: Read replica URL for the read-only query methods. If None,
+                reads from environment variable DB_READ_URL (default: db_url)
+            engine_options: Per-role overrides of ENGINE_ROLES, e.g.
+                {'write': {'pool_size': 20}, 'read': {'statement_timeout_ms': 10000}}
+        """
+        self._db = _AsyncEngineDatabase(db_url, dtype_backend, read_url, engine_options)
+        self.db_url = self._db.db_url
+        self.read_url = self._db.read_url
+        self.dtype_backend = dtype_backend
+        self.engine = self._db.async_engine
+        self.read_engine = self._db.async_read_engine
+        self.query_stats = self._db.query_stats
+
+    async def _run(self, method, *args, **kwargs):
+        """Run a Database method with its engine calls awaited on asyncpg"""
+        def call():
+            # Process-cached after the first call, like Database()
+            ensure_postgres_schema(self._db.engine)
+            return method(self._db, *args, **kwargs)
+
+        # The sync engine facades only work inside SQLAlchemy's greenlet,
+        # which is how AsyncSession runs its sync Session as well
+        return await greenlet_spawn(call)
+
+    def get_pool_status(self) -> Dict[str, Dict[str, Any]]:
+        """Connection pool health per engine role (see Database.get_pool_status)"""
+        return self._db.get_pool_status()
+
+    async def close(self) -> None:
+        """Close the pooled connections of both engines"""
+        await self.engine.dispose()
+        await self.read_engine.dispose()
+
+    async def __aenter__(self) -> 'AsyncDatabase':
+        return self
+
+    async def __aexit__(self, exc_type, exc, tb) -> None:
+        await self.close()
+
+    # ============================================================================
+    # Transcript Operations
+    # ============================================================================
+
+    insert_transcript = _delegate(Database.insert_transcript)
+    insert_transcripts_bulk = _delegate(Database.insert_transcripts_bulk)
+    get_transcript = _delegate(Database.get_transcript)
+    get_transcript_id = _delegate(Database.get_transcript_id)
+    get_all_transcripts = _delegate(Database.get_all_transcripts)
+    get_transcripts_page = _delegate(Database.get_transcripts_page)
+    get_transcript_keys = _delegate(Database.get_transcript_keys)
+
+    async def iter_transcripts(
+        self,
+        ticker: Optional[str] = None,
+        chunksize: int = 10000,
+        include_text: bool = False,
+        years: Optional[Iterable[int]] = None
+    ) -> AsyncIterator[pd.DataFrame]:
+        """
+        Stream transcripts in DataFrame chunks over a server-side cursor
+
+        Yields:
+            DataFrames of at most chunksize rows, newest first
+        """
+        query = Database._transcripts_query(ticker, include_text, years)
+        async for chunk in self._iter_chunks(query, chunksize):
+            yield chunk
+
+    # ============================================================================
+    # Earnings Event Operations
+    # ============================================================================
+
+    upsert_earnings_event = _delegate(Database.upsert_earnings_event)
+    get_earnings_event = _delegate(Database.get_earnings_event)
+    get_earnings_events = _delegate(Database.get_earnings_events)
+    rebuild_earnings_events = _delegate(Database.rebuild_earnings_events)
+
+    # ============================================================================
+    # Analysis Operations
+    # ============================================================================
+
+    insert_analysis = _delegate(Database.insert_analysis)
+    insert_analyses_bulk = _delegate(Database.insert_analyses_bulk)
+    get_analysis = _delegate(Database.get_analysis)
+    get_analyses_by_ticker = _delegate(Database.get_analyses_by_ticker)
+    get_analyses_page = _delegate(Database.get_analyses_page)
+    find_analyses = _delegate(Database.find_analyses)
+    backfill_analysis_fields = _delegate(Database.backfill_analysis_fields)
+    get_latest_analysis = _delegate(Database.get_latest_analysis)
+    get_all_analyses = _delegate(Database.get_all_analyses)
+
+    async def iter_analyses(
+        self,
+        ticker: Optional[str] = None,
+        chunksize: int = 10000,
+        include_text: bool = False,
+        years: Optional[Iterable[int]] = None
+    ) -> AsyncIterator[pd.DataFrame]:
+        """
+        Stream analyses in DataFrame chunks over a server-side cursor
+
+        Yields:
+            DataFrames of at most chunksize rows, newest first
+        """
+        query = Database._analyses_query(ticker, include_text, years)
+        async for chunk in self._iter_chunks(query, chunksize):
+            yield chunk
+
+    # ============================================================================
+    # Search Operations
+    # ============================================================================
+
+    search = _delegate(Database.search)
+
+    # ============================================================================
+    # Price Movement Operations
+    # ============================================================================
+
+    insert_price_movement = _delegate(Database.insert_price_movement)
+    insert_price_movements_bulk = _delegate(Database.insert_price_movements_bulk)
+
+    # ============================================================================
+    # Correlation and Analysis Operations
+    # ============================================================================
+
+    refresh_analysis_performance = _delegate(Database.refresh_analysis_performance)
+    get_analysis_performance = _delegate(Database.get_analysis_performance)
+    refresh_correlations = _delegate(Database.refresh_correlations)
+    get_correlations = _delegate(Database.get_correlations)
+    calculate_correlation = _delegate(Database.calculate_correlation)
+
+    # ============================================================================
+    # Utility Methods
+    # ============================================================================
+
+    get_all_tickers = _delegate(Database.get_all_tickers)
+    execute_raw_sql = _delegate(Database.execute_raw_sql)
+    get_database_stats = _delegate(Database.get_database_stats)
+    compact_database_stats = _delegate(Database.compact_database_stats)
+    refresh_database_stats = _delegate(Database.refresh_database_stats)
+
+    async def _iter_chunks(self, query, chunksize: int) -> AsyncIterator[pd.DataFrame]:
+        """
+        Yield query results as DataFrames of chunksize rows from an asyncpg
+        server-side cursor on the read engine, without its statement_timeout
+        (see Database._iter_chunks)
+        """
+        async with self.read_engine.connect() as conn:
+            # Only for this transaction; the pooled connection keeps its timeout
+            await conn.execute(text("SET LOCAL statement_timeout = 0"))
+            result = await conn.stream(query)
+            columns = list(result.keys())
+            async for rows in result.partitions(chunksize):
+                yield typed_frame(pd.DataFrame(rows, columns=columns), self.dtype_backend)
@@ -0,0 +1,224 @@
+"""
+Bulk Transcript Downloader
+Downloads transcripts for many tickers and quarters concurrently, with a
+separate concurrency cap per transcript source
+"""
+
+import asyncio
+import os
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, AsyncIterator, Callable, Dict, Iterable, List, Optional, Tuple
+
+from utils.api_ninjas_client import APINinjasClient
+from utils.finnhub_client import FinnhubClient
+from utils.fmp_client import FMPClient
+
+
+# Maximum in-flight downloads per source. Kept conservative so free-tier
+# rate limits are not tripped; override per downloader as needed.
+DEFAULT_CONCURRENCY = {
+    'api_ninjas': 4,
+    'finnhub': 4,
+    'fmp': 8,
+}
+
+SOURCE_NAMES = {
+    'API Ninjas': 'api_ninjas',
+    'Finnhub': 'finnhub',
+    'FMP': 'fmp',
+}
+
+Job = Tuple[str, int, int]  # (ticker, year, quarter)
+
+
+def create_client(source: str):
+    """
+    Create a transcript client for a source using API keys from the environment
+
+    Args:
+        source: 'api_ninjas', 'finnhub' or 'fmp'
+
+    Returns:
+        Client instance
+
+    Raises:
+        ValueError: If the source is unknown or its API key is not configured
+    """
+    if source == 'api_ninjas':
+        return APINinjasClient()
+    if source == 'finnhub':
+        return FinnhubClient()
+    if source == 'fmp':
+        api_key = os.getenv('FMP_API_KEY')
+        if not api_key:
+            raise ValueError("FMP_API_KEY not found in environment variables")
+        return FMPClient(api_key)
+    raise ValueError(f"Unknown transcript source: {source}")
+
+
+def build_jobs(tickers: Iterable[str], periods: Iterable[Tuple[int, int]]) -> List[Job]:
+    """
+    Expand tickers x (year, quarter) periods into a de-duplicated job list
+
+    Order is preserved so results for the first tickers arrive first.
+    """
+    seen = set()
+    jobs = []
+    periods = list(periods)
+
+    for ticker in tickers:
+        ticker = ticker.strip().upper()
+        if not ticker:
+            continue
+        for year, quarter in periods:
+            job = (ticker, int(year), int(quarter))
+            if job not in seen:
+                seen.add(job)
+                jobs.append(job)
+
+    return jobs
+
+
+class BulkTranscriptDownloader:
+    """Concurrent transcript downloader across API Ninjas, Finnhub and FMP"""
+
+    def __init__(self, clients: Dict[str, Any],
+                 concurrency: Optional[Dict[str, int]] = None,
+                 output_dir: str = "transcripts"):
+        """
+        Initialize the downloader
+
+        Args:
+            clients: Mapping of source name to client, in fallback order
+                (e.g. {'finnhub': FinnhubClient(), 'fmp': FMPClient(key)})
+            concurrency: Per-source limit on in-flight downloads
+            output_dir: Directory to save transcripts to
+        """
+        if not clients:
+            raise ValueError("At least one transcript client is required")
+
+        self.clients = dict(clients)
+        self.concurrency = {**DEFAULT_CONCURRENCY, **(concurrency or {})}
+        self.output_dir = output_dir
+
+    @classmethod
+    def from_sources(cls, sources: Iterable[str], **kwargs) -> 'BulkTranscriptDownloader':
+        """Create a downloader with clients built from environment API keys"""
+        return cls({source: create_client(source) for source in sources}, **kwargs)
+
+    def _save(self, source: str, ticker: str, year: int, quarter: int) -> Optional[str]:
+        """Download and save one transcript with a source's client (blocking)"""
+        client = self.clients[source]
+        if source == 'fmp':
+            return client.save_transcript(ticker, quarter, year, output_dir=self.output_dir)
+        return client.save_transcript_to_file(ticker, year, quarter, output_dir=self.output_dir)
+
+    async def _download_job(self, job: Job, semaphores: Dict[str, asyncio.Semaphore],
+                            executor: ThreadPoolExecutor) -> Dict[str, Any]:
+        """Try each source in order until one returns a transcript"""
+        ticker, year, quarter = job
+        loop = asyncio.get_running_loop()
+        errors = []
+
+        for source in self.clients:
+            async with semaphores[source]:
+                try:
+                    path = await loop.run_in_executor(
+                        executor, self._save, source, ticker, year, quarter
+                    )
+                except Exception as e:
+                    errors.append(f"{source}: {e}")
+                    continue
+
+            if path:
+                return {'ticker': ticker, 'year': year, 'quarter': quarter,
+                        'status': 'success', 'source': source, 'path': path, 'error': None}
+
+        return {'ticker': ticker, 'year': year, 'quarter': quarter,
+                'status': 'error' if errors else 'not_found', 'source': None, 'path': None,
+                'error': '; '.join(errors) if errors else None}
+
+    async def iter_download(self, tickers: Iterable[str],
+                            periods: Iterable[Tuple[int, int]]) -> AsyncIterator[Dict[str, Any]]:
+        """
+        Download transcripts concurrently, yielding each result as it completes
+
+        Args:
+            tickers: Ticker symbols
+            periods: (year, quarter) pairs to fetch for every ticker
+
+        Yields:
+            Result dictionaries with ticker, year, quarter, status
+            ('success', 'not_found' or 'error'), source, path and error
+        """
+        async for result in self.iter_jobs(build_jobs(tickers, periods)):
+            yield result
+
+    async def iter_jobs(self, jobs: Iterable[Job]) -> AsyncIterator[Dict[str, Any]]:
+        """
+        Download an explicit list of (ticker, year, quarter) jobs concurrently,
+        yielding each result as it completes
+        """
+        jobs = list(dict.fromkeys((t.upper(), int(y), int(q)) for t, y, q in jobs))
+        if not jobs:
+            return
+
+        semaphores = {
+            source: asyncio.Semaphore(max(1, self.concurrency.get(source, 1)))
+            for source in self.clients
+        }
+        max_workers = sum(max(1, self.concurrency.get(source, 1)) for source in self.clients)
+
+        with ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="transcripts") as executor:
+            tasks = [
+                asyncio.ensure_future(self._download_job(job, semaphores, executor))
+                for job in jobs
+            ]
+            try:
+                for next_done in asyncio.as_completed(tasks):
+                    yield await next_done
+            finally:
+                for task in tasks:
+                    task.cancel()
+
+    def download(self, tickers: Iterable[str], periods: Iterable[Tuple[int, int]],
+                 progress_callback: Optional[Callable[[Dict[str, Any], int, int], None]] = None
+                 ) -> List[Dict[str, Any]]:
+        """
+        Blocking wrapper around iter_download for scripts and Streamlit pages
+
+        Args:
+            tickers: Ticker symbols
+            periods: (year, quarter) pairs to fetch for every ticker
+            progress_callback: Called as (result, completed, total) after each job
+
+        Returns:
+            List of result dictionaries in completion order
+        """
+        return self.download_jobs(build_jobs(tickers, periods), progress_callback)
+
+    def download_jobs(self, jobs: Iterable[Job],
+                      progress_callback: Optional[Callable[[Dict[str, Any], int, int], None]] = None
+                      ) -> List[Dict[str, Any]]:
+        """
+        Blocking wrapper around iter_jobs
+
+        Args:
+            jobs: (ticker, year, quarter) tuples
+            progress_callback: Called as (result, completed, total) after each job
+
+        Returns:
+            List of result dictionaries in completion order
+        """
+        jobs = list(dict.fromkeys((t.upper(), int(y), int(q)) for t, y, q in jobs))
+        total = len(jobs)
+
+        async def _collect():
+            results = []
+            async for result in self.iter_jobs(jobs):
+                results.append(result)
+                if progress_callback:
+                    progress_callback(result, len(results), total)
+            return results
+
+        return asyncio.run(_collect())
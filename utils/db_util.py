@@ -5,22 +5,77 @@ Handles SQLite database operations for storing and querying analysis scores and
 
 import sqlite3
 import os
+import threading
 from datetime import datetime, date
-from typing import Optional, List, Dict, Tuple
+from typing import Any, Optional, List, Dict, Tuple, Iterable
 import pandas as pd
 
+from utils.frames import typed_frame
+from utils.migrations import migrate_sqlite
+
+
+# Applied to every connection. WAL lets readers (e.g. the Correlations page)
+# run alongside a writer; synchronous=NORMAL only fsyncs at WAL checkpoints,
+# which is durable against application crashes.
+CONNECTION_PRAGMAS = (
+    "PRAGMA journal_mode = WAL",
+    "PRAGMA synchronous = NORMAL",
+    "PRAGMA cache_size = -65536",  # 64 MB page cache
+    "PRAGMA temp_store = MEMORY",
+    "PRAGMA mmap_size = 268435456",  # 256 MB
+    "PRAGMA busy_timeout = 5000",
+)
+
+UPSERT_SCORE_SQL = """
+    INSERT INTO scores
+    (ticker, quarter, year, earnings_date, analysis_timestamp, score,
+     score_justification, provider, model, analysis_type, updated_at)
+    VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, CURRENT_TIMESTAMP)
+    ON CONFLICT (ticker, quarter, year, analysis_timestamp) DO UPDATE SET
+        score = excluded.score, score_justification = excluded.score_justification,
+        provider = excluded.provider, model = excluded.model,
+        analysis_type = excluded.analysis_type, updated_at = CURRENT_TIMESTAMP
+"""
+
+UPSERT_PRICE_MOVEMENT_SQL = """
+    INSERT INTO price_movements
+    (ticker, earnings_date, price_before, price_after_1d, price_after_3d,
+     price_after_5d, price_after_10d, movement_1d_pct, movement_3d_pct,
+     movement_5d_pct, movement_10d_pct, volume_before, volume_after_1d)
+    VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+    ON CONFLICT (ticker, earnings_date) DO UPDATE SET
+        price_before = excluded.price_before, price_after_1d = excluded.price_after_1d,
+        price_after_3d = excluded.price_after_3d, price_after_5d = excluded.price_after_5d,
+        price_after_10d = excluded.price_after_10d, movement_1d_pct = excluded.movement_1d_pct,
+        movement_3d_pct = excluded.movement_3d_pct, movement_5d_pct = excluded.movement_5d_pct,
+        movement_10d_pct = excluded.movement_10d_pct, volume_before = excluded.volume_before,
+        volume_after_1d = excluded.volume_after_1d, updated_at = CURRENT_TIMESTAMP
+"""
+
+PRICE_MOVEMENT_COLUMNS = ['ticker', 'earnings_date', 'price_before', 'price_after_1d', 'price_after_3d',
+                          'price_after_5d', 'price_after_10d', 'volume_before', 'volume_after_1d']
+
 
 class DatabaseUtil:
     """Utility class for database operations"""
     
-    def __init__(self, db_path: str = "data/earnings_analysis.db"):
+    def __init__(self, db_path: str = "data/earnings_analysis.db", dtype_backend: str = 'numpy'):
         """
         Initialize database connection
         
         Args:
             db_path: Path to SQLite database file
+            dtype_backend: DataFrame dtypes for read results, 'numpy' or 'pyarrow'
+                (see utils.frames.typed_frame)
         """
         self.db_path = db_path
+        self.dtype_backend = dtype_backend
+        
+        # One persistent connection per thread (sqlite3 connections must not
+        # be used from two threads at once)
+        self._local = threading.local()
+        self._connections: Dict[threading.Thread, sqlite3.Connection] = {}
+        self._connections_lock = threading.Lock()
         
         # Create data directory if it doesn't exist
         os.makedirs(os.path.dirname(db_path), exist_ok=True)
@@ -29,26 +84,55 @@ class DatabaseUtil:
         self._init_database()
     
     def _init_database(self):
-        """Initialize database with schema from SQL file"""
-        conn = self.get_connection()
-        cursor = conn.cursor()
-        
-        # Read and execute schema
-        schema_path = "sql/create_tables.sql"
-        if os.path.exists(schema_path):
-            with open(schema_path, 'r') as f:
-                schema = f.read()
-                cursor.executescript(schema)
-        
-        conn.commit()
-        conn.close()
+        """Apply pending schema migrations (a PRAGMA user_version check when up to date)"""
+        migrate_sqlite(self.get_connection())
     
     def get_connection(self) -> sqlite3.Connection:
-        """Get database connection"""
-        conn = sqlite3.connect(self.db_path)
-        conn.row_factory = sqlite3.Row  # Enable column access by name
+        """
+        Get this thread's database connection
+        
+        The connection is opened once per thread with WAL and tuned pragmas,
+        and reused (together with its prepared statement cache) by every
+        call; do not close it, use close() when done with the database.
+        """
+        conn = getattr(self._local, 'conn', None)
+        if conn is None:
+            conn = sqlite3.connect(self.db_path, check_same_thread=False, cached_statements=256)
+            conn.row_factory = sqlite3.Row  # Enable column access by name
+            for pragma in CONNECTION_PRAGMAS:
+                conn.execute(pragma)
+            self._local.conn = conn
+            with self._connections_lock:
+                # A shared instance sees a new thread per Streamlit rerun;
+                # close the connections of threads that have finished
+                for thread in [t for t in self._connections if not t.is_alive()]:
+                    self._connections.pop(thread).close()
+                self._connections[threading.current_thread()] = conn
         return conn
     
+    def get_connection_status(self) -> Dict[str, Any]:
+        """Number of open per-thread connections, and how many belong to live threads"""
+        with self._connections_lock:
+            return {
+                'db_path': self.db_path,
+                'open_connections': len(self._connections),
+                'active_threads': sum(thread.is_alive() for thread in self._connections)
+            }
+    
+    def close(self):
+        """Close the connections opened by all threads"""
+        with self._connections_lock:
+            for conn in self._connections.values():
+                conn.close()
+            self._connections.clear()
+        self._local = threading.local()
+    
+    def __enter__(self) -> 'DatabaseUtil':
+        return self
+    
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+    
     def insert_score(self, ticker: str, quarter: int, year: int, 
                     earnings_date: date, score: int, score_justification: str,
                     provider: str, model: Optional[str], analysis_type: str,
@@ -75,32 +159,35 @@ class DatabaseUtil:
             analysis_timestamp = datetime.now()
         
         conn = self.get_connection()
-        cursor = conn.cursor()
+        with conn:
+            return conn.execute(UPSERT_SCORE_SQL + " RETURNING id", (
+                ticker, quarter, year, earnings_date, analysis_timestamp, score,
+                score_justification, provider, model, analysis_type
+            )).fetchone()[0]
+    
+    def insert_scores_bulk(self, scores: Iterable[Dict]) -> int:
+        """
+        Insert or update many scores in one transaction with executemany
         
-        try:
-            cursor.execute("""
-                INSERT INTO scores 
-                (ticker, quarter, year, earnings_date, analysis_timestamp, score, 
-                 score_justification, provider, model, analysis_type)
-                VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
-            """, (ticker, quarter, year, earnings_date, analysis_timestamp, score,
-                  score_justification, provider, model, analysis_type))
+        Args:
+            scores: Dicts with the insert_score arguments (analysis_timestamp
+                defaults to now)
             
-            conn.commit()
-            return cursor.lastrowid
-        except sqlite3.IntegrityError as e:
-            # Record already exists, update instead
-            cursor.execute("""
-                UPDATE scores 
-                SET score = ?, score_justification = ?, provider = ?, model = ?, 
-                    analysis_type = ?
-                WHERE ticker = ? AND quarter = ? AND year = ? AND analysis_timestamp = ?
-            """, (score, score_justification, provider, model, analysis_type,
-                  ticker, quarter, year, analysis_timestamp))
-            conn.commit()
-            return cursor.lastrowid
-        finally:
-            conn.close()
+        Returns:
+            Number of rows written
+        """
+        now = datetime.now()
+        rows = [
+            (s['ticker'], s['quarter'], s['year'], s['earnings_date'],
+             s.get('analysis_timestamp') or now, s['score'], s.get('score_justification'),
+             s['provider'], s.get('model'), s['analysis_type'])
+            for s in scores
+        ]
+        
+        conn = self.get_connection()
+        with conn:
+            conn.executemany(UPSERT_SCORE_SQL, rows)
+        return len(rows)
     
     def insert_price_movement(self, ticker: str, earnings_date: date,
                              price_before: float, price_after_1d: Optional[float] = None,
@@ -126,44 +213,54 @@ class DatabaseUtil:
         Returns:
             ID of inserted/updated record
         """
-        # Calculate percentage movements
-        movement_1d = ((price_after_1d - price_before) / price_before * 100) if price_after_1d else None
-        movement_3d = ((price_after_3d - price_before) / price_before * 100) if price_after_3d else None
-        movement_5d = ((price_after_5d - price_before) / price_before * 100) if price_after_5d else None
-        movement_10d = ((price_after_10d - price_before) / price_before * 100) if price_after_10d else None
+        # Calculate percentage movements (none without a non-zero price before)
+        movement_1d = ((price_after_1d - price_before) / price_before * 100) if price_after_1d and price_before else None
+        movement_3d = ((price_after_3d - price_before) / price_before * 100) if price_after_3d and price_before else None
+        movement_5d = ((price_after_5d - price_before) / price_before * 100) if price_after_5d and price_before else None
+        movement_10d = ((price_after_10d - price_before) / price_before * 100) if price_after_10d and price_before else None
         
         conn = self.get_connection()
-        cursor = conn.cursor()
+        with conn:
+            return conn.execute(UPSERT_PRICE_MOVEMENT_SQL + " RETURNING id", (
+                ticker, earnings_date, price_before, price_after_1d, price_after_3d,
+                price_after_5d, price_after_10d, movement_1d, movement_3d,
+                movement_5d, movement_10d, volume_before, volume_after_1d
+            )).fetchone()[0]
+    
+    def insert_price_movements_bulk(self, movements: pd.DataFrame) -> int:
+        """
+        Insert or update many price movements in one transaction with executemany
         
-        try:
-            cursor.execute("""
-                INSERT INTO price_movements 
-                (ticker, earnings_date, price_before, price_after_1d, price_after_3d, 
-                 price_after_5d, price_after_10d, movement_1d_pct, movement_3d_pct, 
-                 movement_5d_pct, movement_10d_pct, volume_before, volume_after_1d)
-                VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
-            """, (ticker, earnings_date, price_before, price_after_1d, price_after_3d,
-                  price_after_5d, price_after_10d, movement_1d, movement_3d,
-                  movement_5d, movement_10d, volume_before, volume_after_1d))
+        Args:
+            movements: DataFrame with ticker, earnings_date, price_before and
+                optional price_after_{1,3,5,10}d, volume_before and
+                volume_after_1d columns (percentages are computed here)
             
-            conn.commit()
-            return cursor.lastrowid
-        except sqlite3.IntegrityError:
-            # Update existing record
-            cursor.execute("""
-                UPDATE price_movements 
-                SET price_before = ?, price_after_1d = ?, price_after_3d = ?, 
-                    price_after_5d = ?, price_after_10d = ?, movement_1d_pct = ?, 
-                    movement_3d_pct = ?, movement_5d_pct = ?, movement_10d_pct = ?,
-                    volume_before = ?, volume_after_1d = ?, updated_at = CURRENT_TIMESTAMP
-                WHERE ticker = ? AND earnings_date = ?
-            """, (price_before, price_after_1d, price_after_3d, price_after_5d,
-                  price_after_10d, movement_1d, movement_3d, movement_5d, movement_10d,
-                  volume_before, volume_after_1d, ticker, earnings_date))
-            conn.commit()
-            return cursor.lastrowid
-        finally:
-            conn.close()
+        Returns:
+            Number of rows written
+        """
+        df = movements.reindex(columns=PRICE_MOVEMENT_COLUMNS)
+        before = pd.to_numeric(df['price_before'], errors='coerce')
+        for days in (1, 3, 5, 10):
+            after = pd.to_numeric(df[f'price_after_{days}d'], errors='coerce')
+            # Same rule as insert_price_movement: no movement when either price is missing or zero
+            df[f'movement_{days}d_pct'] = ((after - before) / before * 100).where(
+                after.notna() & (after != 0) & before.notna() & (before != 0)
+            )
+        
+        df['earnings_date'] = pd.to_datetime(df['earnings_date']).dt.date
+        df = df[['ticker', 'earnings_date', 'price_before', 'price_after_1d', 'price_after_3d',
+                 'price_after_5d', 'price_after_10d', 'movement_1d_pct', 'movement_3d_pct',
+                 'movement_5d_pct', 'movement_10d_pct', 'volume_before', 'volume_after_1d']]
+        rows = [
+            tuple(None if pd.isna(value) else value.item() if hasattr(value, 'item') else value for value in row)
+            for row in df.itertuples(index=False, name=None)
+        ]
+        
+        conn = self.get_connection()
+        with conn:
+            conn.executemany(UPSERT_PRICE_MOVEMENT_SQL, rows)
+        return len(rows)
     
     def get_scores_by_ticker(self, ticker: str) -> pd.DataFrame:
         """
@@ -181,9 +278,7 @@ class DatabaseUtil:
             WHERE ticker = ? 
             ORDER BY earnings_date DESC
         """
-        df = pd.read_sql_query(query, conn, params=(ticker,))
-        conn.close()
-        return df
+        return typed_frame(pd.read_sql_query(query, conn, params=(ticker,)), self.dtype_backend)
     
     def get_score_price_correlation(self, ticker: Optional[str] = None) -> pd.DataFrame:
         """
@@ -211,8 +306,7 @@ class DatabaseUtil:
             """
             df = pd.read_sql_query(query, conn)
         
-        conn.close()
-        return df
+        return typed_frame(df, self.dtype_backend)
     
     def calculate_correlation(self, ticker: Optional[str] = None, 
                             period_days: int = 1) -> Tuple[float, int]:
@@ -264,30 +358,23 @@ class DatabaseUtil:
             ID of inserted record
         """
         conn = self.get_connection()
-        cursor = conn.cursor()
-        
-        cursor.execute("""
-            INSERT INTO analysis_metadata 
-            (ticker, quarter, year, company_name, analysis_file_path, json_file_path,
-             financial_context_included, predictions_included, analysis_length)
-            VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
-        """, (ticker, quarter, year, company_name, analysis_file_path, json_file_path,
-              financial_context_included, predictions_included, analysis_length))
-        
-        conn.commit()
-        record_id = cursor.lastrowid
-        conn.close()
+        with conn:
+            cursor = conn.execute("""
+                INSERT INTO analysis_metadata 
+                (ticker, quarter, year, company_name, analysis_file_path, json_file_path,
+                 financial_context_included, predictions_included, analysis_length)
+                VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
+            """, (ticker, quarter, year, company_name, analysis_file_path, json_file_path,
+                  financial_context_included, predictions_included, analysis_length))
         
-        return record_id
+        return cursor.lastrowid
     
     def get_all_tickers(self) -> List[str]:
         """Get list of all tickers in database"""
         conn = self.get_connection()
         cursor = conn.cursor()
         cursor.execute("SELECT DISTINCT ticker FROM scores ORDER BY ticker")
-        tickers = [row[0] for row in cursor.fetchall()]
-        conn.close()
-        return tickers
+        return [row[0] for row in cursor.fetchall()]
     
     def get_latest_score(self, ticker: str) -> Optional[Dict]:
         """
@@ -309,7 +396,6 @@ class DatabaseUtil:
         """, (ticker,))
         
         row = cursor.fetchone()
-        conn.close()
         
         if row:
             return dict(row)
@@ -0,0 +1,307 @@
+"""
+Earnings Event Calendar
+Indexes earnings calls by (ticker, quarter, year) and aligns each call to the
+trading session in which the market first reacts to it
+"""
+
+import os
+import re
+from datetime import datetime, date, time, timedelta
+from typing import Optional, Dict, List, Tuple, Any, Union
+from zoneinfo import ZoneInfo
+
+import pandas as pd
+from pandas.tseries.holiday import (
+    AbstractHolidayCalendar, Holiday, nearest_workday,
+    USMartinLutherKingJr, USPresidentsDay, GoodFriday, USMemorialDay,
+    USLaborDay, USThanksgivingDay
+)
+
+
+MARKET_TZ = ZoneInfo("America/New_York")
+MARKET_OPEN = time(9, 30)
+MARKET_CLOSE = time(16, 0)
+
+# Metadata fields that carry the call date/time, per transcript source.
+# Finnhub listings expose 'time', FMP and API Ninjas expose 'date'.
+SOURCE_DATE_FIELDS = {
+    'finnhub': ('time', 'date'),
+    'fmp': ('date',),
+    'api_ninjas': ('date',),
+}
+DEFAULT_DATE_FIELDS = ('time', 'date', 'datetime', 'transcript_date')
+
+EventKey = Tuple[str, int, int]
+
+
+class NYSEHolidayCalendar(AbstractHolidayCalendar):
+    """Full-day NYSE market holidays"""
+    rules = [
+        Holiday('New Years Day', month=1, day=1, observance=nearest_workday),
+        USMartinLutherKingJr,
+        USPresidentsDay,
+        GoodFriday,
+        USMemorialDay,
+        Holiday('Juneteenth', month=6, day=19, start_date='2022-01-01', observance=nearest_workday),
+        Holiday('Independence Day', month=7, day=4, observance=nearest_workday),
+        USLaborDay,
+        USThanksgivingDay,
+        Holiday('Christmas', month=12, day=25, observance=nearest_workday)
+    ]
+
+
+_HOLIDAYS_BY_YEAR: Dict[int, frozenset] = {}
+
+
+def _holidays_for_year(year: int) -> frozenset:
+    """Cached set of market holidays for a calendar year"""
+    if year not in _HOLIDAYS_BY_YEAR:
+        holidays = NYSEHolidayCalendar().holidays(
+            start=f"{year}-01-01", end=f"{year}-12-31"
+        )
+        _HOLIDAYS_BY_YEAR[year] = frozenset(d.date() for d in holidays)
+    return _HOLIDAYS_BY_YEAR[year]
+
+
+def is_trading_day(day: date) -> bool:
+    """
+    Check whether the market is open on a given day
+
+    Args:
+        day: Calendar date
+
+    Returns:
+        True for weekdays that are not NYSE holidays
+    """
+    return day.weekday() < 5 and day not in _holidays_for_year(day.year)
+
+
+def next_trading_day(day: date) -> date:
+    """Return the first trading day strictly after the given day"""
+    day += timedelta(days=1)
+    while not is_trading_day(day):
+        day += timedelta(days=1)
+    return day
+
+
+def parse_event_datetime(value: Any) -> Optional[Union[datetime, date]]:
+    """
+    Parse a call date/time as reported by one of the transcript sources
+
+    Accepts date/datetime objects, pandas timestamps, epoch seconds and strings
+    such as '2024-08-01', '2024-08-01 17:00:00' or ISO 8601 with offsets.
+    Timezone-aware values are converted to market time; naive values are
+    assumed to already be in market time.
+
+    Returns:
+        datetime when a time of day is known, date when only the day is known,
+        None if the value cannot be parsed
+    """
+    if value is None or value == '':
+        return None
+
+    if isinstance(value, pd.Timestamp):
+        value = value.to_pydatetime()
+
+    if isinstance(value, datetime):
+        parsed = value
+    elif isinstance(value, date):
+        return value
+    elif isinstance(value, (int, float)):
+        # Epoch seconds (or milliseconds)
+        seconds = value / 1000 if value > 1e11 else value
+        parsed = datetime.fromtimestamp(seconds, tz=ZoneInfo("UTC"))
+    elif isinstance(value, str):
+        text = value.strip()
+        if re.fullmatch(r'\d{4}-\d{2}-\d{2}', text):
+            return date.fromisoformat(text)
+        try:
+            parsed = datetime.fromisoformat(text.replace('Z', '+00:00'))
+        except ValueError:
+            try:
+                parsed = pd.Timestamp(text).to_pydatetime()
+            except (ValueError, TypeError):
+                return None
+    else:
+        return None
+
+    if parsed.tzinfo is not None:
+        parsed = parsed.astimezone(MARKET_TZ).replace(tzinfo=None)
+
+    return parsed
+
+
+def reaction_session(event_time: Union[datetime, date],
+                     assume_after_close: bool = True) -> date:
+    """
+    Align an earnings call to the trading session that first prices it in
+
+    Calls before the open react the same day, calls during or after market
+    hours react on the next session. When only the day is known, the call is
+    treated as after close (the common case for US earnings calls) unless
+    assume_after_close is False.
+
+    Args:
+        event_time: Call datetime (market time) or date
+        assume_after_close: How to treat events without a time of day
+
+    Returns:
+        Trading date of the first session after the call
+    """
+    if isinstance(event_time, datetime):
+        day = event_time.date()
+        if event_time.time() < MARKET_OPEN and is_trading_day(day):
+            return day
+        return next_trading_day(day)
+
+    if not assume_after_close and is_trading_day(event_time):
+        return event_time
+    return next_trading_day(event_time)
+
+
+def extract_event_time(source: Optional[str],
+                       metadata: Optional[Dict],
+                       fallback: Any = None) -> Optional[Union[datetime, date]]:
+    """
+    Pull the call date/time out of source metadata
+
+    Args:
+        source: Transcript source ('finnhub', 'fmp', 'api_ninjas', ...)
+        metadata: Raw metadata returned by the source
+        fallback: Value to parse when the metadata has no usable date
+
+    Returns:
+        Parsed datetime/date or None
+    """
+    fields = SOURCE_DATE_FIELDS.get((source or '').lower(), DEFAULT_DATE_FIELDS)
+
+    if metadata:
+        for field in fields:
+            parsed = parse_event_datetime(metadata.get(field))
+            if parsed is not None:
+                return parsed
+
+    return parse_event_datetime(fallback)
+
+
+def build_event(ticker: str, quarter: int, year: int,
+                event_time: Union[datetime, date],
+                source: Optional[str] = None) -> Dict[str, Any]:
+    """
+    Build a normalized earnings event record
+
+    Returns:
+        Dictionary with ticker, quarter, year, event_time, event_date,
+        trading_date and source
+    """
+    is_datetime = isinstance(event_time, datetime)
+    return {
+        'ticker': ticker.upper(),
+        'quarter': int(quarter),
+        'year': int(year),
+        'event_time': event_time.replace(tzinfo=MARKET_TZ) if is_datetime else None,
+        'event_date': event_time.date() if is_datetime else event_time,
+        'trading_date': reaction_session(event_time),
+        'source': source
+    }
+
+
+class EarningsCalendar:
+    """In-memory earnings event index keyed by (ticker, quarter, year)"""
+
+    TRANSCRIPT_FILE_PATTERN = re.compile(r'^([A-Z.\-]+)_Q([1-4])_(\d{4})\.md$', re.IGNORECASE)
+    TRANSCRIPT_DATE_PATTERN = re.compile(r'^\*\*Date:\*\*\s*(.+?)\s*$', re.MULTILINE)
+
+    def __init__(self):
+        """Initialize an empty calendar"""
+        self._events: Dict[EventKey, Dict[str, Any]] = {}
+
+    def __len__(self) -> int:
+        return len(self._events)
+
+    def __contains__(self, key: EventKey) -> bool:
+        ticker, quarter, year = key
+        return (ticker.upper(), int(quarter), int(year)) in self._events
+
+    def add_event(self, ticker: str, quarter: int, year: int,
+                  event_time: Any, source: Optional[str] = None) -> Optional[Dict[str, Any]]:
+        """
+        Add or replace an event
+
+        Args:
+            ticker: Stock ticker symbol
+            quarter: Quarter number (1-4)
+            year: Year
+            event_time: Call date/time in any format accepted by parse_event_datetime
+            source: Where the date came from
+
+        Returns:
+            The stored event, or None if event_time could not be parsed
+        """
+        parsed = parse_event_datetime(event_time)
+        if parsed is None:
+            return None
+
+        event = build_event(ticker, quarter, year, parsed, source)
+        self._events[(event['ticker'], event['quarter'], event['year'])] = event
+        return event
+
+    def add_transcript(self, ticker: str, quarter: int, year: int,
+                       source: Optional[str] = None,
+                       source_metadata: Optional[Dict] = None,
+                       transcript_date: Any = None) -> Optional[Dict[str, Any]]:
+        """
+        Add an event from transcript metadata, preferring the source's own
+        call time over the stored transcript date
+        """
+        event_time = extract_event_time(source, source_metadata, fallback=transcript_date)
+        if event_time is None:
+            return None
+        return self.add_event(ticker, quarter, year, event_time, source)
+
+    def lookup(self, ticker: str, quarter: int, year: int) -> Optional[Dict[str, Any]]:
+        """Get the event for a ticker/quarter/year, or None"""
+        return self._events.get((ticker.upper(), int(quarter), int(year)))
+
+    def trading_date(self, ticker: str, quarter: int, year: int) -> Optional[date]:
+        """Get the reaction trading date for a ticker/quarter/year, or None"""
+        event = self.lookup(ticker, quarter, year)
+        return event['trading_date'] if event else None
+
+    def events_for_ticker(self, ticker: str) -> List[Dict[str, Any]]:
+        """All events for a ticker, most recent first"""
+        ticker = ticker.upper()
+        events = [e for key, e in self._events.items() if key[0] == ticker]
+        return sorted(events, key=lambda e: e['trading_date'], reverse=True)
+
+    def to_frame(self) -> pd.DataFrame:
+        """Export the index as a DataFrame"""
+        columns = ['ticker', 'quarter', 'year', 'event_time', 'event_date', 'trading_date', 'source']
+        return pd.DataFrame(list(self._events.values()), columns=columns)
+
+    @classmethod
+    def from_transcript_dir(cls, directory: str = "transcripts") -> 'EarningsCalendar':
+        """
+        Build a calendar from saved transcript files
+
+        Files are expected to be named TICKER_Q<quarter>_<year>.md and carry a
+        '**Date:** YYYY-MM-DD' header line, as written by the download clients.
+        """
+        calendar = cls()
+        if not os.path.isdir(directory):
+            return calendar
+
+        for filename in os.listdir(directory):
+            match = cls.TRANSCRIPT_FILE_PATTERN.match(filename)
+            if not match:
+                continue
+
+            with open(os.path.join(directory, filename), 'r', encoding='utf-8') as f:
+                header = f.read(1024)
+
+            date_match = cls.TRANSCRIPT_DATE_PATTERN.search(header)
+            if date_match:
+                ticker, quarter, year = match.groups()
+                calendar.add_event(ticker, int(quarter), int(year), date_match.group(1), source='file')
+
+        return calendar
@@ -5,24 +5,28 @@ Provides access to earnings call transcripts via Finnhub API
 
 import os
 import requests
-from typing import Dict, List, Optional
+from typing import Dict, List, Optional, Iterable, Tuple
 from datetime import datetime
 
+from utils.listing_cache import ListingCache
+
 class FinnhubClient:
     """Client for Finnhub Earnings Call Transcript API"""
     
-    def __init__(self, api_key: Optional[str] = None):
+    def __init__(self, api_key: Optional[str] = None, listing_ttl: float = 3600):
         """
         Initialize the Finnhub client
         
         Args:
             api_key: API key for Finnhub. If None, will try to get from environment
+            listing_ttl: Seconds to cache each symbol's transcript listing
         """
         self.api_key = api_key or os.getenv('FINNHUB_API_KEY')
         if not self.api_key:
             raise ValueError("FINNHUB_API_KEY not found in environment variables")
         
         self.base_url = "https://finnhub.io/api/v1"
+        self.listing_cache = ListingCache(ttl=listing_ttl)
     
     def get_transcripts_list(self, symbol: str) -> List[Dict]:
         """
@@ -102,24 +106,31 @@ class FinnhubClient:
         Returns:
             Transcript data or None if not found
         """
-        transcripts = self.get_transcripts_list(symbol)
+        return self.find_transcripts(symbol, [(year, quarter)])[(year, quarter)]
+    
+    def find_transcripts(self, symbol: str, periods: Iterable[Tuple[int, int]]) -> Dict[Tuple[int, int], Optional[Dict]]:
+        """
+        Find transcripts for several periods of one symbol
         
-        if not transcripts:
-            return None
+        The symbol's transcript listing is fetched at most once per cache TTL
+        and looked up by (year, quarter).
         
-        # Search for matching quarter/year
-        for transcript in transcripts:
-            # Parse quarter and year from transcript metadata
-            transcript_quarter = transcript.get('quarter')
-            transcript_year = transcript.get('year')
-            
-            if transcript_quarter == quarter and transcript_year == year:
-                # Get full transcript
-                transcript_id = transcript.get('id')
-                if transcript_id:
-                    return self.get_transcript(transcript_id)
+        Args:
+            symbol: Stock ticker symbol
+            periods: (year, quarter) pairs
+        
+        Returns:
+            Dictionary mapping each (year, quarter) to transcript data or None
+        """
+        index = self.listing_cache.get(symbol, self.get_transcripts_list)
+        
+        results = {}
+        for year, quarter in periods:
+            entry = index.get((int(year), int(quarter)))
+            transcript_id = entry.get('id') if entry else None
+            results[(year, quarter)] = self.get_transcript(transcript_id) if transcript_id else None
         
-        return None
+        return results
     
     def save_transcript_to_file(self, symbol: str, year: int, quarter: int,
                                 output_dir: str = "transcripts") -> Optional[str]:
@@ -0,0 +1,89 @@
+"""
+Typed DataFrames
+Column dtypes for the DataFrames returned by the database read APIs
+
+Read as-is, NUMERIC columns arrive as object columns of Python Decimal and
+strings as generic objects, so every filter, .corr() and plot runs at
+Python-object speed. typed_frame() casts known columns by name: prices,
+movements and statistics to float64, scores and quarters to small nullable
+integers, and repeated labels (ticker, provider, model, ...) to categoricals.
+With dtype_backend='pyarrow' the same columns become Arrow-backed instead.
+"""
+
+from typing import Dict
+
+import pandas as pd
+import pyarrow as pa
+
+
+DTYPE_BACKENDS = ('numpy', 'pyarrow')
+
+FLOAT_COLUMNS = (
+    'price_before', 'price_after_1d', 'price_after_3d', 'price_after_5d', 'price_after_10d',
+    'movement_1d_pct', 'movement_3d_pct', 'movement_5d_pct', 'movement_10d_pct',
+    'correlation_coefficient', 'mean_absolute_error', 'r_squared', 'direction_accuracy',
+    'processing_time_seconds', 'rank'
+)
+
+COLUMN_DTYPES: Dict[str, str] = {
+    **{col: 'float64' for col in FLOAT_COLUMNS},
+    'score': 'Int8',
+    'quarter': 'Int8',
+    'period_days': 'Int8',
+    'year': 'Int16',
+    'word_count': 'Int32',
+    'sample_size': 'Int32',
+    'volume_before': 'Int64',
+    'volume_after_1d': 'Int64',
+    'ticker': 'category',
+    'provider': 'category',
+    'model': 'category',
+    'analysis_type': 'category',
+    'source': 'category',
+    'data_source': 'category',
+    'kind': 'category',
+    'financial_context_included': 'boolean',
+    'direction_correct_1d': 'boolean',
+    'direction_correct_5d': 'boolean',
+}
+
+ARROW_DTYPES = {
+    'float64': pd.ArrowDtype(pa.float64()),
+    'Int8': pd.ArrowDtype(pa.int8()),
+    'Int16': pd.ArrowDtype(pa.int16()),
+    'Int32': pd.ArrowDtype(pa.int32()),
+    'Int64': pd.ArrowDtype(pa.int64()),
+    'category': pd.ArrowDtype(pa.dictionary(pa.int32(), pa.string())),
+    'boolean': pd.ArrowDtype(pa.bool_()),
+}
+
+
+def typed_frame(df: pd.DataFrame, dtype_backend: str = 'numpy') -> pd.DataFrame:
+    """
+    Cast the known columns of a query result to compact, vectorizable dtypes
+
+    Args:
+        df: Query result (modified in place and returned)
+        dtype_backend: 'numpy' (pandas nullable/categorical dtypes) or 'pyarrow'
+
+    Returns:
+        The typed DataFrame
+    """
+    if dtype_backend not in DTYPE_BACKENDS:
+        raise ValueError(f"Unknown dtype_backend: {dtype_backend}")
+
+    for col in df.columns.intersection(COLUMN_DTYPES.keys()):
+        dtype = COLUMN_DTYPES[col]
+        values = df[col]
+        if dtype.startswith(('float', 'Int')) and not pd.api.types.is_numeric_dtype(values):
+            # NUMERIC columns arrive as Decimal objects; astype converts them
+            # several times faster than pd.to_numeric
+            try:
+                values = values.astype('float64')
+            except (TypeError, ValueError):
+                values = pd.to_numeric(values, errors='coerce')
+        df[col] = values.astype(ARROW_DTYPES[dtype] if dtype_backend == 'pyarrow' else dtype)
+
+    if dtype_backend == 'pyarrow':
+        return df.convert_dtypes(dtype_backend='pyarrow')
+    return df
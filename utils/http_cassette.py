@@ -0,0 +1,353 @@
+"""
+HTTP Cassettes
+Record real API responses once into compressed cassettes and replay them offline
+
+HTTP clients (FMPClient, FinnhubClient, APINinjasClient) are covered by
+patching requests.Session.request. YFinanceClient does not go through
+requests, so its method return values are recorded instead via
+Cassette.wrap(), as tagged JSON (DataFrames and Series in pandas' 'table'
+format, timestamps as ISO strings).
+
+Usage:
+    with use_cassette("tests/cassettes/fmp_client.json.gz"):
+        transcript = FMPClient(api_key).get_transcript("AAPL", 3, 2024)
+
+    with use_cassette("tests/cassettes/yfinance.json.gz") as cassette:
+        client = cassette.wrap(YFinanceClient())
+        info = client.get_company_info("AAPL")
+
+The mode comes from the mode argument, then the HTTP_CASSETTE_MODE
+environment variable ('record', 'replay' or 'off'), and otherwise defaults
+to 'replay' when the cassette file exists and 'off' when it does not.
+"""
+
+import base64
+import gzip
+import hashlib
+import io
+import json
+import os
+import random
+import threading
+import time
+from datetime import date, datetime
+from typing import Any, Dict, Iterable, List, Optional, Tuple, Union
+from urllib.parse import parse_qsl, urlencode, urlsplit, urlunsplit
+
+import numpy as np
+import pandas as pd
+import requests
+
+
+# Query parameters holding API keys; never written to cassettes or used in matching
+SECRET_PARAMS = {'token', 'apikey', 'api_key', 'key'}
+
+MODES = ('record', 'replay', 'off')
+
+
+class CassetteMiss(requests.exceptions.ConnectionError):
+    """Raised in replay mode when a request has no recorded response"""
+
+
+class InjectedError(requests.exceptions.ConnectionError):
+    """Raised when a replayed request is chosen for error injection"""
+
+
+def _strip_secrets(pairs: Iterable[Tuple[str, Any]]) -> List[Tuple[str, str]]:
+    return sorted((str(k), str(v)) for k, v in pairs if str(k).lower() not in SECRET_PARAMS)
+
+
+def request_key(method: str, url: str, params: Any = None, data: Any = None, json_body: Any = None) -> str:
+    """
+    Build the matching key for an HTTP request
+
+    The key covers method, URL and query parameters (from both the URL and
+    params) plus a hash of the body, with API-key parameters removed.
+    """
+    parts = urlsplit(url)
+    query = parse_qsl(parts.query)
+    if isinstance(params, dict):
+        query += list(params.items())
+    elif params:
+        query += list(params)
+
+    key = f"{method.upper()} {urlunsplit((parts.scheme, parts.netloc, parts.path, '', ''))}"
+    query = _strip_secrets(query)
+    if query:
+        key += f"?{urlencode(query)}"
+
+    body = json.dumps(json_body, sort_keys=True) if json_body is not None else data
+    if body:
+        if isinstance(body, str):
+            body = body.encode('utf-8')
+        key += f" body={hashlib.sha256(body).hexdigest()[:16]}"
+
+    return key
+
+
+def call_key(name: str, args: tuple, kwargs: dict) -> str:
+    """Build the matching key for a wrapped method call"""
+    return f"CALL {name}({json.dumps([list(args), kwargs], sort_keys=True, default=str)})"
+
+
+def encode_value(value: Any) -> Any:
+    """
+    Encode a wrapped method's return value as JSON-safe data
+
+    Plain JSON values pass through; DataFrames, Series, timestamps, dates,
+    numpy scalars and dicts with non-string keys are tagged so decode_value()
+    can rebuild them.
+    """
+    if value is None or isinstance(value, (bool, int, float, str)):
+        return value
+    if isinstance(value, np.generic):
+        return value.item()
+    if isinstance(value, pd.DataFrame):
+        return {'__dataframe__': value.to_json(orient='table', date_unit='us')}
+    if isinstance(value, pd.Series):
+        return {'__series__': value.to_frame().to_json(orient='table', date_unit='us')}
+    if isinstance(value, (pd.Timestamp, datetime)):
+        return {'__datetime__': value.isoformat()}
+    if isinstance(value, date):
+        return {'__date__': value.isoformat()}
+    if isinstance(value, (list, tuple)):
+        return [encode_value(item) for item in value]
+    if isinstance(value, dict):
+        if all(isinstance(k, str) for k in value):
+            return {k: encode_value(v) for k, v in value.items()}
+        return {'__items__': [[encode_value(k), encode_value(v)] for k, v in value.items()]}
+    raise TypeError(f"Cannot record a {type(value).__name__} in a cassette")
+
+
+def decode_value(value: Any) -> Any:
+    """Rebuild a value written by encode_value()"""
+    if isinstance(value, list):
+        return [decode_value(item) for item in value]
+    if not isinstance(value, dict):
+        return value
+    if '__dataframe__' in value:
+        return pd.read_json(io.StringIO(value['__dataframe__']), orient='table')
+    if '__series__' in value:
+        return pd.read_json(io.StringIO(value['__series__']), orient='table').iloc[:, 0]
+    if '__datetime__' in value:
+        return pd.Timestamp(value['__datetime__'])
+    if '__date__' in value:
+        return date.fromisoformat(value['__date__'])
+    if '__items__' in value:
+        return {decode_value(k): decode_value(v) for k, v in value['__items__']}
+    return {k: decode_value(v) for k, v in value.items()}
+
+
+def _sanitize_url(url: str) -> str:
+    parts = urlsplit(url)
+    return urlunsplit(parts._replace(query=urlencode(_strip_secrets(parse_qsl(parts.query)))))
+
+
+def _serialize_response(response: requests.Response) -> Dict[str, Any]:
+    return {
+        'status_code': response.status_code,
+        'reason': response.reason,
+        'url': _sanitize_url(response.url or ''),
+        'headers': {k: v for k, v in response.headers.items() if k.lower() in ('content-type', 'date')},
+        'encoding': response.encoding,
+        'body': base64.b64encode(response.content or b'').decode('ascii')
+    }
+
+
+def _deserialize_response(data: Dict[str, Any], request: requests.PreparedRequest) -> requests.Response:
+    response = requests.Response()
+    response.status_code = data['status_code']
+    response.reason = data.get('reason')
+    response.url = data.get('url') or request.url
+    response.headers.update(data.get('headers', {}))
+    response.encoding = data.get('encoding')
+    response._content = base64.b64decode(data['body'])
+    response.request = request
+    return response
+
+
+class Cassette:
+    """A set of recorded interactions that can be replayed offline"""
+
+    def __init__(self, path: str, mode: str = 'replay',
+                 latency: Union[float, Tuple[float, float]] = 0.0,
+                 error_rate: float = 0.0,
+                 seed: Optional[int] = None):
+        """
+        Initialize a cassette
+
+        Args:
+            path: Cassette file (gzip-compressed JSON)
+            mode: 'record' to call live APIs and (re)write the cassette,
+                'replay' to serve recorded responses without network, 'off'
+                to pass through
+            latency: Seconds (or a (min, max) range) added to each replayed call
+            error_rate: Probability (0-1) that a replayed call raises a
+                connection error instead of returning its response
+            seed: Seed for latency/error randomness, for reproducible runs
+        """
+        if mode not in MODES:
+            raise ValueError(f"Unknown cassette mode '{mode}', expected one of {MODES}")
+
+        self.path = path
+        self.mode = mode
+        self.latency = latency
+        self.error_rate = error_rate
+        self.random = random.Random(seed)
+
+        self.interactions: Dict[str, List[Dict[str, Any]]] = {}
+        self.play_counts: Dict[str, int] = {}
+        self._lock = threading.Lock()
+        self._original_request = None
+        self._dirty = False
+
+        if mode == 'replay':
+            self.load()
+
+    # ------------------------------------------------------------------
+    # Persistence
+    # ------------------------------------------------------------------
+
+    def load(self) -> None:
+        """Load interactions from the cassette file"""
+        if not os.path.exists(self.path):
+            raise FileNotFoundError(f"Cassette not found: {self.path}")
+        with gzip.open(self.path, 'rt', encoding='utf-8') as f:
+            data = json.load(f)
+        self.interactions = data.get('interactions', {})
+
+    def save(self) -> None:
+        """Write interactions to the cassette file"""
+        directory = os.path.dirname(self.path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        with gzip.open(self.path, 'wt', encoding='utf-8') as f:
+            json.dump({'version': 1, 'interactions': self.interactions}, f, sort_keys=True)
+        self._dirty = False
+
+    # ------------------------------------------------------------------
+    # Record / replay
+    # ------------------------------------------------------------------
+
+    def _record(self, key: str, entry: Dict[str, Any]) -> None:
+        with self._lock:
+            self.interactions.setdefault(key, []).append(entry)
+            self._dirty = True
+
+    def _play(self, key: str) -> Dict[str, Any]:
+        """
+        Return the next recorded entry for a key; repeated requests replay in
+        recording order and then keep returning the last one
+        """
+        with self._lock:
+            entries = self.interactions.get(key)
+            if not entries:
+                raise CassetteMiss(f"No recorded response for {key} in {self.path}")
+            index = self.play_counts.get(key, 0)
+            self.play_counts[key] = index + 1
+            entry = entries[min(index, len(entries) - 1)]
+
+        self._inject(key)
+        return entry
+
+    def _inject(self, key: str) -> None:
+        """Apply configured latency and error injection to a replayed call"""
+        with self._lock:
+            if isinstance(self.latency, (tuple, list)):
+                delay = self.random.uniform(*self.latency)
+            else:
+                delay = self.latency
+            fail = self.error_rate > 0 and self.random.random() < self.error_rate
+
+        if delay:
+            time.sleep(delay)
+        if fail:
+            raise InjectedError(f"Injected connection error for {key}")
+
+    def _request(self, session: requests.Session, method: str, url: str, **kwargs) -> requests.Response:
+        """Replacement for requests.Session.request while the cassette is active"""
+        key = request_key(method, url, kwargs.get('params'), kwargs.get('data'), kwargs.get('json'))
+
+        if self.mode == 'record':
+            response = self._original_request(session, method, url, **kwargs)
+            self._record(key, _serialize_response(response))
+            return response
+
+        prepared = requests.Request(method=method.upper(), url=url, params=kwargs.get('params')).prepare()
+        return _deserialize_response(self._play(key), prepared)
+
+    def wrap(self, obj: Any, methods: Optional[Iterable[str]] = None) -> Any:
+        """
+        Record/replay the return values of an object's methods
+
+        Use for clients that do not go through requests (e.g. YFinanceClient).
+
+        Args:
+            obj: Client instance
+            methods: Method names to wrap; defaults to all public methods
+
+        Returns:
+            The same object, with its methods patched on the instance
+        """
+        if self.mode == 'off':
+            return obj
+
+        if methods is None:
+            methods = [name for name in dir(obj)
+                       if not name.startswith('_') and callable(getattr(obj, name))]
+
+        for name in methods:
+            setattr(obj, name, self._wrap_method(type(obj).__name__, name, getattr(obj, name)))
+
+        return obj
+
+    def _wrap_method(self, owner: str, name: str, method):
+        def wrapper(*args, **kwargs):
+            key = call_key(f"{owner}.{name}", args, kwargs)
+
+            if self.mode == 'record':
+                result = method(*args, **kwargs)
+                self._record(key, {'result': encode_value(result)})
+                return result
+
+            return decode_value(self._play(key)['result'])
+
+        wrapper.__name__ = name
+        wrapper.__doc__ = method.__doc__
+        return wrapper
+
+    # ------------------------------------------------------------------
+    # Context manager
+    # ------------------------------------------------------------------
+
+    def __enter__(self) -> 'Cassette':
+        if self.mode != 'off':
+            self._original_request = requests.Session.request
+            cassette = self
+
+            def request(session, method, url, **kwargs):
+                return cassette._request(session, method, url, **kwargs)
+
+            requests.Session.request = request
+        return self
+
+    def __exit__(self, exc_type, exc, tb) -> None:
+        if self._original_request is not None:
+            requests.Session.request = self._original_request
+            self._original_request = None
+        if self.mode == 'record' and self._dirty:
+            self.save()
+
+
+def use_cassette(path: str, mode: Optional[str] = None, **kwargs) -> Cassette:
+    """
+    Create a cassette, resolving the mode from HTTP_CASSETTE_MODE or from
+    whether the cassette file already exists
+
+    Args:
+        path: Cassette file path
+        mode: Explicit mode, overriding the environment
+        **kwargs: latency, error_rate and seed (see Cassette)
+    """
+    mode = mode or os.getenv('HTTP_CASSETTE_MODE') or ('replay' if os.path.exists(path) else 'off')
+    return Cassette(path, mode=mode, **kwargs)
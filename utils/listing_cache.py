@@ -0,0 +1,82 @@
+"""
+Listing Cache
+Thread-safe TTL cache for per-symbol transcript listings, indexed by (year, quarter)
+"""
+
+import threading
+import time
+from typing import Callable, Dict, Iterable, Optional, Tuple
+
+
+PeriodIndex = Dict[Tuple[int, int], Dict]
+
+
+def index_by_period(entries: Iterable[Dict]) -> PeriodIndex:
+    """
+    Index listing entries by (year, quarter)
+
+    Year and quarter may be ints or numeric strings depending on the source.
+    When a period appears more than once, the first entry wins (matching the
+    previous linear scan).
+    """
+    index: PeriodIndex = {}
+    for entry in entries:
+        try:
+            key = (int(entry.get('year')), int(entry.get('quarter')))
+        except (TypeError, ValueError):
+            continue
+        index.setdefault(key, entry)
+    return index
+
+
+class ListingCache:
+    """Caches one period index per symbol for a fixed time-to-live"""
+
+    def __init__(self, ttl: float = 3600):
+        """
+        Initialize the cache
+
+        Args:
+            ttl: Seconds a listing stays valid
+        """
+        self.ttl = ttl
+        self._entries: Dict[str, Tuple[float, PeriodIndex]] = {}
+        self._locks: Dict[str, threading.Lock] = {}
+        self._lock = threading.Lock()
+
+    def get(self, symbol: str, loader: Callable[[str], list]) -> PeriodIndex:
+        """
+        Get the period index for a symbol, loading it on a miss
+
+        Concurrent callers for the same symbol share a single load. Empty
+        listings are not cached since the clients also return [] on errors.
+
+        Args:
+            symbol: Ticker symbol
+            loader: Function returning the raw listing for the symbol
+
+        Returns:
+            Dictionary mapping (year, quarter) to listing entries
+        """
+        symbol = symbol.upper()
+
+        with self._lock:
+            symbol_lock = self._locks.setdefault(symbol, threading.Lock())
+
+        with symbol_lock:
+            cached = self._entries.get(symbol)
+            if cached and time.monotonic() - cached[0] < self.ttl:
+                return cached[1]
+
+            index = index_by_period(loader(symbol))
+            if index:
+                self._entries[symbol] = (time.monotonic(), index)
+            return index
+
+    def invalidate(self, symbol: Optional[str] = None) -> None:
+        """Drop the cached listing for a symbol, or all listings"""
+        with self._lock:
+            if symbol is None:
+                self._entries.clear()
+            else:
+                self._entries.pop(symbol.upper(), None)
@@ -0,0 +1,374 @@
+"""
+Schema Migrations
+Versioned schema setup for the PostgreSQL and SQLite databases
+
+Each database records the version of its schema (earnings.schema_migrations
+in PostgreSQL, PRAGMA user_version in SQLite). Opening a database runs a
+single version query and only applies DDL when migrations are pending, so
+normal startup does no table introspection. A process also remembers which
+PostgreSQL databases it has already checked and skips the query on later
+Database() instances.
+
+To change the schema, append a migration to POSTGRES_MIGRATIONS or
+SQLITE_MIGRATIONS; never edit one that has already shipped.
+"""
+
+import os
+import sqlite3
+import threading
+from typing import Callable, List, Set, Tuple
+
+from sqlalchemy import text
+from sqlalchemy.engine import Connection, Engine
+from sqlalchemy.exc import ProgrammingError
+
+
+SCHEMA = 'earnings'
+
+# Key for pg_advisory_xact_lock, so concurrent processes migrate one at a time
+MIGRATION_LOCK_KEY = 0x6561726E  # 'earn'
+
+SQL_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'sql')
+
+SQLITE_SCHEMA_PATH = os.path.join(SQL_DIR, 'create_tables.sql')
+
+# PostgreSQL databases already checked by this process (by URL)
+_checked: Set[str] = set()
+_checked_lock = threading.Lock()
+
+
+# ============================================================================
+# PostgreSQL
+# ============================================================================
+
+def _pg_baseline(conn: Connection) -> None:
+    """
+    Schema and all model tables (what Database() used to create on startup)
+
+    create_all() only creates missing tables; later columns, indexes and
+    constraints on existing tables are their own migrations below.
+    """
+    from utils.models import Base
+
+    conn.execute(text(f"CREATE SCHEMA IF NOT EXISTS {SCHEMA}"))
+    Base.metadata.create_all(bind=conn)
+
+
+def split_sql(script: str) -> List[str]:
+    """
+    Split a SQL script into statements on semicolons outside $$-quoted
+    bodies, dropping -- comments (which must not appear inside strings)
+    """
+    statements, current, in_body = [], [], False
+    for line in script.splitlines():
+        if not in_body:
+            line = line.split('--', 1)[0]
+        for i, part in enumerate(line.split('$$')):
+            if i:
+                current.append('$$')
+                in_body = not in_body
+            if in_body:
+                current.append(part)
+                continue
+            *complete, rest = part.split(';')
+            for piece in complete:
+                current.append(piece)
+                statements.append(''.join(current))
+                current = []
+            current.append(rest)
+        current.append('\n')
+
+    statements.append(''.join(current))
+    return [statement.strip() for statement in statements if statement.strip()]
+
+
+def run_sql_file(conn: Connection, name: str) -> None:
+    """
+    Execute a script from sql/ one statement at a time (drivers such as
+    asyncpg do not accept several statements in one call)
+    """
+    with open(os.path.join(SQL_DIR, name), 'r') as f:
+        for statement in split_sql(f.read()):
+            conn.exec_driver_sql(statement)
+
+
+def _pg_database_stats(conn: Connection) -> None:
+    """earnings.database_stats over trigger-written count deltas"""
+    run_sql_file(conn, 'database_stats.sql')
+
+
+def _pg_sync_watermarks(conn: Connection) -> None:
+    """Progress of SQLite -> PostgreSQL syncs (utils/sqlite_sync.py)"""
+    conn.execute(text(f"""
+        CREATE TABLE IF NOT EXISTS {SCHEMA}.sync_watermarks (
+            source VARCHAR(500) NOT NULL,
+            table_name VARCHAR(50) NOT NULL,
+            last_id BIGINT NOT NULL DEFAULT 0,
+            last_updated_at VARCHAR(32),
+            rows_synced BIGINT NOT NULL DEFAULT 0,
+            synced_at TIMESTAMP WITH TIME ZONE DEFAULT CURRENT_TIMESTAMP,
+            PRIMARY KEY (source, table_name)
+        )
+    """))
+
+
+def _pg_analysis_fields(conn: Connection) -> None:
+    """
+    Indexes on the structured fields of analyses.analysis_json. Existing
+    rows are filled by backfill_analysis_fields.py (Database.backfill_analysis_fields),
+    outside the migration transaction.
+    """
+    conn.execute(text(f"""
+        CREATE INDEX IF NOT EXISTS idx_analyses_analysis_json
+        ON {SCHEMA}.analyses USING GIN (analysis_json jsonb_path_ops)
+    """))
+    conn.execute(text(f"""
+        CREATE INDEX IF NOT EXISTS idx_analyses_guidance_date
+        ON {SCHEMA}.analyses ((analysis_json ->> 'guidance_direction'), analysis_date, id)
+    """))
+
+
+# Migrations 5+ add what create_all() in the baseline does not: columns,
+# indexes and constraints on tables that already existed (including tables
+# created from sql/init_postgres.sql). Each is a no-op on a fresh database.
+
+def _pg_correlation_groups(conn: Connection) -> None:
+    """
+    correlations.provider / model, the rollup marker (so roll-up rows
+    labelled 'ALL' do not collide with a real ticker ALL) and the per-group
+    unique key
+    """
+    conn.execute(text(f"ALTER TABLE {SCHEMA}.correlations ADD COLUMN IF NOT EXISTS provider VARCHAR(50) NOT NULL DEFAULT 'ALL'"))
+    conn.execute(text(f"ALTER TABLE {SCHEMA}.correlations ADD COLUMN IF NOT EXISTS model VARCHAR(100) NOT NULL DEFAULT 'ALL'"))
+    conn.execute(text(f"ALTER TABLE {SCHEMA}.correlations ADD COLUMN IF NOT EXISTS rollup SMALLINT NOT NULL DEFAULT 0"))
+    # Rows written before this were rolled up wherever they say 'ALL'
+    conn.execute(text(f"""
+        UPDATE {SCHEMA}.correlations
+        SET rollup = CASE WHEN ticker = 'ALL' THEN 4 ELSE 0 END
+                   + CASE WHEN provider = 'ALL' THEN 2 ELSE 0 END
+                   + CASE WHEN model = 'ALL' THEN 1 ELSE 0 END
+        WHERE rollup = 0 AND 'ALL' IN (ticker, provider, model)
+    """))
+    # Baseline keys: sql/init_postgres.sql's generated name, and the models'
+    conn.execute(text(f"ALTER TABLE {SCHEMA}.correlations DROP CONSTRAINT IF EXISTS correlations_ticker_period_days_analysis_date_key"))
+    conn.execute(text(f"ALTER TABLE {SCHEMA}.correlations DROP CONSTRAINT IF EXISTS uq_correlation_ticker_period_date"))
+    if not _constraint_exists(conn, 'uq_correlation_group_period_date'):
+        conn.execute(text(f"""
+            ALTER TABLE {SCHEMA}.correlations ADD CONSTRAINT uq_correlation_group_period_date
+            UNIQUE (ticker, provider, model, period_days, analysis_date, rollup)
+        """))
+
+
+def _pg_transcript_search(conn: Connection) -> None:
+    """transcripts.search_vector (generated tsvector) and its GIN index"""
+    conn.execute(text(f"""
+        ALTER TABLE {SCHEMA}.transcripts ADD COLUMN IF NOT EXISTS search_vector TSVECTOR
+        GENERATED ALWAYS AS (to_tsvector('english', transcript_text)) STORED
+    """))
+    conn.execute(text(f"""
+        CREATE INDEX IF NOT EXISTS idx_transcripts_search_vector
+        ON {SCHEMA}.transcripts USING GIN (search_vector)
+    """))
+
+
+def _pg_analysis_search(conn: Connection) -> None:
+    """analyses.search_vector (justification weighted above the body) and its GIN index"""
+    conn.execute(text(f"""
+        ALTER TABLE {SCHEMA}.analyses ADD COLUMN IF NOT EXISTS search_vector TSVECTOR
+        GENERATED ALWAYS AS (
+            setweight(to_tsvector('english', coalesce(score_justification, '')), 'A') ||
+            setweight(to_tsvector('english', analysis_markdown), 'B')
+        ) STORED
+    """))
+    conn.execute(text(f"""
+        CREATE INDEX IF NOT EXISTS idx_analyses_search_vector
+        ON {SCHEMA}.analyses USING GIN (search_vector)
+    """))
+
+
+def _pg_keyset_indexes(conn: Connection) -> None:
+    """(date, id) indexes behind keyset pagination"""
+    for name, table, columns in (
+        ('idx_transcripts_date_id', 'transcripts', 'transcript_date, id'),
+        ('idx_transcripts_ticker_date_id', 'transcripts', 'ticker, transcript_date, id'),
+        ('idx_analyses_date_id', 'analyses', 'analysis_date, id'),
+        ('idx_analyses_ticker_date_id', 'analyses', 'ticker, analysis_date, id'),
+    ):
+        conn.execute(text(f"CREATE INDEX IF NOT EXISTS {name} ON {SCHEMA}.{table} ({columns})"))
+
+
+def _pg_named_constraints(conn: Connection) -> None:
+    """Rename the generated unique constraint names that the upserts target by name"""
+    for table, generated, name in (
+        ('transcripts', 'transcripts_ticker_quarter_year_key', 'uq_transcript_ticker_quarter_year'),
+        ('price_movements', 'price_movements_ticker_earnings_date_key', 'uq_price_movement_ticker_date'),
+    ):
+        if _constraint_exists(conn, generated):
+            conn.execute(text(f"ALTER TABLE {SCHEMA}.{table} RENAME CONSTRAINT {generated} TO {name}"))
+
+
+def _pg_analysis_date_not_null(conn: Connection) -> None:
+    """
+    analyses.analysis_date NOT NULL: keyset pagination compares
+    (analysis_date, id), which never matches a NULL date
+    """
+    conn.execute(text(f"""
+        UPDATE {SCHEMA}.analyses SET analysis_date = COALESCE(created_at, now())
+        WHERE analysis_date IS NULL
+    """))
+    conn.execute(text(f"ALTER TABLE {SCHEMA}.analyses ALTER COLUMN analysis_date SET NOT NULL"))
+
+
+def _constraint_exists(conn: Connection, name: str) -> bool:
+    """Whether a constraint of this name exists in the earnings schema"""
+    return conn.execute(text("""
+        SELECT EXISTS (
+            SELECT 1 FROM pg_constraint
+            WHERE conname = :name AND connamespace = CAST(:schema AS regnamespace)
+        )
+    """), {'name': name, 'schema': SCHEMA}).scalar()
+
+
+POSTGRES_MIGRATIONS: List[Tuple[int, str, Callable[[Connection], None]]] = [
+    (1, 'baseline tables', _pg_baseline),
+    (2, 'trigger-maintained database stats', _pg_database_stats),
+    (3, 'sqlite sync watermarks', _pg_sync_watermarks),
+    (4, 'structured analysis fields', _pg_analysis_fields),
+    (5, 'correlation provider/model grouping and roll-up marker', _pg_correlation_groups),
+    (6, 'transcript full-text search', _pg_transcript_search),
+    (7, 'analysis full-text search', _pg_analysis_search),
+    (8, 'keyset pagination indexes', _pg_keyset_indexes),
+    (9, 'named upsert constraints', _pg_named_constraints),
+    (10, 'analysis date not null', _pg_analysis_date_not_null),
+]
+
+POSTGRES_SCHEMA_VERSION = POSTGRES_MIGRATIONS[-1][0]
+
+
+def postgres_version(conn: Connection) -> int:
+    """
+    Current schema version (0 when earnings.schema_migrations does not exist,
+    in which case the connection's transaction is rolled back)
+    """
+    try:
+        return conn.execute(text(f"SELECT max(version) FROM {SCHEMA}.schema_migrations")).scalar() or 0
+    except ProgrammingError:
+        conn.rollback()
+        return 0
+
+
+def migrate_postgres(engine: Engine) -> List[int]:
+    """
+    Apply pending PostgreSQL migrations
+
+    Runs in one transaction under an advisory lock, so processes starting
+    at the same time do not race each other.
+
+    Returns:
+        Versions applied
+    """
+    applied = []
+    with engine.begin() as conn:
+        conn.execute(text("SELECT pg_advisory_xact_lock(:key)"), {'key': MIGRATION_LOCK_KEY})
+
+        conn.execute(text(f"CREATE SCHEMA IF NOT EXISTS {SCHEMA}"))
+        conn.execute(text(f"""
+            CREATE TABLE IF NOT EXISTS {SCHEMA}.schema_migrations (
+                version INTEGER PRIMARY KEY,
+                description VARCHAR(255) NOT NULL,
+                applied_at TIMESTAMP WITH TIME ZONE DEFAULT CURRENT_TIMESTAMP
+            )
+        """))
+        current = postgres_version(conn)
+
+        for version, description, migration in POSTGRES_MIGRATIONS:
+            if version <= current:
+                continue
+            migration(conn)
+            conn.execute(text(
+                f"INSERT INTO {SCHEMA}.schema_migrations (version, description) VALUES (:version, :description)"
+            ), {'version': version, 'description': description})
+            applied.append(version)
+
+    return applied
+
+
+def ensure_postgres_schema(engine: Engine) -> None:
+    """
+    Bring a PostgreSQL database up to POSTGRES_SCHEMA_VERSION
+
+    Costs one version query the first time a database is opened in a
+    process, and nothing after that.
+    """
+    key = engine.url.render_as_string(hide_password=True)
+    if key in _checked:
+        return
+
+    with engine.connect() as conn:
+        current = postgres_version(conn)
+
+    if current < POSTGRES_SCHEMA_VERSION:
+        migrate_postgres(engine)
+    elif current > POSTGRES_SCHEMA_VERSION:
+        print(f"Warning: database schema version {current} is newer than this code ({POSTGRES_SCHEMA_VERSION})")
+
+    with _checked_lock:
+        _checked.add(key)
+
+
+# ============================================================================
+# SQLite
+# ============================================================================
+
+def _sqlite_baseline(conn: sqlite3.Connection) -> None:
+    """Tables from sql/create_tables.sql"""
+    with open(SQLITE_SCHEMA_PATH, 'r') as f:
+        conn.executescript(f.read())
+
+
+def _sqlite_price_movements_updated_at(conn: sqlite3.Connection) -> None:
+    """Index for streaming changed price movements in (updated_at, id) order"""
+    conn.execute("CREATE INDEX IF NOT EXISTS idx_price_movements_updated_at ON price_movements(updated_at, id)")
+
+
+def _sqlite_scores_updated_at(conn: sqlite3.Connection) -> None:
+    """
+    Scores are upserted in place, so track changes by updated_at (set on every
+    write) and stream them in (updated_at, id) order, as for price movements
+    """
+    columns = {row[1] for row in conn.execute("PRAGMA table_info(scores)")}
+    if 'updated_at' not in columns:
+        # ADD COLUMN does not allow a CURRENT_TIMESTAMP default; writers set it
+        conn.execute("ALTER TABLE scores ADD COLUMN updated_at DATETIME")
+    conn.execute("UPDATE scores SET updated_at = COALESCE(created_at, CURRENT_TIMESTAMP) WHERE updated_at IS NULL")
+    conn.execute("CREATE INDEX IF NOT EXISTS idx_scores_updated_at ON scores(updated_at, id)")
+
+
+SQLITE_MIGRATIONS: List[Tuple[int, str, Callable[[sqlite3.Connection], None]]] = [
+    (1, 'baseline tables', _sqlite_baseline),
+    (2, 'price movements updated_at index', _sqlite_price_movements_updated_at),
+    (3, 'scores updated_at', _sqlite_scores_updated_at),
+]
+
+SQLITE_SCHEMA_VERSION = SQLITE_MIGRATIONS[-1][0]
+
+
+def migrate_sqlite(conn: sqlite3.Connection) -> List[int]:
+    """
+    Apply pending SQLite migrations, tracking the version in PRAGMA user_version
+
+    Returns:
+        Versions applied
+    """
+    applied = []
+    current = conn.execute("PRAGMA user_version").fetchone()[0]
+
+    for version, description, migration in SQLITE_MIGRATIONS:
+        if version <= current:
+            continue
+        migration(conn)
+        conn.execute(f"PRAGMA user_version = {int(version)}")
+        conn.commit()
+        applied.append(version)
+
+    return applied
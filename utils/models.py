@@ -4,11 +4,11 @@ Database: PostgreSQL
 Schema: earnings
 """
 
-from sqlalchemy import Column, Integer, String, Text, Date, DateTime, Numeric, Boolean, BigInteger, ForeignKey, CheckConstraint, UniqueConstraint, Float
-from sqlalchemy.dialects.postgresql import JSONB
+from sqlalchemy import Column, Integer, String, Text, Date, DateTime, Numeric, Boolean, BigInteger, ForeignKey, CheckConstraint, UniqueConstraint, Float, Index, Computed, SmallInteger
+from sqlalchemy.dialects.postgresql import JSONB, TSVECTOR
 from sqlalchemy.ext.declarative import declarative_base
-from sqlalchemy.orm import relationship
-from sqlalchemy.sql import func
+from sqlalchemy.orm import relationship, deferred
+from sqlalchemy.sql import func, text
 from datetime import datetime
 
 Base = declarative_base()
@@ -22,19 +22,29 @@ class Transcript(Base):
         UniqueConstraint('ticker', 'quarter', 'year', name='uq_transcript_ticker_quarter_year'),
         CheckConstraint('quarter >= 1 AND quarter <= 4', name='ck_transcript_quarter'),
         CheckConstraint('year >= 2000 AND year <= 2100', name='ck_transcript_year'),
+        Index('idx_transcripts_date_id', 'transcript_date', 'id'),  # Keyset pagination
+        Index('idx_transcripts_ticker_date_id', 'ticker', 'transcript_date', 'id'),
+        Index('idx_transcripts_search_vector', 'search_vector', postgresql_using='gin'),
         {'schema': 'earnings'}
     )
     
+    # Unique on its own; year-partitioned tables (utils/partitioning.py) key
+    # on (id, year), which the ORM does not need to know about
     id = Column(Integer, primary_key=True, autoincrement=True)
     ticker = Column(String(10), nullable=False, index=True)
     company_name = Column(String(255))
     quarter = Column(Integer, nullable=False)
     year = Column(Integer, nullable=False)
     transcript_date = Column(Date, nullable=False, index=True)
-    transcript_text = Column(Text, nullable=False)
+    transcript_text = deferred(Column(Text, nullable=False))  # Load with undefer(Transcript.transcript_text)
     source = Column(String(50), nullable=False)  # 'api_ninjas', 'finnhub', 'manual_upload'
     source_metadata = Column(JSONB)
     word_count = Column(Integer)
+    # Full-text search document, maintained by Postgres
+    search_vector = deferred(Column(
+        TSVECTOR,
+        Computed("to_tsvector('english', transcript_text)", persisted=True)
+    ))
     created_at = Column(DateTime(timezone=True), server_default=func.now())
     updated_at = Column(DateTime(timezone=True), server_default=func.now(), onupdate=func.now())
     
@@ -54,24 +64,43 @@ class Analysis(Base):
         CheckConstraint('quarter >= 1 AND quarter <= 4', name='ck_analysis_quarter'),
         CheckConstraint('year >= 2000 AND year <= 2100', name='ck_analysis_year'),
         CheckConstraint('score >= -5 AND score <= 5', name='ck_analysis_score'),
+        Index('idx_analyses_date_id', 'analysis_date', 'id'),  # Keyset pagination
+        Index('idx_analyses_ticker_date_id', 'ticker', 'analysis_date', 'id'),
+        Index('idx_analyses_search_vector', 'search_vector', postgresql_using='gin'),
+        # Structured fields screens (Database.find_analyses)
+        Index('idx_analyses_analysis_json', 'analysis_json', postgresql_using='gin',
+              postgresql_ops={'analysis_json': 'jsonb_path_ops'}),
+        Index('idx_analyses_guidance_date', text("(analysis_json ->> 'guidance_direction')"), 'analysis_date', 'id'),
         {'schema': 'earnings'}
     )
     
     id = Column(Integer, primary_key=True, autoincrement=True)
+    # References (transcript_id, year) once the tables are year-partitioned
     transcript_id = Column(Integer, ForeignKey('earnings.transcripts.id', ondelete='CASCADE'), index=True)
     ticker = Column(String(10), nullable=False, index=True)
     quarter = Column(Integer, nullable=False)
     year = Column(Integer, nullable=False)
-    analysis_date = Column(DateTime(timezone=True), server_default=func.now(), index=True)
+    analysis_date = Column(DateTime(timezone=True), nullable=False, server_default=func.now(), index=True)
     score = Column(Integer, index=True)
     score_justification = Column(Text)
-    analysis_markdown = Column(Text, nullable=False)
-    analysis_json = Column(JSONB)
+    # Heavy columns load on access or with undefer_group('analysis_text')
+    analysis_markdown = deferred(Column(Text, nullable=False), group='analysis_text')
+    # score, guidance_direction, eps_beat, revenue_beat, key_risks (utils.score_extractor)
+    analysis_json = deferred(Column(JSONB), group='analysis_text')
     provider = Column(String(50), nullable=False)  # 'openai', 'xai', 'gemini'
     model = Column(String(100))  # 'gpt-4.1-mini', 'grok-3', etc.
     analysis_type = Column(String(50), nullable=False)  # 'Standard Analysis', 'Agentic Workflow'
     financial_context_included = Column(Boolean, default=False)
     processing_time_seconds = Column(Float)
+    # Full-text search document (justification weighted above the body), maintained by Postgres
+    search_vector = deferred(Column(
+        TSVECTOR,
+        Computed(
+            "setweight(to_tsvector('english', coalesce(score_justification, '')), 'A') || "
+            "setweight(to_tsvector('english', analysis_markdown), 'B')",
+            persisted=True
+        )
+    ), group='analysis_text')
     created_at = Column(DateTime(timezone=True), server_default=func.now())
     updated_at = Column(DateTime(timezone=True), server_default=func.now(), onupdate=func.now())
     
@@ -114,19 +143,93 @@ class PriceMovement(Base):
         return f"<PriceMovement(ticker='{self.ticker}', date={self.earnings_date})>"
 
 
+class EarningsEvent(Base):
+    """
+    Earnings call calendar: one event per ticker/quarter/year, aligned to the
+    trading session in which the market first reacts to the call
+    """
+    __tablename__ = 'earnings_events'
+    __table_args__ = (
+        UniqueConstraint('ticker', 'quarter', 'year', name='uq_earnings_event_ticker_quarter_year'),
+        CheckConstraint('quarter >= 1 AND quarter <= 4', name='ck_earnings_event_quarter'),
+        Index('idx_earnings_events_ticker_trading_date', 'ticker', 'trading_date'),
+        {'schema': 'earnings'}
+    )
+    
+    id = Column(Integer, primary_key=True, autoincrement=True)
+    ticker = Column(String(10), nullable=False)
+    quarter = Column(Integer, nullable=False)
+    year = Column(Integer, nullable=False)
+    event_time = Column(DateTime(timezone=True))  # NULL when only the call date is known
+    event_date = Column(Date, nullable=False)
+    trading_date = Column(Date, nullable=False, index=True)  # First session after the call
+    source = Column(String(50))
+    created_at = Column(DateTime(timezone=True), server_default=func.now())
+    updated_at = Column(DateTime(timezone=True), server_default=func.now(), onupdate=func.now())
+    
+    def __repr__(self):
+        return f"<EarningsEvent(ticker='{self.ticker}', Q{self.quarter} {self.year}, trading_date={self.trading_date})>"
+
+
+class AnalysisPerformanceFact(Base):
+    """
+    Materialized analysis_performance: one row per analysis with the price
+    movement of its reaction trading session. Maintained incrementally by
+    Database.refresh_analysis_performance; no foreign keys so refreshes never
+    lock the source tables.
+    """
+    __tablename__ = 'analysis_performance_facts'
+    __table_args__ = (
+        Index('idx_analysis_performance_facts_ticker_earnings_date', 'ticker', 'earnings_date'),
+        {'schema': 'earnings'}
+    )
+    
+    analysis_id = Column(Integer, primary_key=True, autoincrement=False)
+    ticker = Column(String(10), nullable=False)
+    quarter = Column(Integer, nullable=False)
+    year = Column(Integer, nullable=False)
+    analysis_date = Column(DateTime(timezone=True))
+    score = Column(Integer)
+    provider = Column(String(50))
+    model = Column(String(100))
+    analysis_type = Column(String(50))
+    earnings_date = Column(Date, index=True)  # Reaction trading date (earnings_events.trading_date)
+    movement_1d_pct = Column(Numeric(6, 2))
+    movement_3d_pct = Column(Numeric(6, 2))
+    movement_5d_pct = Column(Numeric(6, 2))
+    movement_10d_pct = Column(Numeric(6, 2))
+    direction_correct_1d = Column(Boolean)
+    direction_correct_5d = Column(Boolean)
+    refreshed_at = Column(DateTime(timezone=True), server_default=func.now())
+    
+    def __repr__(self):
+        return f"<AnalysisPerformanceFact(analysis_id={self.analysis_id}, ticker='{self.ticker}', score={self.score})>"
+
+
 class Correlation(Base):
     """
     Stores correlation analysis results
     """
     __tablename__ = 'correlations'
     __table_args__ = (
-        UniqueConstraint('ticker', 'period_days', 'analysis_date', name='uq_correlation_ticker_period_date'),
+        UniqueConstraint('ticker', 'provider', 'model', 'period_days', 'analysis_date', 'rollup',
+                         name='uq_correlation_group_period_date'),
         CheckConstraint('period_days > 0', name='ck_correlation_period'),
         {'schema': 'earnings'}
     )
     
+    # rollup bits (GROUPING(ticker, provider, model)): a set bit means the
+    # dimension is rolled up and its 'ALL' label is not a real value
+    ROLLUP_TICKER = 4
+    ROLLUP_PROVIDER = 2
+    ROLLUP_MODEL = 1
+    ROLLUP_ALL = ROLLUP_TICKER | ROLLUP_PROVIDER | ROLLUP_MODEL
+    
     id = Column(Integer, primary_key=True, autoincrement=True)
-    ticker = Column(String(10), index=True)
+    ticker = Column(String(10), index=True)  # 'ALL' for all tickers
+    provider = Column(String(50), nullable=False, server_default='ALL')  # 'ALL' for all providers
+    model = Column(String(100), nullable=False, server_default='ALL')  # 'ALL' for all models
+    rollup = Column(SmallInteger, nullable=False, server_default='0')  # ROLLUP_* bits
     period_days = Column(Integer, nullable=False)
     correlation_coefficient = Column(Numeric(5, 3))
     sample_size = Column(Integer)
@@ -137,4 +240,4 @@ class Correlation(Base):
     created_at = Column(DateTime(timezone=True), server_default=func.now())
     
     def __repr__(self):
-        return f"<Correlation(ticker='{self.ticker}', period={self.period_days}d, corr={self.correlation_coefficient})>"
+        return f"<Correlation(ticker='{self.ticker}', provider='{self.provider}', period={self.period_days}d, corr={self.correlation_coefficient})>"
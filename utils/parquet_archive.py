@@ -0,0 +1,328 @@
+"""
+Parquet Archive
+Bulk export and import of the earnings schema as partitioned Parquet datasets
+
+transcripts, analyses and price_movements are each streamed out of
+PostgreSQL in chunks over a server-side cursor and written as a hive-style
+dataset partitioned by ticker and year (price movements by the year of the
+earnings date), zstd-compressed:
+
+    data/archive/transcripts/ticker=AAPL/year=2024/part-0.parquet
+
+The datasets can be read directly by pandas, pyarrow, DuckDB or Spark.
+Importing reads them back in batches and loads each batch with COPY into a
+temporary staging table, merged on the natural keys (ticker/quarter/year for
+transcripts, ticker/earnings_date for price movements, ticker/quarter/year/
+analysis_date for analyses), so an archive can be restored into an empty
+database or merged into a populated one. IDs are reassigned on import.
+
+Usage:
+    archive = ParquetArchive(Database(), "data/archive")
+    archive.export()          # {'transcripts': 1200, 'analyses': 4800, 'price_movements': 1100}
+    archive.restore()
+"""
+
+import io
+import json
+import os
+import shutil
+from typing import Callable, Dict, Iterable, Iterator, List, Optional
+
+import pandas as pd
+import pyarrow as pa
+import pyarrow.csv as pa_csv
+import pyarrow.dataset as ds
+from sqlalchemy import extract, select, text
+
+from utils.database import Database
+from utils.models import Analysis, PriceMovement, Transcript
+
+
+DEFAULT_ARCHIVE_PATH = "data/archive"
+
+# Exported and restored in this order, so analyses find their transcripts
+ARCHIVE_TABLES = ('transcripts', 'price_movements', 'analyses')
+
+TIMESTAMP = pa.timestamp('us', tz='UTC')
+
+ARCHIVE_SCHEMAS = {
+    'transcripts': pa.schema([
+        ('id', pa.int32()),
+        ('ticker', pa.string()),
+        ('year', pa.int16()),
+        ('company_name', pa.string()),
+        ('quarter', pa.int8()),
+        ('transcript_date', pa.date32()),
+        ('transcript_text', pa.string()),
+        ('source', pa.string()),
+        ('source_metadata', pa.string()),  # JSON text
+        ('word_count', pa.int32()),
+        ('created_at', TIMESTAMP),
+        ('updated_at', TIMESTAMP),
+    ]),
+    'price_movements': pa.schema([
+        ('id', pa.int32()),
+        ('ticker', pa.string()),
+        ('year', pa.int16()),  # Of earnings_date; partition key only
+        ('earnings_date', pa.date32()),
+        *((col, pa.float64()) for col in Database.PRICE_MOVEMENT_COLUMNS[2:11]),
+        ('volume_before', pa.int64()),
+        ('volume_after_1d', pa.int64()),
+        ('data_source', pa.string()),
+        ('created_at', TIMESTAMP),
+        ('updated_at', TIMESTAMP),
+    ]),
+    'analyses': pa.schema([
+        ('id', pa.int32()),
+        ('transcript_id', pa.int32()),
+        ('ticker', pa.string()),
+        ('year', pa.int16()),
+        ('quarter', pa.int8()),
+        ('analysis_date', TIMESTAMP),
+        ('score', pa.int8()),
+        ('score_justification', pa.string()),
+        ('analysis_markdown', pa.string()),
+        ('analysis_json', pa.string()),  # JSON text
+        ('provider', pa.string()),
+        ('model', pa.string()),
+        ('analysis_type', pa.string()),
+        ('financial_context_included', pa.bool_()),
+        ('processing_time_seconds', pa.float64()),
+        ('created_at', TIMESTAMP),
+        ('updated_at', TIMESTAMP),
+    ]),
+}
+
+JSON_COLUMNS = ('source_metadata', 'analysis_json')
+
+PARTITIONING = ds.partitioning(pa.schema([('ticker', pa.string()), ('year', pa.int16())]), flavor='hive')
+
+# Columns not written back: IDs are reassigned, price_movements.year is derived
+NOT_RESTORED = {'id', 'transcript_id'}
+
+# Merge the staging table into the target; {columns} is the restored column list
+MERGE_SQL = {
+    'transcripts': """
+        INSERT INTO earnings.transcripts ({columns})
+        SELECT {columns} FROM _archive_stage
+        ON CONFLICT (ticker, quarter, year) DO UPDATE SET
+            company_name = EXCLUDED.company_name,
+            transcript_date = EXCLUDED.transcript_date,
+            transcript_text = EXCLUDED.transcript_text,
+            source = EXCLUDED.source,
+            source_metadata = EXCLUDED.source_metadata,
+            word_count = EXCLUDED.word_count,
+            updated_at = EXCLUDED.updated_at
+    """,
+    'price_movements': """
+        INSERT INTO earnings.price_movements ({columns})
+        SELECT {columns} FROM _archive_stage
+        ON CONFLICT (ticker, earnings_date) DO UPDATE SET
+    """ + ",\n            ".join(
+        f"{col} = EXCLUDED.{col}" for col in [*Database.PRICE_MOVEMENT_COLUMNS[2:], 'updated_at']
+    ),
+    # No unique key on analyses: skip rows already present, matched on the
+    # idx_analyses_ticker_date_id index, and link them to their transcripts
+    'analyses': """
+        INSERT INTO earnings.analyses (transcript_id, {columns})
+        SELECT t.id, {stage_columns}
+        FROM _archive_stage s
+        LEFT JOIN earnings.transcripts t ON t.ticker = s.ticker AND t.quarter = s.quarter AND t.year = s.year
+        WHERE NOT EXISTS (
+            SELECT 1 FROM earnings.analyses a
+            WHERE a.ticker = s.ticker AND a.analysis_date = s.analysis_date
+              AND a.quarter = s.quarter AND a.year = s.year
+        )
+    """,
+}
+
+
+def restored_columns(table: str) -> List[str]:
+    """Archive columns written back to a table by restore"""
+    skipped = NOT_RESTORED | ({'year'} if table == 'price_movements' else set())
+    return [name for name in ARCHIVE_SCHEMAS[table].names if name not in skipped]
+
+
+def export_query(table: str):
+    """SELECT for one table in partition order, so each partition is written once"""
+    if table == 'transcripts':
+        columns = [getattr(Transcript, name) for name in ARCHIVE_SCHEMAS[table].names]
+        return select(*columns).order_by(Transcript.ticker, Transcript.year, Transcript.quarter)
+    if table == 'analyses':
+        columns = [getattr(Analysis, name) for name in ARCHIVE_SCHEMAS[table].names]
+        return select(*columns).order_by(Analysis.ticker, Analysis.year, Analysis.analysis_date, Analysis.id)
+
+    year = extract('year', PriceMovement.earnings_date)
+    columns = [
+        year.label('year') if name == 'year' else getattr(PriceMovement, name)
+        for name in ARCHIVE_SCHEMAS[table].names
+    ]
+    return select(*columns).order_by(PriceMovement.ticker, PriceMovement.earnings_date)
+
+
+def to_record_batch(df: pd.DataFrame, schema: pa.Schema) -> pa.RecordBatch:
+    """Convert a typed query chunk to a record batch of the archive schema"""
+    df = df[schema.names].copy()
+    for field in schema:
+        if field.name in JSON_COLUMNS:
+            df[field.name] = [None if v is None else json.dumps(v) for v in df[field.name].astype(object)]
+        elif pa.types.is_string(field.type):
+            # Categoricals from typed_frame would otherwise become dictionaries
+            df[field.name] = df[field.name].astype(object)
+        elif pa.types.is_date32(field.type):
+            df[field.name] = pd.to_datetime(df[field.name]).dt.date
+    return pa.RecordBatch.from_pandas(df, schema=schema, preserve_index=False)
+
+
+def read_batches(path: str, columns: List[str], batch_size: int) -> Iterator[pa.Table]:
+    """
+    Stream a partitioned archive dataset in tables of about batch_size rows
+
+    Partition files are small, so their batches are combined until a
+    batch is big enough to be worth one COPY.
+    """
+    dataset = ds.dataset(path, format='parquet', partitioning=PARTITIONING)
+    pending, rows = [], 0
+    for batch in dataset.to_batches(columns=columns, batch_size=batch_size, fragment_readahead=4):
+        if batch.num_rows:
+            pending.append(batch)
+            rows += batch.num_rows
+        if rows >= batch_size:
+            yield pa.Table.from_batches(pending)
+            pending, rows = [], 0
+    if pending:
+        yield pa.Table.from_batches(pending)
+
+
+class ParquetArchive:
+    """Exports the earnings tables to partitioned Parquet and loads them back with COPY"""
+
+    def __init__(self, db: Database, path: str = DEFAULT_ARCHIVE_PATH, chunksize: int = 20000):
+        """
+        Initialize the archive
+
+        Args:
+            db: PostgreSQL database
+            path: Archive directory (one dataset directory per table)
+            chunksize: Rows per query chunk on export and per COPY on import
+        """
+        self.db = db
+        self.path = path
+        self.chunksize = chunksize
+
+    def table_path(self, table: str) -> str:
+        """Dataset directory of a table"""
+        return os.path.join(self.path, table)
+
+    def export(self, tables: Optional[Iterable[str]] = None,
+               progress_callback: Optional[Callable[[str, int], None]] = None) -> Dict[str, int]:
+        """
+        Export tables to zstd Parquet datasets partitioned by ticker and year
+
+        Each table is written to a temporary directory and swapped in when
+        complete, so an interrupted export leaves the previous one intact.
+
+        Args:
+            tables: Subset of ARCHIVE_TABLES (default: all)
+            progress_callback: Called with (table, rows exported so far) after each chunk
+
+        Returns:
+            Rows exported per table
+        """
+        tables = [t for t in ARCHIVE_TABLES if t in set(tables or ARCHIVE_TABLES)]
+        exported = {}
+
+        for table in tables:
+            schema = ARCHIVE_SCHEMAS[table]
+            exported[table] = 0
+
+            def batches() -> Iterator[pa.RecordBatch]:
+                for chunk in self.db._iter_chunks(export_query(table), self.chunksize):
+                    yield to_record_batch(chunk, schema)
+                    exported[table] += len(chunk)
+                    if progress_callback:
+                        progress_callback(table, exported[table])
+
+            target = self.table_path(table)
+            tmp_path = target + ".partial"
+            shutil.rmtree(tmp_path, ignore_errors=True)
+
+            ds.write_dataset(
+                batches(), tmp_path, schema=schema, format='parquet',
+                partitioning=PARTITIONING, max_partitions=max(self.chunksize, 1024),
+                file_options=ds.ParquetFileFormat().make_write_options(compression='zstd'),
+                basename_template='part-{i}.parquet',
+                existing_data_behavior='overwrite_or_ignore'
+            )
+
+            shutil.rmtree(target, ignore_errors=True)
+            if os.path.exists(tmp_path):
+                os.replace(tmp_path, target)
+            else:
+                os.makedirs(target, exist_ok=True)  # Empty table
+
+        return exported
+
+    def _copy_batch(self, table: str, batch: pa.Table) -> int:
+        """COPY one batch into a staging table and merge it, in one transaction"""
+        columns = ", ".join(batch.column_names)
+        csv = io.BytesIO()
+        pa_csv.write_csv(batch, csv)  # Quotes empty strings, leaves NULLs empty, as COPY expects
+        csv.seek(0)
+
+        with self.db.get_session() as session:
+            session.execute(text(
+                f"CREATE TEMP TABLE _archive_stage ON COMMIT DROP AS "
+                f"SELECT {columns} FROM earnings.{table} WITH NO DATA"
+            ))
+            cursor = session.connection().connection.cursor()
+            try:
+                cursor.copy_expert(f"COPY _archive_stage ({columns}) FROM STDIN WITH (FORMAT csv, HEADER true)", csv)
+            finally:
+                cursor.close()
+
+            stage_columns = ", ".join(f"s.{col}" for col in batch.column_names)
+            result = session.execute(text(MERGE_SQL[table].format(columns=columns, stage_columns=stage_columns)))
+            return result.rowcount
+
+    def restore(self, tables: Optional[Iterable[str]] = None,
+                progress_callback: Optional[Callable[[str, int], None]] = None) -> Dict[str, int]:
+        """
+        Load archived tables back into PostgreSQL with COPY
+
+        Existing transcripts and price movements are updated on their
+        natural keys and analyses already present are skipped, so restoring
+        twice is harmless. The earnings event index and the materialized
+        analysis performance are rebuilt once at the end.
+
+        Args:
+            tables: Subset of ARCHIVE_TABLES (default: all archived tables)
+            progress_callback: Called with (table, rows read so far) after each batch
+
+        Returns:
+            Rows inserted or updated per table
+        """
+        tables = [
+            t for t in ARCHIVE_TABLES
+            if t in set(tables or ARCHIVE_TABLES) and os.path.isdir(self.table_path(t))
+        ]
+        loaded = {}
+
+        for table in tables:
+            loaded[table] = 0
+            read = 0
+            for batch in read_batches(self.table_path(table), restored_columns(table), self.chunksize):
+                loaded[table] += self._copy_batch(table, batch)
+                read += batch.num_rows
+                if progress_callback:
+                    progress_callback(table, read)
+
+        if tables:
+            if 'transcripts' in tables:
+                self.db.rebuild_earnings_events()
+            self.db.refresh_analysis_performance()
+            with self.db.engine.connect().execution_options(isolation_level='AUTOCOMMIT') as conn:
+                for table in tables:
+                    conn.execute(text(f"ANALYZE earnings.{table}"))
+
+        return loaded
@@ -0,0 +1,287 @@
+"""
+Year Partitioning
+Optional migration of earnings.transcripts and earnings.analyses to tables
+partitioned by year, with BRIN indexes on timestamps
+
+Both tables are range-partitioned on their integer `year` column, which is
+already part of the transcript unique key, so (ticker, quarter, year) upserts
+keep working unchanged. Keys on a partitioned table must include the
+partition column, so the conversion makes the primary keys (id, year) and
+references transcripts through (transcript_id, year). Unpartitioned tables
+keep their id keys; ids stay unique in both layouts, so the models and
+queries work with either. Queries that filter on year (see
+the `years` arguments in utils.database.Database) only touch the matching
+partitions.
+"""
+
+from typing import Dict, Iterable, List, Optional
+
+from sqlalchemy import text
+from sqlalchemy.engine import Connection, Engine
+
+from utils.migrations import run_sql_file
+
+
+SCHEMA = 'earnings'
+
+# Parent tables in dependency order (analyses reference transcripts)
+PARTITIONED_TABLES = ('transcripts', 'analyses')
+
+# Indexes created on each partitioned parent (and so on every partition).
+# Single-column date B-trees are dropped: the (date, id) keyset B-trees lead
+# with the date. created_at gets a BRIN, which stays tiny and cheap to
+# maintain on append-mostly data.
+PARTITION_INDEXES = {
+    'transcripts': [
+        "CREATE INDEX IF NOT EXISTS idx_transcripts_date_id ON earnings.transcripts (transcript_date, id)",
+        "CREATE INDEX IF NOT EXISTS idx_transcripts_ticker_date_id ON earnings.transcripts (ticker, transcript_date, id)",
+        "CREATE INDEX IF NOT EXISTS brin_transcripts_created_at ON earnings.transcripts USING BRIN (created_at)",
+        "CREATE INDEX IF NOT EXISTS idx_transcripts_search_vector ON earnings.transcripts USING GIN (search_vector)",
+    ],
+    'analyses': [
+        "CREATE INDEX IF NOT EXISTS idx_analyses_transcript_id ON earnings.analyses (transcript_id, year)",
+        "CREATE INDEX IF NOT EXISTS idx_analyses_ticker_quarter_year ON earnings.analyses (ticker, quarter, year)",
+        "CREATE INDEX IF NOT EXISTS idx_analyses_date_id ON earnings.analyses (analysis_date, id)",
+        "CREATE INDEX IF NOT EXISTS idx_analyses_ticker_date_id ON earnings.analyses (ticker, analysis_date, id)",
+        "CREATE INDEX IF NOT EXISTS brin_analyses_created_at ON earnings.analyses USING BRIN (created_at)",
+        "CREATE INDEX IF NOT EXISTS idx_analyses_search_vector ON earnings.analyses USING GIN (search_vector)",
+        "CREATE INDEX IF NOT EXISTS idx_analyses_analysis_json ON earnings.analyses USING GIN (analysis_json jsonb_path_ops)",
+        "CREATE INDEX IF NOT EXISTS idx_analyses_guidance_date ON earnings.analyses ((analysis_json ->> 'guidance_direction'), analysis_date, id)",
+    ],
+}
+
+# Installed by sql/database_stats.sql
+DATABASE_STATS_TRIGGERS = ('database_stats_insert', 'database_stats_delete', 'database_stats_truncate')
+
+
+def is_partitioned(conn: Connection, table: str) -> bool:
+    """Whether earnings.<table> is a partitioned table"""
+    return conn.execute(text("""
+        SELECT c.relkind = 'p'
+        FROM pg_class c JOIN pg_namespace n ON n.oid = c.relnamespace
+        WHERE n.nspname = :schema AND c.relname = :table
+    """), {'schema': SCHEMA, 'table': table}).scalar() is True
+
+
+def year_partitions(conn: Connection, table: str) -> List[int]:
+    """Years that have their own partition of earnings.<table>"""
+    names = conn.execute(text("""
+        SELECT child.relname
+        FROM pg_inherits i
+        JOIN pg_class parent ON parent.oid = i.inhparent
+        JOIN pg_class child ON child.oid = i.inhrelid
+        JOIN pg_namespace n ON n.oid = parent.relnamespace
+        WHERE n.nspname = :schema AND parent.relname = :table
+    """), {'schema': SCHEMA, 'table': table}).scalars()
+    prefix = f"{table}_y"
+    return sorted(int(name[len(prefix):]) for name in names if name.startswith(prefix))
+
+
+def _column_list(conn: Connection, table: str) -> List[str]:
+    """Insertable (non-generated) columns of a table, in order"""
+    return list(conn.execute(text("""
+        SELECT column_name
+        FROM information_schema.columns
+        WHERE table_schema = :schema AND table_name = :table AND is_generated = 'NEVER'
+        ORDER BY ordinal_position
+    """), {'schema': SCHEMA, 'table': table}).scalars())
+
+
+def _dependent_views(conn: Connection, tables: Iterable[str]) -> Dict[str, str]:
+    """Definitions of earnings views that read any of the given tables"""
+    rows = conn.execute(text("""
+        SELECT DISTINCT v.relname, pg_get_viewdef(v.oid)
+        FROM pg_depend d
+        JOIN pg_rewrite r ON r.oid = d.objid
+        JOIN pg_class v ON v.oid = r.ev_class
+        JOIN pg_class t ON t.oid = d.refobjid
+        JOIN pg_namespace n ON n.oid = t.relnamespace
+        WHERE n.nspname = :schema AND t.relname = ANY(:tables) AND v.relkind = 'v'
+    """), {'schema': SCHEMA, 'tables': list(tables)}).all()
+    return {name: definition for name, definition in rows}
+
+
+def _create_year_partition(conn: Connection, table: str, year: int) -> None:
+    conn.execute(text(
+        f"CREATE TABLE IF NOT EXISTS {SCHEMA}.{table}_y{year} "
+        f"PARTITION OF {SCHEMA}.{table} FOR VALUES FROM ({year}) TO ({year + 1})"
+    ))
+
+
+def ensure_year_partitions(engine: Engine, years: Iterable[int]) -> List[str]:
+    """
+    Create missing year partitions (e.g. ahead of a new earnings season)
+
+    Args:
+        engine: SQLAlchemy engine
+        years: Years that need their own partition
+
+    Returns:
+        Names of the partitions created
+
+    Raises:
+        ValueError: If the tables are not partitioned, or the default
+            partition already holds rows for a requested year
+    """
+    created = []
+    with engine.begin() as conn:
+        for table in PARTITIONED_TABLES:
+            if not is_partitioned(conn, table):
+                raise ValueError(f"{SCHEMA}.{table} is not partitioned; run migrate_to_partitioned first")
+
+            existing = set(year_partitions(conn, table))
+            for year in sorted(set(int(y) for y in years) - existing):
+                in_default = conn.execute(text(
+                    f"SELECT EXISTS (SELECT 1 FROM {SCHEMA}.{table}_default WHERE year = :year)"
+                ), {'year': year}).scalar()
+                if in_default:
+                    raise ValueError(
+                        f"{SCHEMA}.{table}_default already holds rows for {year}; "
+                        "move them out before creating the partition"
+                    )
+                _create_year_partition(conn, table, year)
+                created.append(f"{table}_y{year}")
+
+    return created
+
+
+def migrate_to_partitioned(engine: Engine,
+                           start_year: Optional[int] = None,
+                           end_year: Optional[int] = None,
+                           keep_legacy: bool = True) -> Dict[str, int]:
+    """
+    Convert earnings.transcripts and earnings.analyses to year-partitioned tables
+
+    Runs in a single transaction: the current tables are renamed to
+    <table>_legacy (with their indexes), partitioned copies are created with
+    one partition per year plus a default partition, rows are copied over, and
+    dependent views are re-pointed to the new tables. Sequences carry over, so
+    IDs are unchanged.
+
+    Args:
+        engine: SQLAlchemy engine
+        start_year: First year partition (default: earliest year in the data)
+        end_year: Last year partition (default: latest year in the data + 2)
+        keep_legacy: Keep the <table>_legacy copies (drop them if False)
+
+    Returns:
+        Rows copied per table
+
+    Raises:
+        ValueError: If the tables are already partitioned, or an analysis
+            references a transcript of another year
+    """
+    copied = {}
+
+    with engine.begin() as conn:
+        for table in PARTITIONED_TABLES:
+            if is_partitioned(conn, table):
+                raise ValueError(f"{SCHEMA}.{table} is already partitioned")
+
+        # The (transcript_id, year) foreign key needs each analysis to share
+        # its transcript's year; such rows are left for the operator to fix
+        mismatched = conn.execute(text(f"""
+            SELECT count(*) FROM {SCHEMA}.analyses a
+            JOIN {SCHEMA}.transcripts t ON t.id = a.transcript_id
+            WHERE t.year <> a.year
+        """)).scalar()
+        if mismatched:
+            raise ValueError(
+                f"{mismatched} analyses reference a transcript of another year; "
+                "correct their transcript_id or year before partitioning"
+            )
+
+        bounds = conn.execute(text(
+            f"SELECT min(year), max(year) FROM (SELECT year FROM {SCHEMA}.transcripts "
+            f"UNION ALL SELECT year FROM {SCHEMA}.analyses) y"
+        )).one()
+        first = start_year or bounds[0] or conn.execute(text("SELECT extract(year FROM now())::int")).scalar()
+        last = end_year or (bounds[1] or first) + 2
+
+        views = _dependent_views(conn, PARTITIONED_TABLES)
+
+        # Move the current tables (and their index/constraint names) aside
+        for table in PARTITIONED_TABLES:
+            legacy = f"{table}_legacy"
+            conn.execute(text(f"ALTER TABLE {SCHEMA}.{table} RENAME TO {legacy}"))
+            indexes = conn.execute(text(
+                "SELECT indexname FROM pg_indexes WHERE schemaname = :schema AND tablename = :table"
+            ), {'schema': SCHEMA, 'table': legacy}).scalars().all()
+            for index in indexes:
+                conn.execute(text(f'ALTER INDEX {SCHEMA}."{index}" RENAME TO "{index[:56]}_legacy"'))
+
+        for table in PARTITIONED_TABLES:
+            legacy = f"{table}_legacy"
+            conn.execute(text(f"""
+                CREATE TABLE {SCHEMA}.{table} (
+                    LIKE {SCHEMA}.{legacy} INCLUDING DEFAULTS INCLUDING GENERATED INCLUDING CONSTRAINTS
+                ) PARTITION BY RANGE (year)
+            """))
+
+            # The id sequence now belongs to the new table
+            sequence = conn.execute(text("SELECT pg_get_serial_sequence(:table, 'id')"),
+                                    {'table': f"{SCHEMA}.{legacy}"}).scalar()
+            if sequence:
+                conn.execute(text(f"ALTER SEQUENCE {sequence} OWNED BY {SCHEMA}.{table}.id"))
+
+            for year in range(first, last + 1):
+                _create_year_partition(conn, table, year)
+            conn.execute(text(f"CREATE TABLE {SCHEMA}.{table}_default PARTITION OF {SCHEMA}.{table} DEFAULT"))
+
+        # Keys must include the partition column
+        conn.execute(text(f"ALTER TABLE {SCHEMA}.transcripts ADD CONSTRAINT transcripts_pkey PRIMARY KEY (id, year)"))
+        conn.execute(text(
+            f"ALTER TABLE {SCHEMA}.transcripts ADD CONSTRAINT uq_transcript_ticker_quarter_year UNIQUE (ticker, quarter, year)"
+        ))
+        conn.execute(text(f"ALTER TABLE {SCHEMA}.analyses ADD CONSTRAINT analyses_pkey PRIMARY KEY (id, year)"))
+
+        for table in PARTITIONED_TABLES:
+            columns = ', '.join(_column_list(conn, f"{table}_legacy"))
+            result = conn.execute(text(
+                f"INSERT INTO {SCHEMA}.{table} ({columns}) SELECT {columns} FROM {SCHEMA}.{table}_legacy"
+            ))
+            copied[table] = result.rowcount
+
+        # Added after the copy so it is validated once rather than row by row
+        conn.execute(text(f"""
+            ALTER TABLE {SCHEMA}.analyses ADD CONSTRAINT analyses_transcript_fkey
+                FOREIGN KEY (transcript_id, year) REFERENCES {SCHEMA}.transcripts (id, year) ON DELETE CASCADE
+        """))
+
+        for table in PARTITIONED_TABLES:
+            for statement in PARTITION_INDEXES[table]:
+                conn.execute(text(statement))
+
+            has_trigger_function = conn.execute(text(
+                "SELECT to_regproc('earnings.update_updated_at_column') IS NOT NULL"
+            )).scalar()
+            if has_trigger_function:
+                conn.execute(text(f"""
+                    CREATE TRIGGER update_{table}_updated_at
+                        BEFORE UPDATE ON {SCHEMA}.{table}
+                        FOR EACH ROW
+                        EXECUTE FUNCTION earnings.update_updated_at_column()
+                """))
+
+        # Stats triggers stay on the renamed tables; move them to the new ones
+        # (re-running the script also recomputes the counters)
+        has_stats = conn.execute(text("SELECT to_regclass('earnings.database_stats') IS NOT NULL")).scalar()
+        if has_stats:
+            for table in PARTITIONED_TABLES:
+                for trigger in DATABASE_STATS_TRIGGERS:
+                    conn.execute(text(f"DROP TRIGGER IF EXISTS {trigger} ON {SCHEMA}.{table}_legacy"))
+            run_sql_file(conn, 'database_stats.sql')
+
+        # Views were bound to the renamed tables; re-create them against the new ones
+        for name, definition in views.items():
+            conn.execute(text(f"CREATE OR REPLACE VIEW {SCHEMA}.{name} AS {definition}"))
+
+        if not keep_legacy:
+            conn.execute(text(f"DROP TABLE {SCHEMA}.analyses_legacy, {SCHEMA}.transcripts_legacy"))
+
+    with engine.connect() as conn:
+        conn = conn.execution_options(isolation_level='AUTOCOMMIT')
+        for table in PARTITIONED_TABLES:
+            conn.execute(text(f"ANALYZE {SCHEMA}.{table}"))
+
+    return copied
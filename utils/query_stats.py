@@ -0,0 +1,294 @@
+"""
+Query Statistics
+SQLAlchemy event hooks that time every statement and log slow queries
+
+Statements are grouped by fingerprint (the SQL with parameters and literal
+values replaced by ?, and multi-row VALUES lists collapsed), and each
+fingerprint keeps its count, total and p95 time and rows returned.
+Statements slower than the threshold go to a slow-query log together with
+their EXPLAIN plan.
+
+Usage:
+    db = Database()                     # instrumented automatically
+    print(db.query_stats.summary())     # everything since startup
+
+    with track() as page_stats:         # only the queries in this block
+        render_page(db)
+    print(page_stats.summary())
+"""
+
+import json
+import os
+import re
+import threading
+import time
+from collections import deque
+from contextlib import contextmanager
+from contextvars import ContextVar
+from datetime import datetime, timezone
+from functools import lru_cache
+from typing import Any, Deque, Dict, Iterator, List, Optional, Tuple
+
+import pandas as pd
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+
+# Statements slower than this (milliseconds) are logged with their plan
+DEFAULT_SLOW_QUERY_MS = 500.0
+
+# Timings kept per fingerprint for the p95
+MAX_SAMPLES = 1000
+
+# Longer statements (multi-row VALUES inserts) are fingerprinted without the
+# cache, so it never keeps them in memory
+MAX_CACHED_STATEMENT = 2000
+
+_active_trackers: ContextVar[Tuple['QueryStats', ...]] = ContextVar('query_stats_trackers', default=())
+
+
+_PARAM = re.compile(r"%\(\w+\)s|%s|\$\d+|(?<!:):\w+|\?")
+_STRING = re.compile(r"'(?:[^']|'')*'")
+_NUMBER = re.compile(r"\b\d+(?:\.\d+)?\b")
+_VALUES_LIST = re.compile(r"\(\s*\?(?:\s*,\s*\?)*\s*\)(?:\s*,\s*\(\s*\?(?:\s*,\s*\?)*\s*\))+")
+_IN_LIST = re.compile(r"\bIN\s*\(\s*\?(?:\s*,\s*\?)*\s*\)", re.IGNORECASE)
+_WHITESPACE = re.compile(r"\s+")
+
+
+def _normalize(statement: str) -> str:
+    sql = _STRING.sub('?', statement)
+    sql = _PARAM.sub('?', sql)
+    sql = _NUMBER.sub('?', sql)
+    sql = _VALUES_LIST.sub('(...)', sql)
+    sql = _IN_LIST.sub('IN (...)', sql)
+    return _WHITESPACE.sub(' ', sql).strip()
+
+
+_normalize_cached = lru_cache(maxsize=2048)(_normalize)
+
+
+def fingerprint(statement: str) -> str:
+    """
+    Normalize a SQL statement so executions that differ only in parameters,
+    literal values or VALUES/IN list length share one entry
+    """
+    if len(statement) > MAX_CACHED_STATEMENT:
+        return _normalize(statement)
+    return _normalize_cached(statement)
+
+
+def _p95(samples) -> float:
+    ordered = sorted(samples)
+    if not ordered:
+        return 0.0
+    return ordered[min(len(ordered) - 1, int(round(0.95 * (len(ordered) - 1))))]
+
+
+class QueryStats:
+    """Per-fingerprint statement timings and a slow-query log"""
+
+    def __init__(self, slow_query_ms: Optional[float] = None, log_path: Optional[str] = None,
+                 max_slow_queries: int = 100):
+        """
+        Initialize an empty collector
+
+        Args:
+            slow_query_ms: Slow-query threshold (default: SLOW_QUERY_MS
+                environment variable, else 500)
+            log_path: Append slow queries to this JSON-lines file (default:
+                SLOW_QUERY_LOG environment variable, else no file)
+            max_slow_queries: Slow queries kept in memory
+        """
+        self.slow_query_ms = float(slow_query_ms if slow_query_ms is not None
+                                   else os.getenv('SLOW_QUERY_MS', DEFAULT_SLOW_QUERY_MS))
+        self.log_path = log_path if log_path is not None else os.getenv('SLOW_QUERY_LOG')
+        self.slow_queries: Deque[Dict[str, Any]] = deque(maxlen=max_slow_queries)
+        self._stats: Dict[str, Dict[str, Any]] = {}
+        self._lock = threading.Lock()
+
+    def record(self, statement: str, elapsed_ms: float, rows: int) -> None:
+        """Add one execution to its fingerprint's totals"""
+        key = fingerprint(statement)
+        with self._lock:
+            entry = self._stats.get(key)
+            if entry is None:
+                entry = self._stats[key] = {
+                    'count': 0, 'total_ms': 0.0, 'max_ms': 0.0, 'rows': 0,
+                    'samples': deque(maxlen=MAX_SAMPLES)
+                }
+            entry['count'] += 1
+            entry['total_ms'] += elapsed_ms
+            entry['max_ms'] = max(entry['max_ms'], elapsed_ms)
+            entry['rows'] += max(rows, 0)
+            entry['samples'].append(elapsed_ms)
+
+    def log_slow_query(self, statement: str, parameters: Any, elapsed_ms: float,
+                       rows: int, plan: Optional[List[str]]) -> None:
+        """Record a slow statement (and append it to log_path if configured)"""
+        entry = {
+            'timestamp': datetime.now(timezone.utc).isoformat(),
+            'elapsed_ms': round(elapsed_ms, 2),
+            'rows': rows,
+            'fingerprint': fingerprint(statement),
+            'statement': statement,
+            'parameters': repr(parameters)[:1000],
+            'plan': plan
+        }
+        with self._lock:
+            self.slow_queries.append(entry)
+            if self.log_path:
+                directory = os.path.dirname(self.log_path)
+                if directory:
+                    os.makedirs(directory, exist_ok=True)
+                with open(self.log_path, 'a', encoding='utf-8') as f:
+                    f.write(json.dumps(entry) + '\n')
+
+        print(f"Slow query ({elapsed_ms:.0f} ms, {rows} rows): {entry['fingerprint'][:200]}")
+
+    def summary(self) -> pd.DataFrame:
+        """
+        Statement totals, slowest first
+
+        Returns:
+            DataFrame with fingerprint, count, total_ms, mean_ms, p95_ms,
+            max_ms and rows
+        """
+        with self._lock:
+            records = [{
+                'fingerprint': key,
+                'count': entry['count'],
+                'total_ms': round(entry['total_ms'], 2),
+                'mean_ms': round(entry['total_ms'] / entry['count'], 2),
+                'p95_ms': round(_p95(entry['samples']), 2),
+                'max_ms': round(entry['max_ms'], 2),
+                'rows': entry['rows']
+            } for key, entry in self._stats.items()]
+
+        columns = ['fingerprint', 'count', 'total_ms', 'mean_ms', 'p95_ms', 'max_ms', 'rows']
+        df = pd.DataFrame(records, columns=columns)
+        return df.sort_values('total_ms', ascending=False, ignore_index=True)
+
+    def totals(self) -> Dict[str, float]:
+        """Number of statements and total time across all fingerprints"""
+        with self._lock:
+            return {
+                'queries': sum(entry['count'] for entry in self._stats.values()),
+                'total_ms': round(sum(entry['total_ms'] for entry in self._stats.values()), 2)
+            }
+
+    def reset(self) -> None:
+        """Clear timings and the slow-query log"""
+        with self._lock:
+            self._stats.clear()
+            self.slow_queries.clear()
+
+
+def _explain(conn, statement: str, parameters: Any) -> Optional[List[str]]:
+    """
+    EXPLAIN (without ANALYZE) a statement on the connection that ran it,
+    inside a savepoint so a failed EXPLAIN cannot abort the transaction
+
+    Never raises: the statement being explained already succeeded, and a
+    diagnostic failure must not surface in the caller's query.
+    """
+    try:
+        explain_cursor = conn.connection.cursor()
+    except Exception as e:
+        print(f"Slow query EXPLAIN skipped: {e}")
+        return None
+
+    try:
+        explain_cursor.execute("SAVEPOINT query_stats_explain")
+    except Exception as e:
+        print(f"Slow query EXPLAIN skipped: {e}")
+        _close_quietly(explain_cursor)
+        return None
+
+    try:
+        explain_cursor.execute(f"EXPLAIN {statement}", parameters)
+        plan = [row[0] for row in explain_cursor.fetchall()]
+        explain_cursor.execute("RELEASE SAVEPOINT query_stats_explain")
+        return plan
+    except Exception as e:
+        try:
+            explain_cursor.execute("ROLLBACK TO SAVEPOINT query_stats_explain")
+        except Exception as rollback_error:
+            print(f"Error rolling back slow query EXPLAIN: {rollback_error}")
+        return [f"EXPLAIN failed: {e}"]
+    finally:
+        _close_quietly(explain_cursor)
+
+
+def _close_quietly(cursor) -> None:
+    try:
+        cursor.close()
+    except Exception as e:
+        print(f"Error closing EXPLAIN cursor: {e}")
+
+
+def instrument(engine: Engine, stats: Optional[QueryStats] = None) -> QueryStats:
+    """
+    Time every statement executed through an engine
+
+    Args:
+        engine: SQLAlchemy engine (for AsyncEngine, pass engine.sync_engine)
+        stats: Collector for the engine-wide totals (created if None)
+
+    Returns:
+        The engine-wide QueryStats
+    """
+    stats = stats or QueryStats()
+    explain_plans = engine.dialect.name == 'postgresql'
+
+    @event.listens_for(engine, 'before_cursor_execute')
+    def before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+        conn.info.setdefault('query_start_time', []).append(time.perf_counter())
+
+    @event.listens_for(engine, 'handle_error')
+    def handle_error(exception_context):
+        conn = exception_context.connection
+        if conn is not None and conn.info.get('query_start_time'):
+            conn.info['query_start_time'].pop()
+
+    @event.listens_for(engine, 'after_cursor_execute')
+    def after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+        started = conn.info['query_start_time'].pop()
+        elapsed_ms = (time.perf_counter() - started) * 1000
+        rows = cursor.rowcount if cursor.rowcount is not None else -1
+
+        collectors = (stats, *_active_trackers.get())
+        for collector in collectors:
+            collector.record(statement, elapsed_ms, rows)
+
+        slow = [collector for collector in collectors if elapsed_ms >= collector.slow_query_ms]
+        if slow:
+            plan = None
+            if explain_plans and not executemany and statement.lstrip().upper().startswith(('SELECT', 'WITH')):
+                plan = _explain(conn, statement, parameters)
+            for collector in slow:
+                try:
+                    collector.log_slow_query(statement, parameters, elapsed_ms, rows, plan)
+                except Exception as e:
+                    print(f"Error logging slow query: {e}")
+
+    return stats
+
+
+@contextmanager
+def track(slow_query_ms: Optional[float] = None) -> Iterator[QueryStats]:
+    """
+    Collect the statements run in this block (and this thread or task) only,
+    e.g. one Streamlit page run or one batch job
+
+    Args:
+        slow_query_ms: Slow-query threshold for this block (see QueryStats)
+
+    Yields:
+        QueryStats for the block
+    """
+    stats = QueryStats(slow_query_ms=slow_query_ms, log_path='')
+    token = _active_trackers.set(_active_trackers.get() + (stats,))
+    try:
+        yield stats
+    finally:
+        _active_trackers.reset(token)
@@ -1,10 +1,39 @@
 """
 Score Extraction Utility
-Extracts score and justification from analysis markdown
+Extracts score, justification and structured fields from analysis markdown
 """
 
 import re
-from typing import Tuple, Optional
+import unicodedata
+from typing import Any, Dict, List, Tuple, Optional
+
+
+# Keys written to analyses.analysis_json by extract_analysis_fields
+ANALYSIS_FIELDS = ('score', 'guidance_direction', 'eps_beat', 'revenue_beat', 'key_risks')
+
+GUIDANCE_DIRECTIONS = ('raised', 'lowered', 'maintained', 'mixed')
+
+# Guidance item wording, checked before the item's emoji
+GUIDANCE_WORDS = {
+    'raised': r'\b(?:rais|increas|lift|boost|upgrad)\w*',
+    'lowered': r'\b(?:lower|cut|reduc|slash|withdr[ae]w|downgrad)\w*',
+    'maintained': r'\b(?:maintain|reaffirm|reiterat|unchanged|held|kept)\w*',
+}
+
+# Emoji markers used by the analysis template's guidance items
+GUIDANCE_MARKERS = {'🟢': 'raised', '🔴': 'lowered', '⚪': 'maintained', '🟡': 'maintained'}
+
+METRIC_PATTERNS = {
+    'eps_beat': r'\bEPS\b|earnings per share|bottom[- ]line',
+    'revenue_beat': r'\brevenues?\b|\bsales\b|top[- ]line',
+}
+
+BEAT_PATTERN = (r'\b(?:beat|beats|beating|exceed\w*|surpass\w*|topp(?:ed|ing)|outperform\w*|'
+                r'(?:ahead of|above) (?:expectations|estimates|consensus|guidance))\b')
+MISS_PATTERN = (r'\b(?:miss|missed|misses|missing|fell short|short of|shortfall|'
+                r'below (?:expectations|estimates|consensus|guidance))\b')
+
+MAX_KEY_RISKS = 10
 
 
 def extract_score_from_analysis(analysis_text: str) -> Tuple[Optional[int], Optional[str]]:
@@ -58,6 +87,135 @@ def extract_score_from_analysis(analysis_text: str) -> Tuple[Optional[int], Opti
     return score, justification
 
 
+def _normalize(analysis_text: str) -> str:
+    """NFKC-normalize (the template's bold Unicode headings become plain text)"""
+    if unicodedata.is_normalized('NFKC', analysis_text):
+        return analysis_text
+    return unicodedata.normalize('NFKC', analysis_text)
+
+
+def _sections(analysis_text: str) -> Dict[str, str]:
+    """
+    Split analysis markdown into "## " sections keyed by their plain-text
+    heading (the template's bold Unicode headings are NFKC-normalized)
+    """
+    sections = {}
+    parts = re.split(r'^##\s+(.+)$', _normalize(analysis_text), flags=re.MULTILINE)
+    for heading, body in zip(parts[1::2], parts[2::2]):
+        sections[heading.strip().lower()] = body.split('\n---', 1)[0]
+    return sections
+
+
+def _find_section(sections: Dict[str, str], keyword: str) -> str:
+    """Body of the first section whose heading contains keyword ('' if none)"""
+    return next((body for heading, body in sections.items() if keyword in heading), '')
+
+
+def _items(section: str, marker: str) -> List[str]:
+    """Lines of a section starting with marker (an emoji or bullet)"""
+    return [line.strip()[len(marker):].strip() for line in section.splitlines() if line.strip().startswith(marker)]
+
+
+def _title(item: str) -> str:
+    """Bold title of a "**Title**: text" item, or the whole item"""
+    match = re.match(r'\*\*(.+?)\*\*', item)
+    return (match.group(1) if match else item).strip().rstrip(':').strip()
+
+
+def extract_guidance_direction(analysis_text: str) -> Optional[str]:
+    """
+    Overall guidance direction from the Guidance section
+
+    Each guidance item counts as raised, lowered or maintained by its
+    wording, or by its 🟢/🔴/⚪ marker when the wording says neither.
+
+    Returns:
+        'raised', 'lowered', 'maintained', 'mixed' (raised and lowered items),
+        or None when there is no guidance section
+    """
+    section = _find_section(_sections(analysis_text), 'guidance')
+    found = set()
+    for line in section.splitlines():
+        line = line.strip()
+        marker = next((m for m in GUIDANCE_MARKERS if line.startswith(m)), None)
+        if marker is None and not line.startswith(('*', '-')):
+            continue
+        direction = next((d for d, pattern in GUIDANCE_WORDS.items() if re.search(pattern, line, re.IGNORECASE)), None)
+        found.add(direction or GUIDANCE_MARKERS.get(marker))
+    found.discard(None)
+
+    if {'raised', 'lowered'} <= found:
+        return 'mixed'
+    for direction in ('raised', 'lowered', 'maintained'):
+        if direction in found:
+            return direction
+    return None
+
+
+def extract_beat(analysis_text: str, metric: str) -> Optional[bool]:
+    """
+    Whether the analysis reports a beat (True) or a miss (False) for a metric
+
+    Looks for sentences mentioning the metric together with beat/miss
+    wording and takes the wording nearest to the metric.
+
+    Args:
+        analysis_text: Full analysis markdown text
+        metric: 'eps_beat' or 'revenue_beat'
+
+    Returns:
+        True, False, or None when the analysis does not say
+    """
+    text = _normalize(analysis_text)
+    for sentence in re.split(r'(?<=[.!?])\s+|\n+', text):
+        mentions = [m.start() for m in re.finditer(METRIC_PATTERNS[metric], sentence, re.IGNORECASE)]
+        if not mentions:
+            continue
+        verdicts = [(m.start(), True) for m in re.finditer(BEAT_PATTERN, sentence, re.IGNORECASE)]
+        verdicts += [(m.start(), False) for m in re.finditer(MISS_PATTERN, sentence, re.IGNORECASE)]
+        if verdicts:
+            return min(verdicts, key=lambda v: min(abs(v[0] - pos) for pos in mentions))[1]
+    return None
+
+
+def extract_key_risks(analysis_text: str) -> List[str]:
+    """
+    Key risks: Bear Case bullet points and 🔴 theme and guidance titles
+    """
+    sections = _sections(analysis_text)
+    bear = _find_section(sections, 'bear case')
+    risks = _items(bear, '- ') + _items(bear, '* ')
+    for keyword in ('themes', 'guidance'):
+        risks += [_title(item) for item in _items(_find_section(sections, keyword), '🔴')]
+
+    unique = list(dict.fromkeys(risk for risk in risks if risk))
+    return unique[:MAX_KEY_RISKS]
+
+
+def extract_analysis_fields(analysis_text: str, score: Optional[int] = None) -> Dict[str, Any]:
+    """
+    Structured fields of an analysis, stored in analyses.analysis_json
+
+    Args:
+        analysis_text: Full analysis markdown text
+        score: Score, if already known (otherwise extracted from the text)
+
+    Returns:
+        Dict with the ANALYSIS_FIELDS keys (None/[] when not found)
+    """
+    if score is None:
+        score, _ = extract_score_from_analysis(analysis_text)
+    analysis_text = _normalize(analysis_text)
+
+    return {
+        'score': score,
+        'guidance_direction': extract_guidance_direction(analysis_text),
+        'eps_beat': extract_beat(analysis_text, 'eps_beat'),
+        'revenue_beat': extract_beat(analysis_text, 'revenue_beat'),
+        'key_risks': extract_key_risks(analysis_text)
+    }
+
+
 def validate_score(score: int) -> bool:
     """
     Validate that score is in valid range
@@ -0,0 +1,127 @@
+"""
+Shared Database Handles
+Process-wide Database and DatabaseUtil instances for the Streamlit pages
+
+Streamlit re-runs a page script on every interaction, and every session runs
+its own copy, so a Database() or DatabaseUtil() built in the script means a
+new engine, connection pool and migration check per rerun. The getters here
+are st.cache_resource functions: the handle is created lazily by the first
+caller (Streamlit locks the cache entry, so concurrent sessions wait for it
+rather than building their own), then shared by every session and rerun of
+the process, which keep reusing its warm pooled connections.
+
+Handles are closed when their cache entry is released (st.cache_resource.clear()
+or a code change) and at interpreter exit.
+
+Usage:
+    db = get_database()               # PostgreSQL, or None without DB_URL
+    scores_db = get_database_util()   # SQLite scores database
+    engine = get_analytics_engine()   # DuckDB over the SQLite snapshot
+"""
+
+import atexit
+import os
+import threading
+from typing import Any, Dict, Optional
+
+import streamlit as st
+
+from utils.db_util import DatabaseUtil
+
+
+DEFAULT_SQLITE_PATH = "data/earnings_analysis.db"
+
+# Handles created in this process, closed at exit
+_open_handles: Dict[int, Any] = {}
+_open_handles_lock = threading.Lock()
+
+
+def _track(handle):
+    """Register a new handle for close_all()"""
+    with _open_handles_lock:
+        _open_handles[id(handle)] = handle
+    return handle
+
+
+def _release(handle) -> None:
+    """st.cache_resource on_release callback: close the evicted handle"""
+    if handle is None:
+        return
+    with _open_handles_lock:
+        _open_handles.pop(id(handle), None)
+    handle.close()
+
+
+@atexit.register
+def close_all() -> None:
+    """Close every handle still open (pooled PostgreSQL and SQLite connections)"""
+    with _open_handles_lock:
+        handles = list(_open_handles.values())
+        _open_handles.clear()
+    for handle in handles:
+        try:
+            handle.close()
+        except Exception as e:
+            print(f"Error closing database handle: {e}")
+
+
+@st.cache_resource(show_spinner=False, on_release=_release)
+def get_database(db_url: Optional[str] = None):
+    """
+    Shared PostgreSQL handle (one engine pair and pool per process)
+
+    Args:
+        db_url: PostgreSQL connection URL. If None, reads DB_URL
+
+    Returns:
+        utils.database.Database, or None when no URL is configured
+    """
+    if not (db_url or os.getenv('DB_URL')):
+        return None
+    from utils.database import Database
+    return _track(Database(db_url))
+
+
+@st.cache_resource(show_spinner=False, on_release=_release)
+def get_database_util(db_path: str = DEFAULT_SQLITE_PATH) -> DatabaseUtil:
+    """
+    Shared SQLite scores database (one connection per script thread)
+
+    Args:
+        db_path: Path to SQLite database file
+    """
+    return _track(DatabaseUtil(db_path))
+
+
+@st.cache_resource(show_spinner=False, on_release=_release)
+def get_analytics_engine(snapshot_path: Optional[str] = None):
+    """
+    Shared DuckDB analytics engine (one in-memory copy of the snapshot per process)
+
+    Args:
+        snapshot_path: Parquet snapshot to query. If None, the SQLite scores
+            database snapshot (utils.analytics.SQLITE_SNAPSHOT_PATH)
+    """
+    from utils.analytics import AnalyticsEngine, SQLITE_SNAPSHOT_PATH
+    return _track(AnalyticsEngine(snapshot_path or SQLITE_SNAPSHOT_PATH))
+
+
+def get_connection_health() -> Dict[str, Dict[str, Any]]:
+    """
+    Pool and connection metrics of the handles open in this process
+
+    Returns:
+        {'postgres:write': {...}, 'postgres:read': {...}, 'sqlite:<path>': {...}},
+        see Database.get_pool_status() and DatabaseUtil.get_connection_status()
+    """
+    with _open_handles_lock:
+        handles = list(_open_handles.values())
+
+    health = {}
+    for handle in handles:
+        if isinstance(handle, DatabaseUtil):
+            health[f"sqlite:{handle.db_path}"] = handle.get_connection_status()
+        elif hasattr(handle, 'get_pool_status'):
+            for role, status in handle.get_pool_status().items():
+                health[f"postgres:{role}"] = status
+    return health
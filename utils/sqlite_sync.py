@@ -0,0 +1,282 @@
+"""
+SQLite Sync
+Streams the SQLite scores database (utils.db_util.DatabaseUtil) into PostgreSQL
+
+SQLite price_movements rows are upserted into earnings.price_movements and
+scores rows become earnings.analyses rows (one per ticker, quarter, year and
+analysis timestamp, with the markdown taken from analysis_metadata when the
+file is still on disk). SQLite holds no transcript text, so analyses are
+linked to PostgreSQL transcripts by ticker, quarter and year.
+
+Rows are read in (updated_at, id) order and written in batches; after
+each batch the position is stored in earnings.sync_watermarks, so memory use
+is bounded by the batch size, an interrupted run resumes where it stopped
+and later runs only copy new or changed rows.
+
+Usage:
+    sync = SQLiteSync(Database(), "data/earnings_analysis.db")
+    print(sync.sync())        # {'price_movements': 120, 'scores': 480}
+"""
+
+import os
+import sqlite3
+from datetime import datetime
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Optional
+
+import pandas as pd
+from sqlalchemy import insert, select, text, tuple_, update
+
+from utils.database import Database
+from utils.db_util import DatabaseUtil
+from utils.models import Analysis, Transcript
+from utils.score_extractor import extract_analysis_fields
+
+
+# Synced in this order, so analyses find their price movements when
+# analysis_performance_facts are refreshed
+SYNC_TABLES = ('price_movements', 'scores')
+
+# Analysis columns compared to skip unchanged rows on re-sync
+COMPARED_COLUMNS = ('score', 'score_justification', 'provider', 'model', 'analysis_type')
+
+# Keyset queries: rows after the watermark, in watermark order. Both tables
+# are upserted in place, so rows are tracked by updated_at (second
+# resolution, see read_batches) and id.
+READ_QUERIES = {
+    'price_movements': """
+        SELECT * FROM price_movements
+        WHERE (updated_at, id) > (?, ?)
+        ORDER BY updated_at, id
+    """,
+    'scores': """
+        SELECT s.*, m.analysis_file_path, m.financial_context_included
+        FROM scores s
+        LEFT JOIN analysis_metadata m ON m.id = (
+            SELECT MAX(id) FROM analysis_metadata
+            WHERE ticker = s.ticker AND quarter = s.quarter AND year = s.year
+        )
+        WHERE (s.updated_at, s.id) > (?, ?)
+        ORDER BY s.updated_at, s.id
+    """,
+}
+
+
+def read_batches(conn: sqlite3.Connection, table: str, watermark: Dict[str, Any],
+                 batch_size: int = 5000) -> Iterator[List[sqlite3.Row]]:
+    """
+    Stream the rows of a SQLite table changed since a watermark
+
+    Args:
+        conn: SQLite connection (row_factory sqlite3.Row)
+        table: One of SYNC_TABLES
+        watermark: Dict with last_updated_at (rows from that second on are read)
+        batch_size: Rows per batch
+
+    Yields:
+        Lists of at most batch_size rows
+    """
+    # -1 so rows sharing the watermark's second are re-read (upserts are idempotent)
+    params = (watermark.get('last_updated_at') or '', -1)
+    cursor = conn.execute(READ_QUERIES[table], params)
+    try:
+        while True:
+            rows = cursor.fetchmany(batch_size)
+            if not rows:
+                break
+            yield rows
+    finally:
+        cursor.close()
+
+
+def _as_aware(value: Any) -> Optional[datetime]:
+    """SQLite timestamps are naive local time; make them timezone-aware"""
+    if value is None:
+        return None
+    if not isinstance(value, datetime):
+        value = datetime.fromisoformat(str(value))
+    return value.astimezone()
+
+
+def analysis_row(score: sqlite3.Row) -> Dict[str, Any]:
+    """
+    Map a SQLite scores row (joined with analysis_metadata) to an
+    earnings.analyses row
+    """
+    markdown = None
+    path = score['analysis_file_path']
+    if path and os.path.exists(path):
+        with open(path, 'r', encoding='utf-8') as f:
+            markdown = f.read()
+
+    markdown = markdown or score['score_justification'] or ''
+    return {
+        'ticker': score['ticker'].upper(),
+        'quarter': int(score['quarter']),
+        'year': int(score['year']),
+        'analysis_date': _as_aware(score['analysis_timestamp']),
+        'score': score['score'],
+        'score_justification': score['score_justification'],
+        'analysis_markdown': markdown,
+        'analysis_json': extract_analysis_fields(markdown, score['score']),
+        'provider': score['provider'],
+        'model': score['model'],
+        'analysis_type': score['analysis_type'],
+        'financial_context_included': bool(score['financial_context_included'])
+    }
+
+
+def price_movement_frame(rows: List[sqlite3.Row]) -> pd.DataFrame:
+    """Map SQLite price_movements rows to a Database.insert_price_movements_bulk frame"""
+    df = pd.DataFrame([dict(row) for row in rows])
+    return df[[col for col in Database.PRICE_MOVEMENT_COLUMNS if col in df.columns]]
+
+
+class SQLiteSync:
+    """Copies new and changed SQLite rows into PostgreSQL, resuming from stored watermarks"""
+
+    def __init__(self, db: Database, sqlite_path: str = "data/earnings_analysis.db",
+                 batch_size: int = 5000):
+        """
+        Initialize the sync job
+
+        Args:
+            db: Target PostgreSQL database
+            sqlite_path: SQLite database written by DatabaseUtil
+            batch_size: Rows per batch (and per PostgreSQL transaction)
+        """
+        if not os.path.exists(sqlite_path):
+            raise ValueError(f"SQLite database not found: {sqlite_path}")
+
+        self.db = db
+        self.sqlite_path = sqlite_path
+        self.source = os.path.abspath(sqlite_path)
+        self.batch_size = batch_size
+
+    def get_watermarks(self) -> Dict[str, Dict[str, Any]]:
+        """Stored position for each table of this SQLite source"""
+        with self.db.get_session() as session:
+            rows = session.execute(text("""
+                SELECT table_name, last_id, last_updated_at, rows_synced, synced_at
+                FROM earnings.sync_watermarks WHERE source = :source
+            """), {'source': self.source}).mappings().all()
+        return {row['table_name']: dict(row) for row in rows}
+
+    def reset(self, tables: Optional[Iterable[str]] = None) -> None:
+        """Forget the watermarks so the next sync copies everything again"""
+        with self.db.get_session() as session:
+            session.execute(text("""
+                DELETE FROM earnings.sync_watermarks
+                WHERE source = :source AND table_name = ANY(:tables)
+            """), {'source': self.source, 'tables': list(tables or SYNC_TABLES)})
+
+    def _save_watermark(self, session, table: str, last_row: sqlite3.Row, rows: int) -> None:
+        """Advance a table's watermark within an open session"""
+        session.execute(text("""
+            INSERT INTO earnings.sync_watermarks (source, table_name, last_id, last_updated_at, rows_synced)
+            VALUES (:source, :table, :last_id, :last_updated_at, :rows)
+            ON CONFLICT (source, table_name) DO UPDATE SET
+                last_id = EXCLUDED.last_id,
+                last_updated_at = EXCLUDED.last_updated_at,
+                rows_synced = earnings.sync_watermarks.rows_synced + EXCLUDED.rows_synced,
+                synced_at = CURRENT_TIMESTAMP
+        """), {
+            'source': self.source,
+            'table': table,
+            'last_id': last_row['id'],
+            'last_updated_at': last_row['updated_at'],
+            'rows': rows
+        })
+
+    def _sync_price_movements(self, rows: List[sqlite3.Row]) -> None:
+        """Upsert one batch of price movements and advance the watermark"""
+        self.db.insert_price_movements_bulk(price_movement_frame(rows), batch_size=len(rows))
+        # A crash before this commit only means the batch is upserted again
+        with self.db.get_session() as session:
+            self._save_watermark(session, 'price_movements', rows[-1], len(rows))
+
+    def _sync_scores(self, rows: List[sqlite3.Row]) -> None:
+        """
+        Upsert one batch of scores as analyses (matched on ticker, quarter,
+        year and analysis_date) and advance the watermark, in one transaction
+        """
+        analyses = {}
+        for row in rows:
+            analysis = analysis_row(row)
+            analyses[(analysis['ticker'], analysis['quarter'], analysis['year'], analysis['analysis_date'])] = analysis
+
+        with self.db.get_session() as session:
+            keys = list(analyses)
+            dates = [key[3] for key in keys]
+            # Range scan on idx_analyses_ticker_date_id; exact keys are matched below
+            existing = {
+                (row.ticker, row.quarter, row.year, row.analysis_date): row for row in session.execute(
+                    select(Analysis.id, Analysis.transcript_id, Analysis.ticker, Analysis.quarter, Analysis.year,
+                           Analysis.analysis_date, *(getattr(Analysis, col) for col in COMPARED_COLUMNS))
+                    .where(Analysis.ticker.in_({key[0] for key in keys}))
+                    .where(Analysis.analysis_date.between(min(dates), max(dates)))
+                ).all()
+            }
+
+            transcript_keys = {key[:3] for key in keys}
+            transcript_ids = {
+                (t, q, y): i for t, q, y, i in session.execute(
+                    select(Transcript.ticker, Transcript.quarter, Transcript.year, Transcript.id)
+                    .where(tuple_(Transcript.ticker, Transcript.quarter, Transcript.year).in_(transcript_keys))
+                ).all()
+            }
+
+            updates, inserts = [], []
+            for key, analysis in analyses.items():
+                analysis['transcript_id'] = transcript_ids.get(key[:3])
+                current = existing.get(key)
+                if current is None:
+                    inserts.append(analysis)
+                elif any(getattr(current, col) != analysis[col] for col in ('transcript_id', *COMPARED_COLUMNS)):
+                    updates.append({**analysis, 'id': current.id})
+
+            ids = [row['id'] for row in updates]
+            if updates:
+                session.execute(update(Analysis), updates)
+            if inserts:
+                ids += session.execute(
+                    insert(Analysis).returning(Analysis.id, sort_by_parameter_order=True), inserts
+                ).scalars().all()
+
+            self.db._refresh_analysis_performance(session, analysis_ids=ids)
+            self._save_watermark(session, 'scores', rows[-1], len(rows))
+
+    def sync(self, tables: Optional[Iterable[str]] = None, full: bool = False,
+             progress_callback: Optional[Callable[[str, int], None]] = None) -> Dict[str, int]:
+        """
+        Copy rows changed since the last sync
+
+        Args:
+            tables: Subset of SYNC_TABLES (default: all)
+            full: Ignore the watermarks and copy everything (rows are upserted,
+                so this is also safe on a populated database)
+            progress_callback: Called with (table, rows copied so far) after each batch
+
+        Returns:
+            Rows copied per table
+        """
+        tables = [t for t in SYNC_TABLES if t in set(tables or SYNC_TABLES)]
+        if full:
+            self.reset(tables)
+        watermarks = self.get_watermarks()
+
+        sqlite_db = DatabaseUtil(self.sqlite_path)  # Brings the SQLite schema up to date
+        copied = {}
+        try:
+            conn = sqlite_db.get_connection()
+            for table in tables:
+                copied[table] = 0
+                sync_batch = self._sync_price_movements if table == 'price_movements' else self._sync_scores
+                for rows in read_batches(conn, table, watermarks.get(table, {}), self.batch_size):
+                    sync_batch(rows)
+                    copied[table] += len(rows)
+                    if progress_callback:
+                        progress_callback(table, copied[table])
+        finally:
+            sqlite_db.close()
+
+        return copied
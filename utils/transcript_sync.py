@@ -0,0 +1,241 @@
+"""
+Transcript Sync
+Incremental, resumable download of transcripts for a ticker universe
+"""
+
+import json
+import os
+from datetime import date, datetime
+from typing import Any, Callable, Dict, Iterable, List, Optional, Set, Tuple
+
+from utils.bulk_downloader import BulkTranscriptDownloader
+from utils.earnings_calendar import EarningsCalendar, parse_event_datetime
+
+
+# Same key as the uq_transcript_ticker_quarter_year constraint
+TranscriptKey = Tuple[str, int, int]  # (ticker, quarter, year)
+
+
+def quarters_in_range(start: date, end: date) -> List[Tuple[int, int]]:
+    """
+    List the calendar quarters overlapping a date range
+
+    Args:
+        start: First day of the range
+        end: Last day of the range
+
+    Returns:
+        (year, quarter) pairs in chronological order
+    """
+    if end < start:
+        raise ValueError("end date must not be before start date")
+
+    periods = []
+    year, quarter = start.year, (start.month - 1) // 3 + 1
+    last = (end.year, (end.month - 1) // 3 + 1)
+
+    while (year, quarter) <= last:
+        periods.append((year, quarter))
+        quarter += 1
+        if quarter > 4:
+            year, quarter = year + 1, 1
+
+    return periods
+
+
+def scan_transcript_dir(directory: str = "transcripts") -> Set[TranscriptKey]:
+    """
+    Collect the (ticker, quarter, year) keys of transcripts saved on disk
+    """
+    keys = set()
+    if not os.path.isdir(directory):
+        return keys
+
+    for filename in os.listdir(directory):
+        match = EarningsCalendar.TRANSCRIPT_FILE_PATTERN.match(filename)
+        if match:
+            ticker, quarter, year = match.groups()
+            keys.add((ticker.upper(), int(quarter), int(year)))
+
+    return keys
+
+
+class SyncCheckpoint:
+    """JSON checkpoint of per-transcript sync outcomes, written atomically"""
+
+    def __init__(self, path: str):
+        """
+        Load a checkpoint, or start an empty one if the file does not exist
+
+        Args:
+            path: Checkpoint file path
+        """
+        self.path = path
+        self.completed: Set[TranscriptKey] = set()
+        self.not_found: Set[TranscriptKey] = set()
+        self.failed: Dict[TranscriptKey, str] = {}
+
+        if os.path.exists(path):
+            with open(path, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+            self.completed = {tuple(k) for k in data.get('completed', [])}
+            self.not_found = {tuple(k) for k in data.get('not_found', [])}
+            self.failed = {tuple(k): error for k, error in data.get('failed', [])}
+
+    def record(self, key: TranscriptKey, status: str, error: Optional[str] = None) -> None:
+        """Record the outcome for one transcript and persist the checkpoint"""
+        self.failed.pop(key, None)
+        if status == 'success':
+            self.completed.add(key)
+            self.not_found.discard(key)
+        elif status == 'not_found':
+            self.not_found.add(key)
+        else:
+            self.failed[key] = error or status
+        self.save()
+
+    def save(self) -> None:
+        """Write the checkpoint via a temp file so an interrupted write cannot corrupt it"""
+        directory = os.path.dirname(self.path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+
+        data = {
+            'updated_at': datetime.now().isoformat(),
+            'completed': sorted(self.completed),
+            'not_found': sorted(self.not_found),
+            'failed': sorted([list(k), error] for k, error in self.failed.items())
+        }
+
+        tmp_path = f"{self.path}.tmp"
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump(data, f, indent=2)
+        os.replace(tmp_path, self.path)
+
+
+class TranscriptSync:
+    """Diffs a ticker universe against stored transcripts and fetches only the missing ones"""
+
+    def __init__(self, downloader: BulkTranscriptDownloader,
+                 db=None,
+                 transcript_dir: str = "transcripts",
+                 checkpoint_path: str = "data/transcript_sync_checkpoint.json"):
+        """
+        Initialize the sync job
+
+        Args:
+            downloader: Downloader used to fetch missing transcripts
+            db: Optional utils.database.Database; when given, its transcripts
+                count as already held and new downloads are inserted into it
+            transcript_dir: Directory of saved transcript files
+            checkpoint_path: Where progress is checkpointed between runs
+        """
+        self.downloader = downloader
+        self.db = db
+        self.transcript_dir = transcript_dir
+        self.checkpoint = SyncCheckpoint(checkpoint_path)
+
+    def existing_keys(self, tickers: Iterable[str]) -> Set[TranscriptKey]:
+        """
+        Keys of transcripts already held on disk or in the database
+
+        With a database, a transcript this sync downloaded (checkpointed as
+        completed) is only held once it is in the database: a quarter fetched
+        by a run without one, or whose insert failed, is fetched again so the
+        next run stores it.
+        """
+        tickers = [t.upper() for t in tickers]
+        keys = {k for k in scan_transcript_dir(self.transcript_dir) if k[0] in tickers}
+        if self.db is None:
+            return keys | self.checkpoint.completed
+        return (keys - self.checkpoint.completed) | self.db.get_transcript_keys(tickers)
+
+    def plan(self, tickers: Iterable[str], start: date, end: date,
+             retry_not_found: bool = False) -> List[TranscriptKey]:
+        """
+        List the transcripts that still need to be fetched
+
+        Args:
+            tickers: Ticker universe
+            start: Start of the date range
+            end: End of the date range
+            retry_not_found: Also retry transcripts a previous run could not find
+
+        Returns:
+            Missing (ticker, quarter, year) keys
+        """
+        tickers = list(dict.fromkeys(t.strip().upper() for t in tickers if t.strip()))
+        held = self.existing_keys(tickers)
+        if not retry_not_found:
+            held |= self.checkpoint.not_found
+
+        return [
+            (ticker, quarter, year)
+            for ticker in tickers
+            for year, quarter in quarters_in_range(start, end)
+            if (ticker, quarter, year) not in held
+        ]
+
+    def _store(self, result: Dict[str, Any]) -> None:
+        """Insert a downloaded transcript file into the database"""
+        with open(result['path'], 'r', encoding='utf-8') as f:
+            text = f.read()
+
+        date_match = EarningsCalendar.TRANSCRIPT_DATE_PATTERN.search(text[:1024])
+        transcript_date = parse_event_datetime(date_match.group(1)) if date_match else None
+        if isinstance(transcript_date, datetime):
+            transcript_date = transcript_date.date()
+
+        self.db.insert_transcript(
+            ticker=result['ticker'],
+            quarter=result['quarter'],
+            year=result['year'],
+            transcript_date=transcript_date or date.today(),
+            transcript_text=text,
+            source=result['source']
+        )
+
+    def run(self, tickers: Iterable[str], start: date, end: date,
+            retry_not_found: bool = False,
+            progress_callback: Optional[Callable[[Dict[str, Any], int, int], None]] = None
+            ) -> Dict[str, Any]:
+        """
+        Fetch missing transcripts, checkpointing after each one
+
+        An interrupted run can be restarted with the same arguments and will
+        only fetch what is still missing.
+
+        Returns:
+            Summary with planned, downloaded, not_found and failed counts
+        """
+        missing = self.plan(tickers, start, end, retry_not_found=retry_not_found)
+        summary = {'planned': len(missing), 'downloaded': 0, 'not_found': 0, 'failed': 0}
+
+        if not missing:
+            return summary
+
+        def on_result(result, completed, total):
+            key = (result['ticker'], result['quarter'], result['year'])
+            status, error = result['status'], result['error']
+
+            if status == 'success' and self.db is not None:
+                try:
+                    self._store(result)
+                except Exception as e:
+                    status, error = 'error', f"database: {e}"
+
+            self.checkpoint.record(key, status, error)
+            if status == 'success':
+                summary['downloaded'] += 1
+            elif status == 'not_found':
+                summary['not_found'] += 1
+            else:
+                summary['failed'] += 1
+
+            if progress_callback:
+                progress_callback({**result, 'status': status, 'error': error}, completed, total)
+
+        jobs = [(ticker, year, quarter) for ticker, quarter, year in missing]
+        self.downloader.download_jobs(jobs, progress_callback=on_result)
+
+        return summary